@@ -13,25 +13,73 @@
 # limitations under the License.
 # ============================================================================
 """akg process"""
+import functools
+import importlib.util
+import json
 import os
 import subprocess
 import sys
-from multiprocessing import Pool, cpu_count
+import time
+from multiprocessing import Pool, TimeoutError as PoolTimeoutError, cpu_count
+from mindspore._extends.parallel_compile.kernel_cache import CompileStatistics, cached_compile
 
-def _compile_akg_task(*json_strs):
+def get_akg_version():
     """
-    compile func called in single process
+    get akg version, the kernels compiled by another version of akg are not taken from the kernel cache
+
+    Returns:
+        str, the version of the akg distribution, or the path and mtime of the akg package if it has no version.
+    """
+    try:
+        from importlib import metadata
+        return "akg-" + metadata.version("akg")
+    except ImportError:
+        # python < 3.8, or akg installed without distribution metadata
+        pass
+    spec = importlib.util.find_spec("akg")
+    if spec is None or spec.origin is None:
+        return "akg"
+    return "akg-{}-{}".format(spec.origin, os.stat(spec.origin).st_mtime_ns)
+
+def _compile_akg_kernel(json_str, timeout):
+    """
+    compile one kernel in a subprocess
 
     Parameters:
-        json_strs: list. List contains multiple kernel infos, suitable for json compile api.
+        json_str: str. kernel info, suitable for json compile api.
+        timeout: int. max time of the compile, the subprocess is killed after it.
     """
     akg_compiler = os.path.join(os.path.split(
         os.path.realpath(__file__))[0], "compiler.py")
-    for json_str in json_strs:
-        res = subprocess.run(
-            [sys.executable, akg_compiler, json_str], text=True)
-        if res.returncode != 0:
-            raise ValueError("Failed, args: {}!".format(json_str))
+    res = subprocess.run(
+        [sys.executable, akg_compiler, json_str], text=True, timeout=timeout)
+    if res.returncode != 0:
+        raise ValueError("Failed, args: {}!".format(json_str))
+    return True
+
+def _compile_akg_task(json_str, timeout, tag):
+    """
+    compile func called in single process, takes one kernel at a time, so an idle process takes the next kernel
+    instead of waiting for the kernels assigned to a busy one.
+
+    Parameters:
+        json_str: str. kernel info.
+        timeout: int. max time of the compile.
+        tag: str. akg version, part of the kernel cache key.
+
+    Returns:
+        tuple, (kernel name, error message or None, compile time, whether the kernel comes from the cache).
+    """
+    kernel_name = json.loads(json_str).get("op")
+    start = time.time()
+    try:
+        _, elapsed, cache_hit = cached_compile(
+            lambda kernel_json: _compile_akg_kernel(kernel_json, timeout), json_str, kernel_name, tag=tag)
+    except subprocess.TimeoutExpired:
+        return kernel_name, "Timeout after {}s, args: {}!".format(timeout, json_str), time.time() - start, False
+    except ValueError as e:
+        return kernel_name, str(e), time.time() - start, False
+    return kernel_name, None, elapsed, cache_hit
 
 def create_akg_parallel_process(process_num, wait_time):
     """
@@ -49,7 +97,7 @@ class AkgProcess:
         """
         Args:
             process_num: int. processes number
-            waittime: int. max time the function blocked
+            waittime: int. max time the function blocked, also the max compile time of one kernel
         """
         if not isinstance(process_num, int):
             raise ValueError("process number must be a num")
@@ -59,9 +107,11 @@ class AkgProcess:
             process_num = 1
         max_proc_num = 16
         self.process_num = min([cpu_count(), max_proc_num, process_num])
-        self.args = [[] for _ in range(self.process_num)]
+        self.args = []
         self.wait_time = wait_time
         self.argc = 0
+        self.statistics = CompileStatistics()
+        self.akg_version = get_akg_version()
 
     def compile(self):
         """
@@ -71,18 +121,27 @@ class AkgProcess:
         """
         if self.argc == 0:
             raise ValueError("json must be not null")
+        deadline = time.time() + self.wait_time
         with Pool(processes=self.process_num) as pool:
-            res = pool.starmap_async(_compile_akg_task, self.args)
-            res.get(timeout=self.wait_time)
+            compile_task = functools.partial(_compile_akg_task, timeout=self.wait_time, tag=self.akg_version)
+            res = pool.imap_unordered(compile_task, self.args)
+            for _ in range(self.argc):
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    raise PoolTimeoutError()
+                kernel_name, error, elapsed, cache_hit = res.next(timeout=remaining)
+                self.statistics.add(kernel_name, elapsed, cache_hit, error is None)
+                if error is not None:
+                    raise ValueError(error)
         return True
 
-    def accept_json(self, json):
+    def accept_json(self, json_str):
         """
         accept json data before compile
         Args:
-            json: str. kernel info.
+            json_str: str. kernel info.
         """
-        if not isinstance(json, str):
+        if not isinstance(json_str, str):
             raise ValueError("json must be a str")
-        self.args[self.argc % self.process_num].append(json)
+        self.args.append(json_str)
         self.argc += 1
@@ -0,0 +1,240 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""kernel compile cache and statistics shared by the akg and tbe parallel compilers"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+# the compilers write kernels into this directory of the working directory
+KERNEL_META_DIR = "./kernel_meta"
+# the cache is enabled by setting this env to a directory
+KERNEL_CACHE_PATH_ENV = "MS_KERNEL_CACHE_PATH"
+DEFAULT_CACHE_SIZE = 4 << 30
+_MANIFEST = "manifest.json"
+_SLOWEST_NUM = 5
+
+
+def _file_sha256(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+class KernelCache:
+    """
+    Content addressed cache of compiled kernels.
+
+    An entry is keyed on the sha256 of the kernel json and the compiler tag, and holds the kernel files
+    (<kernel_name>.json, <kernel_name>.o, ...) written into the kernel meta directory by the compile, together with
+    the result returned by the compile. The files are checked against the sha256 recorded in the manifest of the
+    entry before they are used. Least recently used entries are removed when the cache exceeds `max_size` bytes.
+
+    Args:
+        cache_dir: str. directory of the cache, can be shared by processes.
+        kernel_meta_dir: str. directory the compilers write kernels into.
+        max_size: int. max size of the cache in bytes.
+    """
+
+    def __init__(self, cache_dir, kernel_meta_dir=KERNEL_META_DIR, max_size=DEFAULT_CACHE_SIZE):
+        self.cache_dir = os.path.realpath(cache_dir)
+        self.kernel_meta_dir = kernel_meta_dir
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(json_str, tag=""):
+        """
+        cache key of a kernel
+        Args:
+            json_str: str. kernel info.
+            tag: str. compiler version or anything else that changes the compile result.
+        """
+        return hashlib.sha256((tag + "\n" + json_str).encode("utf-8")).hexdigest()
+
+    def _kernel_files(self, kernel_name):
+        if not kernel_name or not os.path.isdir(self.kernel_meta_dir):
+            return []
+        prefix = kernel_name + "."
+        return [name for name in os.listdir(self.kernel_meta_dir) if name.startswith(prefix)]
+
+    def load(self, key, kernel_name):
+        """
+        copy the cached kernel files into the kernel meta directory
+        Return:
+            (True, compile result) if the kernel is cached and intact, otherwise (False, None).
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        try:
+            with open(os.path.join(entry_dir, _MANIFEST), "r") as f:
+                manifest = json.load(f)
+            if manifest["kernel_name"] != kernel_name:
+                return False, None
+            for name, sha256 in manifest["files"].items():
+                if _file_sha256(os.path.join(entry_dir, name)) != sha256:
+                    # broken entry, recompile and overwrite it
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+                    return False, None
+            if manifest["files"]:
+                os.makedirs(self.kernel_meta_dir, exist_ok=True)
+            for name in manifest["files"]:
+                tmp_file = os.path.join(self.kernel_meta_dir, "." + name + "." + str(os.getpid()))
+                shutil.copyfile(os.path.join(entry_dir, name), tmp_file)
+                os.replace(tmp_file, os.path.join(self.kernel_meta_dir, name))
+            # the mtime of an entry is its last use for the eviction
+            os.utime(entry_dir)
+        except (OSError, ValueError, KeyError):
+            # missing, being written or being evicted by another process
+            return False, None
+        return True, manifest["result"]
+
+    def store(self, key, kernel_name, result):
+        """
+        store the kernel files written by a successful compile
+        Args:
+            key: str. cache key of the kernel.
+            kernel_name: str. name of the kernel files, None if the compile writes no file.
+            result: str. compile result, returned by `load`.
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        if os.path.isdir(entry_dir):
+            return
+        tmp_dir = tempfile.mkdtemp(prefix=".tmp_", dir=self.cache_dir)
+        try:
+            files = {}
+            for name in self._kernel_files(kernel_name):
+                shutil.copyfile(os.path.join(self.kernel_meta_dir, name), os.path.join(tmp_dir, name))
+                files[name] = _file_sha256(os.path.join(tmp_dir, name))
+            with open(os.path.join(tmp_dir, _MANIFEST), "w") as f:
+                json.dump({"kernel_name": kernel_name, "files": files, "result": result}, f)
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # another process stored the same kernel first
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return
+        self.evict()
+
+    def evict(self):
+        """remove the least recently used entries until the cache fits in max_size"""
+        entries = []
+        total_size = 0
+        for key in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, key)
+            if key.startswith("."):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+                entries.append((os.stat(entry_dir).st_mtime, size, entry_dir))
+            except OSError:
+                continue
+            total_size += size
+        entries.sort()
+        for _, size, entry_dir in entries:
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+
+
+def create_kernel_cache():
+    """
+    create the kernel cache configured by the env MS_KERNEL_CACHE_PATH
+
+    Returns:
+        KernelCache, None if the cache is not enabled.
+    """
+    cache_dir = os.environ.get(KERNEL_CACHE_PATH_ENV)
+    if not cache_dir:
+        return None
+    return KernelCache(cache_dir)
+
+
+def cached_compile(compile_func, json_str, kernel_name, tag=""):
+    """
+    compile a kernel unless it is in the kernel cache, called in the compile processes
+
+    Args:
+        compile_func: function. compile_func(json_str) compiles the kernel and returns its result, raises or returns
+            a result for which `succeeded` is False on failure.
+        json_str: str. kernel info.
+        kernel_name: str. name of the kernel files written by the compile.
+        tag: str. compiler version or anything else that changes the compile result.
+
+    Returns:
+        tuple, (compile result, compile time in seconds, whether the result comes from the cache).
+    """
+    start = time.time()
+    cache = create_kernel_cache()
+    key = None
+    if cache is not None:
+        key = cache.key(json_str, tag)
+        hit, result = cache.load(key, kernel_name)
+        if hit:
+            return result, time.time() - start, True
+    result = compile_func(json_str)
+    if cache is not None and succeeded(result):
+        cache.store(key, kernel_name, result)
+    return result, time.time() - start, False
+
+
+def succeeded(result):
+    """whether a compile result is a success, compile results are either a ("Success", out) pair or True"""
+    if isinstance(result, (tuple, list)):
+        return bool(result) and result[0] == "Success"
+    return result is True
+
+
+class CompileStatistics:
+    """compile time statistics of a batch of kernels"""
+
+    def __init__(self):
+        self.compiled = 0
+        self.cache_hits = 0
+        self.failed = 0
+        self.total_time = 0.0
+        self.slowest = []
+
+    def add(self, kernel_name, elapsed, cache_hit, success=True):
+        """
+        record a finished kernel
+        Args:
+            kernel_name: str. name of the kernel.
+            elapsed: float. compile time in seconds.
+            cache_hit: bool. whether the kernel was loaded from the cache.
+            success: bool. whether the compile succeeded.
+        """
+        if not success:
+            self.failed += 1
+        elif cache_hit:
+            self.cache_hits += 1
+        else:
+            self.compiled += 1
+            self.total_time += elapsed
+            self.slowest.append((elapsed, kernel_name))
+            self.slowest.sort(reverse=True)
+            del self.slowest[_SLOWEST_NUM:]
+
+    def summary(self):
+        """
+        Return:
+            str. one line summary of the statistics.
+        """
+        slowest = ", ".join("{}: {:.2f}s".format(name, elapsed) for elapsed, name in self.slowest)
+        return "compiled: {}, cache hits: {}, failed: {}, compile time: {:.2f}s, slowest: [{}]".format(
+            self.compiled, self.cache_hits, self.failed, self.total_time, slowest)
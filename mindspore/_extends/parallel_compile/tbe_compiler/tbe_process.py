@@ -15,12 +15,14 @@
 """tbe process"""
 import traceback
 import multiprocessing
+import queue
 import subprocess
 import sys
 import os
 import json
-from .common import check_kernel_info, TBEException
+from .common import check_kernel_info, get_ddk_version, TBEException
 from .helper import _op_select_format, _check_supported
+from ..kernel_cache import CompileStatistics, cached_compile, succeeded
 
 def create_tbe_parallel_process():
     """
@@ -98,6 +100,31 @@ def run_compiler(op_json):
     except subprocess.CalledProcessError as e:
         return "TBEException", "PreCompileProcessFailed:\n" + e.stdout + "\n" + e.stderr + "\ninput_args: " + op_json
 
+def _get_kernel_name(op_json):
+    """get the name of the kernel files written by compiling op_json, None if the compile writes no file"""
+    kernel_info = json.loads(op_json)
+    if "fusion_op" in kernel_info:
+        return kernel_info["fusion_op"].get("fusion_op_name")
+    if "compile_type" in kernel_info:
+        # pre build only returns the op pattern
+        return None
+    return kernel_info.get("op_info", {}).get("kernel_name")
+
+def run_compile_task(op_json):
+    """
+    compile op in the pool, reuses the kernel cache when it is enabled
+
+    Args:
+        op_json (str): json string of the op
+
+    Returns:
+        tuple, (result type, result, kernel name, compile time, whether the result comes from the cache).
+    """
+    kernel_name = _get_kernel_name(op_json)
+    (ret_type, result), elapsed, cache_hit = cached_compile(run_compiler, op_json, kernel_name,
+                                                            tag=get_ddk_version())
+    return ret_type, result, kernel_name, elapsed, cache_hit
+
 class TbeProcess:
     """tbe process"""
 
@@ -109,7 +136,10 @@ class TbeProcess:
             self.__processe_num = max_processes_num
         self.__pool = None
         self.__next_task_id = 1
-        self.__running_tasks = []
+        self.__running_tasks = {}
+        # ids of the finished tasks, in the order they finish
+        self.__finished_tasks = queue.Queue()
+        self.statistics = CompileStatistics()
 
     def __del__(self):
         if self.__pool is not None:
@@ -137,28 +167,39 @@ class TbeProcess:
         self.__next_task_id = self.__next_task_id + 1
         if self.__pool is None:
             self.__pool = multiprocessing.Pool(processes=self.__processe_num)
-        task_future = self.__pool.apply_async(func=run_compiler, args=(op_json,))
-        self.__running_tasks.append((task_id, task_future))
+        task_future = self.__pool.apply_async(func=run_compile_task, args=(op_json,),
+                                              callback=lambda _: self.__finished_tasks.put(task_id),
+                                              error_callback=lambda _: self.__finished_tasks.put(task_id))
+        self.__running_tasks[task_id] = task_future
         return task_id
 
     def wait_one(self):
         """
-        wait until a compile task finish
+        wait until a compile task finish, the task finished first is returned first
 
         Returns:
             int, id of the finished task. -1 if error,0 if no unfinished task
             str, result of compile task
         """
         ret = 0, "Success"
-        if self.__running_tasks:
-            task_id, task_future = self.__running_tasks.pop(0)
-            ret_type, result = task_future.get(330)
+        while self.__running_tasks:
+            try:
+                task_id = self.__finished_tasks.get(timeout=330)
+            except queue.Empty:
+                raise multiprocessing.TimeoutError()
+            task_future = self.__running_tasks.pop(task_id, None)
+            if task_future is None:
+                # finished task of a reset batch
+                continue
+            ret_type, result, kernel_name, elapsed, cache_hit = task_future.get()
+            self.statistics.add(kernel_name, elapsed, cache_hit, succeeded((ret_type, result)))
             if ret_type == "Success":
                 ret = task_id, "Success", result
             elif ret_type in ("Exception", "TBEException"):
                 ret = task_id, ret_type + ":" + result, "_"
             else:
                 ret = task_id, "Exception: Not support return type:" + str(ret_type), "_"
+            break
         return ret
 
     def reset_task_info(self):
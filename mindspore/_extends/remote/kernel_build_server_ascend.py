@@ -33,6 +33,9 @@ class TbeBuilder:
     def reset(self):
         self.tbe_builder.reset_task_info()
 
+    def statistics(self):
+        return self.tbe_builder.statistics.summary()
+
     def exit(self):
         self.tbe_builder.exit()
 
@@ -49,7 +52,10 @@ class AkgBuilder:
         return self.akg_builder.accept_json(json)
 
     def compile(self):
-        return self.akg_builder.compile()
+        try:
+            return self.akg_builder.compile()
+        finally:
+            get_logger().info('[TRACE]', 'AKG compile statistics: ' + self.akg_builder.statistics.summary())
 
 class AscendMessager(Messager):
     '''
@@ -135,6 +141,7 @@ class AscendMessager(Messager):
             self.exit()
 
     def exit(self):
+        get_logger().info('[TRACE]', 'TBE compile statistics: ' + self.tbe_builder.statistics())
         self.tbe_builder.reset()
         self.tbe_builder.exit()
         get_logger().info('[TRACE]', 'Ascend Messager Exit...')
@@ -19,6 +19,7 @@
 #include <unordered_map>
 #include <memory>
 #include <map>
+#include <set>
 #include <fstream>
 #include "utils/log_adapter.h"
 #include "utils/overload.h"
@@ -26,6 +27,8 @@
 
 namespace mindspore {
 namespace kernel {
+namespace py = pybind11;
+constexpr auto kOpImplModule = "mindspore.ops._op_impl";
 constexpr auto kImplyType = "imply_type";
 constexpr auto kOpName = "op_name";
 constexpr auto kFusionType = "fusion_type";
@@ -324,6 +327,34 @@ bool OpLib::DecodeInputOutput(const nlohmann::json &obj, const OpImplyType imply
   return ret;
 }
 
+bool OpLib::RegOpFromPython(OpImplyType imply_type) {
+  // the op info of an imply type is registered by python on its first lookup, see mindspore/ops/_op_impl.
+  // only a thread holding the GIL loads it, acquiring the GIL in another thread may deadlock, e.g. the inference
+  // session registers all the op info in advance and compiles in other threads. loaded is guarded by the GIL.
+  static std::set<OpImplyType> loaded;
+  if (!Py_IsInitialized() || PyGILState_Check() == 0 || loaded.count(imply_type) != 0) {
+    return true;
+  }
+  MS_LOG(INFO) << "Start to load op info of " << ImplTypeToStr(imply_type) << " from python.";
+  try {
+    (void)py::module::import(kOpImplModule).attr("load_op_info")(ImplTypeToStr(imply_type));
+  } catch (const std::exception &e) {
+    MS_LOG(ERROR) << "Load op info of " << ImplTypeToStr(imply_type) << " failed: " << e.what();
+    return false;
+  }
+  (void)loaded.insert(imply_type);
+  return true;
+}
+
+const std::multimap<std::string, std::shared_ptr<OpInfo>> &OpLib::GetAllOpsInfo() {
+  for (auto imply_type : {kTBE, kAKG, kAICPU}) {
+    if (!OpLib::RegOpFromPython(imply_type)) {
+      MS_LOG(INFO) << "Warning reg op info from python failed.";
+    }
+  }
+  return op_info_;
+}
+
 std::shared_ptr<OpInfo> OpLib::FindOp(const std::string &op_name, OpImplyType imply_type) {
   if (!OpLib::RegOpFromLocalInfo()) {
     MS_LOG(INFO) << "Warning reg local op info failed.";
@@ -336,6 +367,9 @@ std::shared_ptr<OpInfo> OpLib::FindOp(const std::string &op_name, OpImplyType im
                   << ", current op num: " << op_info_.size();
     return nullptr;
   }
+  if (!OpLib::RegOpFromPython(imply_type)) {
+    MS_LOG(INFO) << "Warning reg op info from python failed.";
+  }
   std::string target_processor = is_gpu ? kCUDA : kAiCore;
   for (auto [iter, end] = op_info_.equal_range(op_name); iter != end; ++iter) {
     auto &op_info = iter->second;
@@ -76,7 +76,7 @@ void BindShardWriter(py::module *m) {
     .def("set_page_size", &ShardWriter::SetPageSize)
     .def("set_shard_header", &ShardWriter::SetShardHeader)
     .def("write_raw_data", (MSRStatus(ShardWriter::*)(std::map<uint64_t, std::vector<py::handle>> &,
-                                                      vector<vector<uint8_t>> &, bool, bool)) &
+                                                      std::vector<py::buffer> &, bool, bool)) &
                              ShardWriter::WriteRawData)
     .def("commit", &ShardWriter::Commit);
 }
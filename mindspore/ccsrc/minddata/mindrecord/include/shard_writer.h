@@ -99,6 +99,14 @@ class ShardWriter {
   MSRStatus WriteRawData(std::map<uint64_t, std::vector<py::handle>> &raw_data, vector<vector<uint8_t>> &blob_data,
                          bool sign = true, bool parallel_writer = false);
 
+  /// \brief write raw data by group size for call from python
+  /// \param[in] raw_data the vector of raw json data, python-handle format
+  /// \param[in] blob_data the vector of image data, contiguous python buffers such as bytes and bytearray
+  /// \param[in] sign validate data or not
+  /// \return MSRStatus the status of MSRStatus to judge if write successfully
+  MSRStatus WriteRawData(std::map<uint64_t, std::vector<py::handle>> &raw_data, std::vector<py::buffer> &blob_data,
+                         bool sign = true, bool parallel_writer = false);
+
   /// \brief write raw data by group size for call from python
   /// \param[in] raw_data the vector of raw json data, python-handle format
   /// \param[in] blob_data the vector of blob json data, python-handle format
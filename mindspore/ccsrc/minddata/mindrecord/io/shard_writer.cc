@@ -786,6 +786,19 @@ MSRStatus ShardWriter::WriteRawData(std::map<uint64_t, std::vector<py::handle>>
   return WriteRawData(raw_data_json, blob_data, sign, parallel_writer);
 }
 
+MSRStatus ShardWriter::WriteRawData(std::map<uint64_t, std::vector<py::handle>> &raw_data,
+                                    std::vector<py::buffer> &blob_data, bool sign, bool parallel_writer) {
+  // copy the bytes of each blob at once, instead of converting them from a python list of ints
+  std::vector<std::vector<uint8_t>> bin_blob_data;
+  bin_blob_data.reserve(blob_data.size());
+  for (auto &blob : blob_data) {
+    py::buffer_info info = blob.request();
+    auto data = static_cast<const uint8_t *>(info.ptr);
+    bin_blob_data.emplace_back(data, data + info.size * info.itemsize);
+  }
+  return WriteRawData(raw_data, bin_blob_data, sign, parallel_writer);
+}
+
 MSRStatus ShardWriter::ParallelWriteData(const std::vector<std::vector<uint8_t>> &blob_data,
                                          const std::vector<std::vector<uint8_t>> &bin_raw_data) {
   auto shards = BreakIntoShards();
@@ -81,6 +81,8 @@ PYBIND11_MODULE(_c_expression, m) {
     .def("build_data_graph", &ExecutorPy::BuildGraph, py::arg("build_params"), py::arg("phase") = py::str("train"),
          py::arg("broadcast_params") = py::dict(), "Build data graph.")
     .def("has_compiled", &ExecutorPy::HasCompiled, py::arg("phase") = py::str(""), "get if cell compiled.")
+    .def("set_compile_cache_file", &ExecutorPy::SetCompileCacheFile, py::arg("file"), py::arg("load"),
+         "Set the IR file of the compile cache for the next compile.")
     .def("run_init_graph", &ExecutorPy::RunInitGraph, "Run init Graph.");
 
   (void)py::class_<EnvInstance, std::shared_ptr<EnvInstance>>(m, "EnvInstance_").def(py::init());
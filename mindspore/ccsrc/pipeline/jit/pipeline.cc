@@ -556,6 +556,17 @@ bool ExecutorPy::Compile(const py::object &obj, const py::tuple &args, const py:
   return ret_value;
 }
 
+bool ExecutorPy::SetCompileCacheFile(const std::string &file, bool load) {
+#if defined(ENABLE_LOAD_ANF_IR) && defined(ENABLE_DUMP_IR)
+  compile_cache_file_ = file;
+  load_compile_cache_ = load && !file.empty();
+  return true;
+#else
+  MS_LOG(DEBUG) << "The compile cache is disabled, it needs the build options ENABLE_LOAD_ANF_IR and ENABLE_DUMP_IR.";
+  return false;
+#endif
+}
+
 #ifdef ENABLE_LOAD_ANF_IR
 // get MindSpore Intermediate Representation File
 std::string GetMsIrFile(void) {
@@ -578,10 +589,19 @@ void RunPipelineAction(const ActionItem &action, pipeline::ResourcePtr resource,
   MS_EXCEPTION_IF_NULL(resource);
   MS_EXCEPTION_IF_NULL(result);
 
+  auto executor = ExecutorPy::GetInstance();
   std::string ir_file = GetMsIrFile();
+  if (ir_file.empty() && executor->load_compile_cache()) {
+    ir_file = executor->compile_cache_file();
+  }
   (void)parse::python_adapter::set_python_scoped();
   if (ir_file.empty()) {
     *result = action.second(resource);
+    // store the resolved graph into the compile cache, the later stages depend on the inputs and are not cached
+    if (action.first == "symbol_resolve" && *result && !executor->compile_cache_file().empty()) {
+      MS_LOG(DEBUG) << action.first << " write compile cache file: " << executor->compile_cache_file();
+      ExportIR(executor->compile_cache_file(), "0", resource->func_graph());
+    }
     return;
   }
 
@@ -100,6 +100,13 @@ class ExecutorPy : public std::enable_shared_from_this<ExecutorPy> {
 
   std::map<std::string, std::pair<PrimitivePyPtr, std::string>> FetchInfoForQuantExport(const std::string &phase_s);
 
+  // Set the IR file of the persistent compile cache for the next compile. The graph of the parse and symbol_resolve
+  // stages is imported from the file if `load` is true, otherwise it is exported into the file. An empty file
+  // disables the cache. Returns false if the build can not import or export IR.
+  bool SetCompileCacheFile(const std::string &file, bool load);
+  const std::string &compile_cache_file() const { return compile_cache_file_; }
+  bool load_compile_cache() const { return load_compile_cache_; }
+
  private:
   ExecutorPy();
   void ConvertObjectToTensors(const py::dict &dict, std::map<std::string, tensor::TensorPtr> *tensors);
@@ -109,6 +116,8 @@ class ExecutorPy : public std::enable_shared_from_this<ExecutorPy> {
   static std::vector<ActionItem> FilterActions(const std::vector<ActionItem> &actions, const std::string &phase);
 
   std::map<std::string, ExecutorInfoPtr> info_;
+  std::string compile_cache_file_;
+  bool load_compile_cache_{false};
   static std::shared_ptr<ExecutorPy> executor_;
   static std::mutex instance_lock_;
 };
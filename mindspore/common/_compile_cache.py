@@ -0,0 +1,274 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Persistent cache of the graphs resolved by the executor."""
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from mindspore import context
+from mindspore import log as logger
+from .._c_expression import MetaFuncGraph_, Primitive_, Tensor, MetaTensor
+from .._c_expression.typing import Type
+from ..version import __version__
+
+# the cache is enabled by setting this env to a directory
+COMPILE_CACHE_PATH_ENV = "MS_COMPILE_CACHE_PATH"
+DEFAULT_CACHE_SIZE = 1 << 30
+GRAPH_FILE = "graph.dat"
+_MANIFEST = "manifest.json"
+# the context flags which change the graph of the parse and symbol_resolve stages
+_CONTEXT_FLAGS = ("mode", "device_target", "enable_sparse", "check_bprop", "enable_graph_kernel",
+                  "enable_auto_mixed_precision")
+# the attributes of a cell which do not change its graph, the parameters and sub cells are hashed on their own
+_CELL_BOOKKEEPING_ATTRS = frozenset(("_params", "_cells", "_params_list", "_dispatch_cache", "_dispatch_hits",
+                                     "_dispatch_misses", "_create_time", "_already_run", "_parameter_layout_dict",
+                                     "_parallel_inputs_run", "_phase"))
+_PLAIN_TYPES = (bool, int, float, str, type(None))
+
+
+class _Unhashable(Exception):
+    """A value the graph may depend on has no stable hash."""
+
+
+def _file_sha256(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def _source_sha256(obj, source_hashes):
+    """The sha256 of the source file defining a class or a function, the helpers of its module included."""
+    try:
+        source_file = inspect.getsourcefile(obj)
+    except TypeError:
+        source_file = None
+    if source_file is None:
+        raise _Unhashable(f"no source file of {obj!r}")
+    if source_file not in source_hashes:
+        source_hashes[source_file] = _file_sha256(source_file)
+    return source_hashes[source_file]
+
+
+def _update_value(sha, value, source_hashes):
+    """Hash a value a graph may depend on, raises _Unhashable for a value which has no stable hash."""
+    if isinstance(value, _PLAIN_TYPES):
+        sha.update(repr((type(value).__name__, value)).encode("utf-8"))
+    elif isinstance(value, (tuple, list)):
+        sha.update(f"{type(value).__name__}:{len(value)}".encode("utf-8"))
+        for item in value:
+            _update_value(sha, item, source_hashes)
+    elif isinstance(value, dict):
+        sha.update(f"dict:{len(value)}".encode("utf-8"))
+        for key in sorted(value, key=repr):
+            _update_value(sha, key, source_hashes)
+            _update_value(sha, value[key], source_hashes)
+    elif isinstance(value, Type):
+        sha.update(f"type:{value}".encode("utf-8"))
+    elif isinstance(value, MetaTensor) and not isinstance(value, Tensor):
+        # a parameter, its value is bound after the compile
+        sha.update(f"meta_tensor:{getattr(value, 'name', '')}:{value.dtype}:{value.shape}".encode("utf-8"))
+    elif isinstance(value, (Tensor, np.ndarray)):
+        data = value.asnumpy() if isinstance(value, Tensor) else value
+        sha.update(f"array:{data.dtype}:{data.shape}".encode("utf-8"))
+        sha.update(np.ascontiguousarray(data).tobytes())
+    elif isinstance(value, Primitive_) and hasattr(value, "attrs"):
+        sha.update(f"primitive:{type(value).__module__}.{type(value).__qualname__}".encode("utf-8"))
+        _update_value(sha, value.attrs, source_hashes)
+    elif isinstance(value, MetaFuncGraph_):
+        # composite operations such as GradOperation and HyperMap keep their arguments as attributes
+        sha.update(f"meta_func_graph:{type(value).__module__}.{type(value).__qualname__}".encode("utf-8"))
+        _update_value(sha, vars(value), source_hashes)
+    elif inspect.isfunction(value) or inspect.isclass(value):
+        sha.update(f"source:{value.__module__}.{value.__qualname__}".encode("utf-8"))
+        sha.update(_source_sha256(value, source_hashes).encode("utf-8"))
+    else:
+        raise _Unhashable(f"no stable hash of the type {type(value).__name__}")
+
+
+def _update_cell(sha, cell, source_hashes):
+    """Hash the source, the attributes, the parameters and the sub cells of a cell."""
+    for name, sub_cell in cell.cells_and_names():
+        sha.update(f"cell:{name}".encode("utf-8"))
+        for cls in type(sub_cell).__mro__:
+            # the classes of mindspore are covered by the version
+            if cls.__module__ == "builtins" or cls.__module__.startswith("mindspore."):
+                continue
+            _update_value(sha, cls, source_hashes)
+        attrs = {key: value for key, value in vars(sub_cell).items() if key not in _CELL_BOOKKEEPING_ATTRS}
+        _update_value(sha, attrs, source_hashes)
+    for name, param in cell.parameters_and_names():
+        # the values of the parameters are bound after the compile, only their names, shapes and types are in the IR
+        sha.update(f"param:{name}:{param.shape}:{param.dtype}:{param.requires_grad}".encode("utf-8"))
+
+
+class CompileCache:
+    """
+    Content addressed cache of the graphs resolved by the executor.
+
+    An entry is keyed on the source files, the attributes and the parameters of the network, the signature of the
+    inputs, the compile phase, the context flags and the version of MindSpore. It holds the IR of the graph after the
+    parse and symbol_resolve stages, which is imported by the next compile of the same network instead of running
+    these stages. The IR is checked against the sha256 recorded in the manifest of the entry before it is used. Least
+    recently used entries are removed when the cache exceeds `max_size` bytes.
+
+    Args:
+        cache_dir (str): The directory of the cache, can be shared by processes.
+        max_size (int): The max size of the cache in bytes. Default: 1GB.
+    """
+
+    def __init__(self, cache_dir, max_size=DEFAULT_CACHE_SIZE):
+        self.cache_dir = os.path.realpath(cache_dir)
+        self.max_size = max_size
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(obj, args, phase, use_vm):
+        """
+        Get the cache key of a compile.
+
+        Args:
+            obj (Union[Cell, Function]): The cell or function to compile.
+            args (Union[tuple, list]): The inputs of the compile.
+            phase (str): The compile phase, such as 'train' and 'eval', without the key of the inputs.
+            use_vm (bool): Whether the graph is run by the vm.
+
+        Returns:
+            str, the cache key, None if the network or the inputs have a value without stable hash.
+        """
+        sha = hashlib.sha256()
+        sha.update(f"{__version__}:{phase}:{use_vm}".encode("utf-8"))
+        source_hashes = {}
+        try:
+            _update_value(sha, {flag: context.get_context(flag) for flag in _CONTEXT_FLAGS}, source_hashes)
+            _update_value(sha, context.get_auto_parallel_context("parallel_mode"), source_hashes)
+            if hasattr(obj, "cells_and_names"):
+                _update_cell(sha, obj, source_hashes)
+            else:
+                _update_value(sha, obj, source_hashes)
+            for arg in args:
+                if isinstance(arg, Tensor):
+                    # the graph depends on the shape and type of an input tensor, not on its value
+                    sha.update(f"tensor:{arg.dtype}:{arg.shape}:{getattr(arg, 'virtual_flag', False)}".encode("utf-8"))
+                else:
+                    _update_value(sha, arg, source_hashes)
+        except (_Unhashable, OSError) as e:
+            logger.debug(f"The compile of {phase} is not cached: {e}")
+            return None
+        return sha.hexdigest()
+
+    def load(self, key):
+        """
+        Get the IR file of a cached graph.
+
+        Args:
+            key (str): The cache key of the compile.
+
+        Returns:
+            str, the IR file, None if the graph is not cached or the entry is broken.
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        graph_file = os.path.join(entry_dir, GRAPH_FILE)
+        try:
+            with open(os.path.join(entry_dir, _MANIFEST), "r") as f:
+                manifest = json.load(f)
+            if _file_sha256(graph_file) != manifest["sha256"]:
+                logger.warning(f"The compile cache entry {entry_dir} is broken, remove it.")
+                self.remove(key)
+                return None
+            # the mtime of an entry is its last use for the eviction
+            os.utime(entry_dir)
+        except (OSError, ValueError, KeyError):
+            # missing, being written or being evicted by another process
+            return None
+        return graph_file
+
+    def create_entry(self):
+        """
+        Create the temporary directory of a new entry, the IR is written into its GRAPH_FILE by the compile.
+
+        Returns:
+            str, the temporary directory, passed to `store` or `discard`.
+        """
+        return tempfile.mkdtemp(prefix=".tmp_", dir=self.cache_dir)
+
+    def store(self, key, tmp_dir):
+        """
+        Store the IR written into a temporary directory by a successful compile.
+
+        Args:
+            key (str): The cache key of the compile.
+            tmp_dir (str): The directory returned by `create_entry`.
+        """
+        entry_dir = os.path.join(self.cache_dir, key)
+        try:
+            manifest = {"sha256": _file_sha256(os.path.join(tmp_dir, GRAPH_FILE))}
+            with open(os.path.join(tmp_dir, _MANIFEST), "w") as f:
+                json.dump(manifest, f)
+            os.rename(tmp_dir, entry_dir)
+        except OSError:
+            # no IR was written, or another process stored the same graph first
+            self.discard(tmp_dir)
+            return
+        self.evict()
+
+    @staticmethod
+    def discard(tmp_dir):
+        """Remove the temporary directory of an entry which is not stored."""
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def remove(self, key):
+        """Remove an entry."""
+        shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+
+    def evict(self):
+        """Remove the least recently used entries until the cache fits in max_size."""
+        entries = []
+        total_size = 0
+        for key in os.listdir(self.cache_dir):
+            entry_dir = os.path.join(self.cache_dir, key)
+            if key.startswith("."):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(entry_dir))
+                entries.append((os.stat(entry_dir).st_mtime, size, entry_dir))
+            except OSError:
+                continue
+            total_size += size
+        entries.sort()
+        for _, size, entry_dir in entries:
+            if total_size <= self.max_size:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
+
+
+def create_compile_cache():
+    """
+    Create the compile cache configured by the env MS_COMPILE_CACHE_PATH.
+
+    Returns:
+        CompileCache, None if the cache is not enabled.
+    """
+    cache_dir = os.environ.get(COMPILE_CACHE_PATH_ENV)
+    if not cache_dir:
+        return None
+    return CompileCache(cache_dir)
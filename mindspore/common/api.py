@@ -15,6 +15,7 @@
 # limitations under the License.
 # ============================================================================
 """Providing interface methods."""
+import os
 import types
 from collections import OrderedDict
 from functools import wraps
@@ -23,6 +24,7 @@ from mindspore import log as logger
 from .._c_expression import generate_key, Executor_, Tensor, MetaTensor, PynativeExecutor_
 from .._c_expression import verify_inputs_signature, init_exec_dataset, _set_dataset_mode_config, init_backend
 from .tensor import Tensor as MsTensor
+from ._compile_cache import COMPILE_CACHE_PATH_ENV, GRAPH_FILE, create_compile_cache
 
 # store ms_function class compiled pipeline cache
 ms_compile_cache = {}
@@ -325,6 +327,7 @@ class _Executor:
         self.is_init = False
         self._executor = Executor_.get_instance()
         self.compile_cache = {}
+        self._compile_cache_warned = False
         self.phase_prefix = ""
 
     def init_dataset(self, queue_name, dataset_size, batch_size, dataset_types, dataset_shapes,
@@ -385,6 +388,7 @@ class _Executor:
         args_names, args_list = _generate_pip_args(obj, *args)
         dic = dict(zip(args_names, args_list))
         key = generate_key(phase, dic)
+        phase_name = phase
         self.phase_prefix = str(key[1])
         if phase == 'export':
             phase = phase + '.' + self.phase_prefix + '.' + str(obj.create_time)
@@ -401,7 +405,7 @@ class _Executor:
             logger.debug("%r graph has existed.", phase)
             return phase, False
 
-        result = self._executor.compile(obj, args_list, phase, use_vm)
+        result = self._compile(obj, args_list, phase, phase_name, use_vm)
         self.compile_cache[phase] = phase
         if not result:
             raise RuntimeError("Executor compile failed.")
@@ -437,6 +441,51 @@ class _Executor:
 
         return phase, True
 
+    def _compile(self, obj, args_list, phase, phase_name, use_vm):
+        """
+        Compile the graph with the persistent compile cache configured by the env MS_COMPILE_CACHE_PATH.
+
+        On a hit, the graph of the parse and symbol_resolve stages is imported from the cached IR instead of being
+        built from the python object. On a miss, the IR of the resolved graph is stored for the next process. The id
+        given by generate_key only lives in the process, so the cache is keyed on the phase name and the shapes and
+        types of the inputs instead.
+        """
+        cache = create_compile_cache()
+        if cache is not None and not self._executor.set_compile_cache_file("", False):
+            if not self._compile_cache_warned:
+                logger.warning(f"The env {COMPILE_CACHE_PATH_ENV} is ignored, the compile cache needs MindSpore "
+                               f"built with ENABLE_LOAD_ANF_IR and ENABLE_DUMP_IR.")
+                self._compile_cache_warned = True
+            cache = None
+        key = None if cache is None else cache.key(obj, args_list, phase_name, use_vm)
+        if key is None:
+            return self._executor.compile(obj, args_list, phase, use_vm)
+
+        graph_file = cache.load(key)
+        if graph_file is not None:
+            logger.info("Load the resolved graph of %r from the compile cache %r.", phase, graph_file)
+            self._executor.set_compile_cache_file(graph_file, True)
+            try:
+                return self._executor.compile(obj, args_list, phase, use_vm)
+            except RuntimeError as e:
+                logger.warning(f"Failed to compile {phase} from the compile cache {graph_file}, compile it again: {e}")
+                cache.remove(key)
+            finally:
+                self._executor.set_compile_cache_file("", False)
+
+        tmp_dir = cache.create_entry()
+        self._executor.set_compile_cache_file(os.path.join(tmp_dir, GRAPH_FILE), False)
+        result = False
+        try:
+            result = self._executor.compile(obj, args_list, phase, use_vm)
+        finally:
+            self._executor.set_compile_cache_file("", False)
+            if result:
+                cache.store(key, tmp_dir)
+            else:
+                cache.discard(tmp_dir)
+        return result
+
     def _updata_param_node_default_input(self, phase, replace):
         new_param = {x.name: replace[x] for x in replace if id(x) != id(replace[x])}
         return self._executor.updata_param_node_default_input(phase, new_param)
@@ -15,17 +15,20 @@
 """
 The configuration manager.
 """
+import os
 import random
 import numpy
 import mindspore._c_dataengine as cde
 
 __all__ = ['set_seed', 'get_seed', 'set_prefetch_size', 'get_prefetch_size', 'set_num_parallel_workers',
-           'get_num_parallel_workers', 'set_monitor_sampling_interval', 'get_monitor_sampling_interval', 'load']
+           'get_num_parallel_workers', 'set_monitor_sampling_interval', 'get_monitor_sampling_interval',
+           'set_index_dir', 'get_index_dir', 'load']
 
 INT32_MAX = 2147483647
 UINT32_MAX = 4294967295
 
 _config = cde.GlobalContext.config_manager()
+_index_dir = None
 
 
 def set_seed(seed):
@@ -157,6 +160,37 @@ def get_monitor_sampling_interval():
     return _config.get_monitor_sampling_interval()
 
 
+def set_index_dir(index_dir):
+    """
+    Set the directory of the row indexes of the TFRecord, text, CLUE and csv dataset files.
+
+    The rows of a file are counted once and its index is stored in this directory, later pipelines and processes
+    reuse the index as long as the size and the mtime of the file are unchanged. The directory can be shared by
+    processes. The indexes are not used by default.
+
+    Args:
+        index_dir (str): The directory, None to not use the indexes.
+
+    Examples:
+        >>> import mindspore.dataset as ds
+        >>> ds.config.set_index_dir("/path/to/index")
+    """
+    global _index_dir
+    if index_dir is not None and not isinstance(index_dir, str):
+        raise TypeError("index_dir should be a str or None.")
+    _index_dir = os.path.realpath(index_dir) if index_dir else None
+
+
+def get_index_dir():
+    """
+    Get the directory of the row indexes of the dataset files.
+
+    Returns:
+        Str, the directory, None if the indexes are not used.
+    """
+    return _index_dir
+
+
 def __str__():
     """
     String representation of the configurations.
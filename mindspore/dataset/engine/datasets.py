@@ -18,18 +18,20 @@ MNIST, Cifar10/100, Manifest, MindRecord, etc. This module could load data in
 high performance and parse data precisely. It also provides the following
 operations for users to preprocess data: shuffle, batch, repeat, map, and zip.
 """
+import builtins
 import glob
 import json
 import math
 import os
 import uuid
 import multiprocessing
-import queue
 from enum import Enum
 from importlib import import_module
 import threading
+import traceback
 
 import copy
+import functools
 import numpy as np
 
 from mindspore._c_dataengine import DataType, TFReaderOp, ImageFolderOp, CifarOp, MnistOp, ManifestOp, \
@@ -37,14 +39,18 @@ from mindspore._c_dataengine import DataType, TFReaderOp, ImageFolderOp, CifarOp
 from mindspore._c_expression import typing
 
 from mindspore import log as logger
+from . import row_index
 from . import samplers
+from . import shape_inference
 from .iterators import DictIterator, TupleIterator, DummyIterator, SaveOp
+from .shared_queue import SharedRingBuffer
 from .validators import check_batch, check_shuffle, check_map, check_filter, check_repeat, check_skip, check_zip, \
     check_rename, check_numpyslicesdataset, check_device_send, \
     check_take, check_project, check_imagefolderdatasetv2, check_mnist_cifar_dataset, check_manifestdataset, \
     check_tfrecorddataset, check_vocdataset, check_cocodataset, check_celebadataset, check_minddataset, \
     check_generatordataset, check_sync_wait, check_zip_dataset, check_add_column, check_textfiledataset, check_concat, \
     check_random_dataset, check_split, check_bucket_batch_by_length, check_cluedataset, check_save, check_csvdataset
+from ..core.config import get_num_parallel_workers
 from ..core.datatypes import mstype_to_detype, mstypelist_to_detypelist
 from ..text.utils import DE_C_INTER_SENTENCEPIECE_MODE
 
@@ -394,7 +400,7 @@ class Dataset:
 
     @check_map
     def map(self, input_columns=None, operations=None, output_columns=None, columns_order=None,
-            num_parallel_workers=None, python_multiprocessing=False, cache=None):
+            num_parallel_workers=None, python_multiprocessing=False, cache=None, chunk_size=1):
         """
         Apply each operation in operations to this dataset.
 
@@ -437,6 +443,10 @@ class Dataset:
                 option could be beneficial if the python operation is computational heavy (default=False).
             cache (DatasetCache, optional): Tensor cache to use. (default=None which means no cache is used).
                 The cache feature is under development and is not recommended.
+            chunk_size (int, optional): Maximum number of rows sent to a worker process at once, only used when
+                python_multiprocessing is True (default=1). When greater than 1, up to
+                num_parallel_workers * chunk_size rows are processed concurrently, and the rows waiting for a busy
+                worker process are sent together, which saves the inter-process communication of each row.
 
         Returns:
             MapDataset, dataset after mapping operation.
@@ -551,7 +561,7 @@ class Dataset:
             >>> ds_mapped = ds_pyfunc.map(input_columns, operations, output_columns, columns_order)
         """
         return MapDataset(self, input_columns, operations, output_columns, columns_order, num_parallel_workers,
-                          python_multiprocessing, cache)
+                          python_multiprocessing, cache, chunk_size)
 
     @check_filter
     def filter(self, predicate, input_columns=None, num_parallel_workers=1):
@@ -1196,14 +1206,41 @@ class Dataset:
         self._repeat_count = device_iter.get_repeat_count()
         device_iter.stop()
 
+    def _static_output_info(self):
+        """
+        Get the output columns from the metadata of the tree, without launching the pipeline.
+
+        Return:
+            tuple, (list of column names, list of shapes, list of numpy types), None if the columns are only known by
+            running the pipeline. A shape, a dim of a shape or a type is None if only it is unknown.
+        """
+        return None
+
+    def _infer_output_info(self):
+        """
+        Set the shapes and types of output data from the metadata of the tree, if they are all known.
+
+        Return:
+            bool, whether they are known.
+        """
+        info = self._static_output_info()
+        if info is None or not shape_inference.is_complete(info[1], info[2]):
+            return False
+        self._output_shapes = [list(shape) for shape in info[1]]
+        self._output_types = list(info[2])
+        return True
+
     def output_shapes(self):
         """
         Get the shapes of output data.
 
+        The shapes are inferred from the schemas of the sources and the operations of the pipeline if possible,
+        otherwise the pipeline is launched to get the first row.
+
         Return:
             List, list of shape of each column.
         """
-        if self._output_shapes is None:
+        if self._output_shapes is None and not self._infer_output_info():
             self._get_pipeline_info()
         return self._output_shapes
 
@@ -1211,10 +1248,12 @@ class Dataset:
         """
         Get the types of output data.
 
+        The types are inferred like the shapes, see `output_shapes`.
+
         Return:
             List of data type.
         """
-        if self._output_types is None:
+        if self._output_types is None and not self._infer_output_info():
             self._get_pipeline_info()
         return self._output_types
 
@@ -1638,6 +1677,25 @@ class BatchDataset(DatasetOp):
         args["pad_info"] = self.pad_info
         return args
 
+    def _static_output_info(self):
+        info = self.children[0]._static_output_info()
+        if info is None or not isinstance(self.batch_size, int) or self.per_batch_map is not None:
+            return None
+        # the first batch is smaller than batch_size if there are less rows, which is only known by counting them
+        batch_dim = self.batch_size if self.drop_remainder else None
+        names, shapes, types = info
+        pad_info = self.pad_info or {}
+        batch_shapes = []
+        for name, shape in builtins.zip(names, shapes):
+            if name in pad_info and pad_info[name][0] is not None:
+                pad_shape = pad_info[name][0]
+                if shape is None or len(shape) != len(pad_shape):
+                    shape = list(pad_shape)
+                else:
+                    shape = [dim if pad_dim is None else pad_dim for pad_dim, dim in builtins.zip(pad_shape, shape)]
+            batch_shapes.append(None if shape is None else [batch_dim] + shape)
+        return names, batch_shapes, types
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -1820,6 +1878,9 @@ class SyncWaitDataset(DatasetOp):
         args["condition_func"] = self._pair.block_func
         return args
 
+    def _static_output_info(self):
+        return self.children[0]._static_output_info()
+
     def update_sync_batch_size(self, batch_size):
         if isinstance(batch_size, int) and batch_size <= 0:
             raise ValueError("num_batch need to be greater than 0.")
@@ -1874,9 +1935,11 @@ class ShuffleDataset(DatasetOp):
         args["buffer_size"] = self.buffer_size
         if self.reshuffle_each_epoch is not None:
             args["reshuffle_each_epoch"] = self.reshuffle_each_epoch
-
         return args
 
+    def _static_output_info(self):
+        return self.children[0]._static_output_info()
+
     def is_shuffled(self):
         return True
 
@@ -1903,23 +1966,153 @@ def _pyfunc_worker_exec(index, *args):
         raise Exception("Multiprocess MapOp worker receives KeyboardInterrupt")
 
 
+# Pyfunc worker execution function for a chunk of rows
+# The python callable stays resident in the worker process and is applied to all the rows of the chunk
+# Exceptions are returned with the row they are raised on, so they do not fail the other rows of the chunk
+def _pyfunc_worker_exec_chunk(index, rows):
+    try:
+        py_callable = _GLOBAL_PYFUNC_LIST[index]
+        results = []
+        for args in rows:
+            try:
+                results.append((py_callable(*args), None))
+            except Exception as e:
+                results.append((None, e))
+        return results
+    except KeyboardInterrupt:
+        raise Exception("Multiprocess MapOp worker receives KeyboardInterrupt")
+
+
+class _PyFuncCall:
+    """
+    A row waiting for the result of a python callable executed in the process pool.
+    """
+
+    def __init__(self, idx, args):
+        self.idx = idx
+        self.args = args
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def set_result(self, result):
+        if not self._done.is_set():
+            self._result = result
+            self._done.set()
+
+    def set_error(self, error):
+        if not self._done.is_set():
+            self._error = error
+            self._done.set()
+
+    def get(self):
+        self._done.wait()
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+class _PyFuncChunkDispatcher:
+    """
+    Ships the rows of concurrent pyfunc calls to the process pool in chunks.
+
+    The map worker threads each submit one row and block on its result. A dispatcher thread keeps at most one chunk
+    in flight per worker process. Whenever a process is free, the waiting rows of the same python callable are
+    spread over the free processes in chunks of at most chunk_size rows, so a row never waits for a chunk to fill up,
+    and the rows that arrive while all the processes are busy are shipped together.
+    """
+
+    def __init__(self, pool, num_processes, chunk_size):
+        self._pool = pool
+        self._num_processes = num_processes
+        self._chunk_size = chunk_size
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._in_flight = []
+        self._closed = False
+        self._thread = threading.Thread(target=self._dispatch, daemon=True)
+        self._thread.start()
+
+    def execute(self, idx, args):
+        """Execute the python callable of index idx on a row, block until the result is returned."""
+        call = _PyFuncCall(idx, args)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("The process pool of the map is closed.")
+            self._waiting.append(call)
+            self._cond.notify_all()
+        return call.get()
+
+    def close(self):
+        """Stop dispatching, the rows waiting for or being processed get an error instead of their result."""
+        with self._cond:
+            self._closed = True
+            calls = self._waiting + [call for chunk in self._in_flight for call in chunk]
+            self._waiting = []
+            self._cond.notify_all()
+        error = RuntimeError("The process pool of the map is closed.")
+        for call in calls:
+            call.set_error(error)
+
+    def _dispatch(self):
+        while True:
+            with self._cond:
+                while not self._closed and (not self._waiting or len(self._in_flight) >= self._num_processes):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                idx = self._waiting[0].idx
+                candidates = [call for call in self._waiting if call.idx == idx]
+                free_processes = self._num_processes - len(self._in_flight)
+                size = min(self._chunk_size, math.ceil(len(candidates) / free_processes))
+                chunk = candidates[:size]
+                self._waiting = [call for call in self._waiting if call not in chunk]
+                self._in_flight.append(chunk)
+            self._pool.apply_async(_pyfunc_worker_exec_chunk, [idx, [call.args for call in chunk]],
+                                   callback=functools.partial(self._on_result, chunk),
+                                   error_callback=functools.partial(self._on_error, chunk))
+
+    def _on_result(self, chunk, results):
+        for call, (result, error) in builtins.zip(chunk, results):
+            if error is not None:
+                call.set_error(error)
+            else:
+                call.set_result(result)
+        self._release(chunk)
+
+    def _on_error(self, chunk, error):
+        for call in chunk:
+            call.set_error(error)
+        self._release(chunk)
+
+    def _release(self, chunk):
+        with self._cond:
+            if chunk in self._in_flight:
+                self._in_flight.remove(chunk)
+            self._cond.notify_all()
+
+
 # PythonCallable wrapper for multiprocess pyfunc
 class _PythonCallable:
     """
     Internal python function wrapper for multiprocessing pyfunc.
     """
 
-    def __init__(self, py_callable, idx, pool=None):
+    def __init__(self, py_callable, idx, pool=None, dispatcher=None):
         # Original python callable from user.
         self.py_callable = py_callable
         # Process pool created for current iterator.
         self.pool = pool
         # Python callable index for subprocess _GLOBAL_PYFUNC_LIST
         self.idx = idx
+        # Chunk dispatcher of the pool, None if rows are sent one by one.
+        self.dispatcher = dispatcher
 
     def __call__(self, *args):
         if self.pool is not None:
             try:
+                if self.dispatcher is not None:
+                    return self.dispatcher.execute(self.idx, args)
                 # This call will send the tensors along with Python callable index to the process pool.
                 # Block, yield GIL. Current thread will reacquire GIL once result is returned.
                 return self.pool.apply(_pyfunc_worker_exec, [self.idx, *args])
@@ -1954,6 +2147,8 @@ class MapDataset(DatasetOp):
             option could be beneficial if the python operation is computational heavy (default=False).
         cache (DatasetCache, optional): Tensor cache to use. (default=None which means no cache is used).
             The cache feature is under development and is not recommended.
+        chunk_size (int, optional): Maximum number of rows sent to a worker process at once, only used when
+            python_multiprocessing is True (default=1).
 
 
         Raises:
@@ -1961,7 +2156,7 @@ class MapDataset(DatasetOp):
     """
 
     def __init__(self, input_dataset, input_columns=None, operations=None, output_columns=None, columns_order=None,
-                 num_parallel_workers=None, python_multiprocessing=False, cache=None):
+                 num_parallel_workers=None, python_multiprocessing=False, cache=None, chunk_size=1):
         super().__init__(num_parallel_workers)
         self.children.append(input_dataset)
         if input_columns is not None and not isinstance(input_columns, list):
@@ -1984,10 +2179,17 @@ class MapDataset(DatasetOp):
         input_dataset.parent.append(self)
         self._input_indexs = input_dataset.input_indexs
         self.python_multiprocessing = python_multiprocessing
+        self.chunk_size = chunk_size
         self.process_pool = None
+        self.chunk_dispatcher = None
+        self._pool_size = None
 
     def get_args(self):
         args = super().get_args()
+        if self.chunk_dispatcher is not None:
+            # More map worker threads than processes, so that rows are waiting to fill the next chunk
+            # while all the processes are busy.
+            args["num_parallel_workers"] = self._pool_size * self.chunk_size
         args["input_columns"] = self.input_columns
         args["operations"] = self.operations
         args["output_columns"] = self.output_columns
@@ -1995,6 +2197,38 @@ class MapDataset(DatasetOp):
         args["cache"] = self.cache.cache_client if self.cache is not None else None
         return args
 
+    def _static_output_info(self):
+        info = self.children[0]._static_output_info()
+        if info is None:
+            return None
+        names, shapes, types = info
+        input_columns = self.input_columns or names[:1]
+        if any(name not in names for name in input_columns):
+            return None
+        columns = [(shapes[names.index(name)], types[names.index(name)]) for name in input_columns]
+        if self.operations:
+            columns = shape_inference.apply_operations(self.operations, columns)
+        output_columns = self.output_columns or input_columns
+        if columns is None or len(columns) != len(output_columns):
+            return None
+
+        if len(output_columns) == len(input_columns):
+            # the outputs replace the inputs in place
+            outputs = dict(builtins.zip(input_columns, builtins.zip(output_columns, columns)))
+            result = [outputs[name] if name in outputs else (name, (shape, np_type))
+                      for name, shape, np_type in builtins.zip(names, shapes, types)]
+        else:
+            # the outputs come first, followed by the columns not used as inputs
+            result = list(builtins.zip(output_columns, columns)) + \
+                     [(name, (shape, np_type)) for name, shape, np_type in builtins.zip(names, shapes, types)
+                      if name not in input_columns]
+        if self.columns_order is not None:
+            result = dict(result)
+            if any(name not in result for name in self.columns_order):
+                return None
+            result = [(name, result[name]) for name in self.columns_order]
+        return [name for name, _ in result], [column[0] for _, column in result], [column[1] for _, column in result]
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -2019,6 +2253,10 @@ class MapDataset(DatasetOp):
         new_op.ms_role = copy.deepcopy(self.ms_role, memodict)
         new_op.input_indexs = copy.deepcopy(self._input_indexs, memodict)
         new_op.python_multiprocessing = copy.deepcopy(self.python_multiprocessing, memodict)
+        new_op.chunk_size = self.chunk_size
+        new_op.process_pool = None
+        new_op.chunk_dispatcher = None
+        new_op._pool_size = None
         new_op.cache = copy.deepcopy(self.cache, memodict)
         new_op.operations = self.operations
         return new_op
@@ -2040,17 +2278,24 @@ class MapDataset(DatasetOp):
                     callable_list.append(op)
 
             if callable_list:
+                num_processes = self.num_parallel_workers
+                if self.chunk_size > 1 and num_processes is None:
+                    num_processes = get_num_parallel_workers()
                 # Construct pool with the callable list
                 # The callable list and _pyfunc_worker_init are used to pass lambda function in to subprocesses
-                self.process_pool = multiprocessing.Pool(processes=self.num_parallel_workers,
+                self.process_pool = multiprocessing.Pool(processes=num_processes,
                                                          initializer=_pyfunc_worker_init,
                                                          initargs=(callable_list,))
+                if self.chunk_size > 1:
+                    self._pool_size = num_processes
+                    self.chunk_dispatcher = _PyFuncChunkDispatcher(self.process_pool, num_processes, self.chunk_size)
                 # Pass #2
                 idx = 0
                 for op in self.operations:
                     if callable(op):
                         # Wrap python callable into _PythonCallable
-                        iter_specific_operations.append(_PythonCallable(op, idx, self.process_pool))
+                        iter_specific_operations.append(_PythonCallable(op, idx, self.process_pool,
+                                                                        self.chunk_dispatcher))
                         idx += 1
                     else:
                         # CPP ops remain the same
@@ -2058,6 +2303,8 @@ class MapDataset(DatasetOp):
                 self.operations = iter_specific_operations
 
     def __del__(self):
+        if hasattr(self, 'chunk_dispatcher') and self.chunk_dispatcher is not None:
+            self.chunk_dispatcher.close()
         if hasattr(self, 'process_pool') and self.process_pool is not None:
             self.process_pool.terminate()
 
@@ -2090,6 +2337,9 @@ class FilterDataset(DatasetOp):
         args["input_columns"] = self.input_columns
         return args
 
+    def _static_output_info(self):
+        return self.children[0]._static_output_info()
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -2124,6 +2374,9 @@ class RepeatDataset(DatasetOp):
         args["count"] = self.count
         return args
 
+    def _static_output_info(self):
+        return self.children[0]._static_output_info()
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -2167,6 +2420,9 @@ class SkipDataset(DatasetOp):
         args["count"] = self.count
         return args
 
+    def _static_output_info(self):
+        return self.children[0]._static_output_info()
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -2202,6 +2458,9 @@ class TakeDataset(DatasetOp):
         args["count"] = self.count
         return args
 
+    def _static_output_info(self):
+        return self.children[0]._static_output_info()
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -2264,6 +2523,12 @@ class ZipDataset(DatasetOp):
         args = super().get_args()
         return args
 
+    def _static_output_info(self):
+        infos = [child._static_output_info() for child in self.children]
+        if None in infos:
+            return None
+        return tuple([item for info in infos for item in info[i]] for i in range(3))
+
 
 class ConcatDataset(DatasetOp):
     """
@@ -2297,6 +2562,10 @@ class ConcatDataset(DatasetOp):
         dataset_size = sum(children_sizes)
         return dataset_size
 
+    def _static_output_info(self):
+        # the datasets concatenated have the same columns
+        return self.children[0]._static_output_info()
+
 
 class RenameDataset(DatasetOp):
     """
@@ -2326,6 +2595,13 @@ class RenameDataset(DatasetOp):
         args["output_columns"] = self.output_column_names
         return args
 
+    def _static_output_info(self):
+        info = self.children[0]._static_output_info()
+        if info is None:
+            return None
+        new_names = dict(builtins.zip(self.input_column_names, self.output_column_names))
+        return [new_names.get(name, name) for name in info[0]], info[1], info[2]
+
 
 class ProjectDataset(DatasetOp):
     """
@@ -2355,6 +2631,13 @@ class ProjectDataset(DatasetOp):
         args["prefetch_size"] = self.prefetch_size
         return args
 
+    def _static_output_info(self):
+        info = self.children[0]._static_output_info()
+        if info is None or any(name not in info[0] for name in self.columns):
+            return None
+        indexes = [info[0].index(name) for name in self.columns]
+        return tuple([item[index] for index in indexes] for item in info)
+
 
 class TransferDataset(DatasetOp):
     """
@@ -2753,6 +3036,9 @@ class MnistDataset(MappableDataset):
         args["shard_id"] = self.shard_id
         return args
 
+    def _static_output_info(self):
+        return ["image", "label"], [[28, 28, 1], []], [np.dtype(np.uint8), np.dtype(np.uint32)]
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -2937,10 +3223,61 @@ def _generator_fn(generator, num_samples):
             yield val
 
 
-def _py_sampler_fn(sampler, num_samples, dataset):
+def _batch_indices(indices, batch_size, drop_remainder):
+    """
+    Split the indices into batches of batch_size indices.
+    """
+    batches = [np.asarray(indices[i:i + batch_size]) for i in range(0, len(indices), batch_size)]
+    if drop_remainder and batches and len(batches[-1]) < batch_size:
+        batches.pop()
+    return batches
+
+
+def _fetch_row(dataset, idx):
+    """
+    Fetch a row of a random accessible dataset.
+    """
+    return dataset[idx]
+
+
+def _fetch_batch(dataset, indices):
+    """
+    Fetch the rows of the indices of a random accessible dataset as one batch.
+
+    If the dataset has `__getitems__`, all the rows are read by a single `__getitems__(indices)` call, which returns
+    the columns of the batch as a tuple of arrays, or the rows as a list to be stacked. Otherwise the rows are read
+    one by one and stacked.
+    """
+    if hasattr(dataset, "__getitems__"):
+        batch = dataset.__getitems__(indices)
+        if isinstance(batch, np.ndarray):
+            return (batch,)
+        if not isinstance(batch, list):
+            return tuple(batch)
+        rows = batch
+    else:
+        rows = [dataset[idx] for idx in indices]
+    return tuple([np.stack([np.array(x, copy=False) for x in column]) for column in builtins.zip(*rows)])
+
+
+def _batch_sampler_fn(indices, dataset, batch_size, drop_remainder):
+    """
+    Generator function wrapper for mappable dataset fetched by batches.
+    """
+    for batch_indices in _batch_indices(indices, batch_size, drop_remainder):
+        val = _fetch_batch(dataset, batch_indices)
+        # convert output tensors to ndarrays
+        yield tuple([np.array(x, copy=False) for x in val])
+
+
+def _py_sampler_fn(sampler, num_samples, dataset, batch_size=None, drop_remainder=False):
     """
     Generator function wrapper for mappable dataset with python sampler.
     """
+    if batch_size is not None:
+        indices = _fetch_py_sampler_indices(sampler, num_samples)
+        yield from _batch_sampler_fn(indices, dataset, batch_size, drop_remainder)
+        return
     if num_samples is not None:
         sampler_iter = iter(sampler)
         for _ in range(num_samples):
@@ -2958,31 +3295,59 @@ def _py_sampler_fn(sampler, num_samples, dataset):
             yield tuple([np.array(x, copy=False) for x in val])
 
 
-def _cpp_sampler_fn(sampler, dataset):
+def _cpp_sampler_fn(sampler, dataset, batch_size=None, drop_remainder=False):
     """
     Generator function wrapper for mappable dataset with cpp sampler.
     """
     indices = sampler.get_indices()
+    if batch_size is not None:
+        yield from _batch_sampler_fn(indices, dataset, batch_size, drop_remainder)
+        return
     for i in indices:
         val = dataset[i]
         # convert output tensors to ndarrays
         yield tuple([np.array(x, copy=False) for x in val])
 
 
-def _cpp_sampler_fn_mp(sampler, dataset, num_worker):
+def _cpp_sampler_fn_mp(sampler, dataset, num_worker, max_rowsize, batch_size=None, drop_remainder=False):
     """
     Multiprocessing generator function wrapper for mappable dataset with cpp sampler.
     """
     indices = sampler.get_indices()
-    return _sampler_fn_mp(indices, dataset, num_worker)
+    return _sampler_fn_mp_wrapper(indices, dataset, num_worker, max_rowsize, batch_size, drop_remainder)
 
 
-def _py_sampler_fn_mp(sampler, num_samples, dataset, num_worker):
+def _py_sampler_fn_mp(sampler, num_samples, dataset, num_worker, max_rowsize, batch_size=None,
+                      drop_remainder=False):
     """
     Multiprocessing generator function wrapper for mappable dataset with python sampler.
     """
     indices = _fetch_py_sampler_indices(sampler, num_samples)
-    return _sampler_fn_mp(indices, dataset, num_worker)
+    return _sampler_fn_mp_wrapper(indices, dataset, num_worker, max_rowsize, batch_size, drop_remainder)
+
+
+def _sampler_fn_mp_wrapper(indices, dataset, num_worker, max_rowsize, batch_size, drop_remainder):
+    """
+    Dispatch rows, or batches of rows when batch_size is set, to the worker processes.
+    """
+    if batch_size is None:
+        return _sampler_fn_mp(indices, dataset, num_worker, max_rowsize * 1024 * 1024)
+    return _batch_sampler_fn_mp(_batch_indices(indices, batch_size, drop_remainder), dataset, num_worker)
+
+
+def _batch_sampler_fn_mp(batch_indices, dataset, num_worker):
+    """
+    Multiprocessing generator function wrapper for mappable dataset fetched by batches.
+
+    The first batch is fetched by the master process, and the shared memory slots of the workers are sized to hold
+    it, so they follow the actual size of the batches. A later batch which does not fit is pickled instead.
+    """
+    if not batch_indices:
+        return
+    first_batch = _fetch_batch(dataset, batch_indices[0])
+    yield tuple([np.array(x, copy=False) for x in first_batch])
+    slot_size = SharedRingBuffer.row_size(first_batch) or 0
+    yield from _sampler_fn_mp(batch_indices[1:], dataset, num_worker, slot_size, _fetch_batch)
 
 
 def _fetch_py_sampler_indices(sampler, num_samples):
@@ -3002,82 +3367,94 @@ def _fetch_py_sampler_indices(sampler, num_samples):
     return [i for i in sampler]
 
 
-def _fill_worker_indices(workers, indices, idx):
-    """
-    Worker index queue filler, fill worker index queue in round robin order.
-    """
-    num_worker = len(workers)
-    while idx < len(indices):
-        try:
-            workers[idx % num_worker].put(indices[idx])
-            idx += 1
-        except queue.Full:
-            break
-    return idx
+# Number of rows each worker can be ahead of the slowest row, and number of shared memory slots of each worker.
+_WORKER_PREFETCH_SIZE = 4
 
 
-def _sampler_fn_mp(indices, dataset, num_worker):
+def _sampler_fn_mp(indices, dataset, num_worker, slot_size, fetch=_fetch_row):
     """
     Multiprocessing generator function wrapper master process.
+
+    Each index is fetched as fetch(dataset, index) by a worker, an index can also be the indices of a whole batch.
+    The rows are passed through shared memory slots of slot_size bytes.
+
+    Indices are dispatched through a queue shared by all workers, so an idle worker always takes the next index
+    and one slow row does not stall the other workers. Rows may complete out of order, they are reordered within a
+    window of `_WORKER_PREFETCH_SIZE * num_worker` rows before being yielded in the order of the indices.
     """
+    idx_queue = multiprocessing.Queue()
+    res_queue = multiprocessing.Queue()
     workers = []
-    # Event for end of epoch
-    eoe = multiprocessing.Event()
 
-    # Create workers
-    for _ in range(num_worker):
-        worker = _GeneratorWorker(dataset, eoe)
+    # Create and start workers
+    for worker_id in range(num_worker):
+        worker = _GeneratorWorker(dataset, idx_queue, res_queue, worker_id, slot_size, fetch)
         worker.daemon = True
         workers.append(worker)
+    for w in workers:
+        w.start()
 
-    # Fill initial index queues
+    window = _WORKER_PREFETCH_SIZE * num_worker
     idx_cursor = 0
-    idx_cursor = _fill_worker_indices(workers, indices, idx_cursor)
+    reorder_buffer = {}
+    try:
+        for pos in range(len(indices)):
+            # Keep the window of dispatched indices full
+            while idx_cursor < len(indices) and idx_cursor < pos + window:
+                idx_queue.put((idx_cursor, indices[idx_cursor]))
+                idx_cursor += 1
+            # Fetch results until the row of the current position arrives
+            while pos not in reorder_buffer:
+                res_pos, worker_id, slot_info, result = res_queue.get()
+                if isinstance(result, _GeneratorWorkerError):
+                    raise Exception("Generator worker process raises an exception:\n" + result.message)
+                if slot_info is not None:
+                    result = workers[worker_id].ring_buffer.read(*slot_info)
+                reorder_buffer[res_pos] = result
+            yield tuple([np.array(x, copy=False) for x in reorder_buffer.pop(pos)])
+    except KeyboardInterrupt:
+        raise Exception("Generator worker receives KeyboardInterrupt")
+    finally:
+        for w in workers:
+            w.terminate()
+            w.join()
 
-    # Start all workers
-    for w in workers:
-        w.start()
 
-    # Fetch results
-    for i in range(len(indices)):
-        # Fetch result and put index
-        try:
-            result = workers[i % num_worker].get()
-        except queue.Empty:
-            raise Exception("Generator worker process timeout")
-        except KeyboardInterrupt:
-            for w in workers:
-                w.terminate()
-                w.join()
-            raise Exception("Generator worker receives KeyboardInterrupt")
-        if idx_cursor < len(indices):
-            idx_cursor = _fill_worker_indices(workers, indices, idx_cursor)
-        # Set eoe event once all indices are sent
-        if idx_cursor == len(indices) and not eoe.is_set():
-            eoe.set()
-        yield tuple([np.array(x, copy=False) for x in result])
+class _GeneratorWorkerError:
+    """
+    Error raised in a generator worker process, with the formatted traceback as the message.
+    """
 
+    def __init__(self, message):
+        self.message = message
 
-def _generator_worker_loop(dataset, idx_queue, result_queue, eoe):
+
+def _generator_worker_loop(dataset, idx_queue, result_queue, ring_buffer, worker_id, fetch):
     """
     Multiprocessing generator worker process loop.
     """
     while True:
         # Fetch index, block
         try:
-            idx = idx_queue.get()
+            item = idx_queue.get()
         except KeyboardInterrupt:
             raise Exception("Generator worker receives KeyboardInterrupt")
-        if idx is None:
-            # When the queue is out of scope from master process, a None item can be fetched from the queue.
-            # Upon receiving None, worker process should check if EOE is set.
-            assert eoe.is_set(), ""
+        if item is None:
             return
-        # Fetch data, any exception from __getitem__ will terminate worker and timeout master process
-        result = dataset[idx]
+        pos, idx = item
+        # Fetch data, any exception from __getitem__ is sent to the master process
+        try:
+            result = fetch(dataset, idx)
+        except Exception:
+            result_queue.put((pos, worker_id, None, _GeneratorWorkerError(traceback.format_exc())))
+            return
+        # Write data into the shared memory, rows too large or not numeric fall back to pickling
+        slot_info = ring_buffer.write(result)
+        if slot_info is not None:
+            result = None
         # Send data, block
         try:
-            result_queue.put(result)
+            result_queue.put((pos, worker_id, slot_info, result))
         except KeyboardInterrupt:
             raise Exception("Generator worker receives KeyboardInterrupt")
         del result, idx
@@ -3088,22 +3465,10 @@ class _GeneratorWorker(multiprocessing.Process):
     Worker process for multiprocess Generator.
     """
 
-    def __init__(self, dataset, eoe):
-        self.idx_queue = multiprocessing.Queue(16)
-        self.res_queue = multiprocessing.Queue(16)
-        super().__init__(target=_generator_worker_loop, args=(dataset, self.idx_queue, self.res_queue, eoe))
-
-    def put(self, item):
-        """
-        Put function for worker index queue. Never block. Raise queue.Full on failure.
-        """
-        self.idx_queue.put_nowait(item)
-
-    def get(self):
-        """
-        Get function for worker result queue. Block with timeout.
-        """
-        return self.res_queue.get()
+    def __init__(self, dataset, idx_queue, res_queue, worker_id, slot_size, fetch):
+        self.ring_buffer = SharedRingBuffer(_WORKER_PREFETCH_SIZE, slot_size)
+        super().__init__(target=_generator_worker_loop,
+                         args=(dataset, idx_queue, res_queue, self.ring_buffer, worker_id, fetch))
 
     def __del__(self):
         self.terminate()
@@ -3166,6 +3531,17 @@ class GeneratorDataset(MappableDataset):
             When this argument is specified, 'num_samples' will not effect. Random accessible input is required.
         shard_id (int, optional): The shard ID within num_shards (default=None). This argument should be specified only
             when num_shards is also specified. Random accessible input is required.
+        max_rowsize (int, optional): Maximum size of a row in MB for the shared memory used to pass rows from the
+            worker processes, only used when num_parallel_workers is greater than 1 (default=6). A larger row, or a
+            row containing python objects, is pickled through a queue instead.
+        batch_size (int, optional): Number of rows fetched at once as one row of the dataset, so the dataset
+            produces whole batches without a following batch operation (default=None, fetch rows one by one).
+            Random accessible input is required. If the source has `__getitems__(indices)`, it is called with a
+            numpy array of the indices of a batch and returns the columns of the batch as a tuple of numpy arrays,
+            whose first dimension is the batch; otherwise the rows are fetched by `source[idx]` and stacked.
+            With multiple workers, the shared memory is sized from the first batch and max_rowsize is not used.
+        drop_remainder (bool, optional): Whether to drop the last batch if it has less than batch_size rows,
+            only used when batch_size is set (default=False).
 
     Examples:
         >>> import mindspore.dataset as ds
@@ -3197,16 +3573,27 @@ class GeneratorDataset(MappableDataset):
         >>> list_generator = ds.GeneratorDataset([(np.array(0),), (np.array(1)), (np.array(2))], ["col1"])
         >>> # 5) Built-in Sampler
         >>> my_generator = ds.GeneratorDataset(my_ds, ["img", "label"], sampler=samplers.RandomSampler())
+        >>> # 6) Random accessible input read by batches
+        >>> class MyBatchRA():
+        >>>     def __getitem__(self, index):
+        >>>         return # User implementation
+        >>>     def __getitems__(self, indices):
+        >>>         return # User implementation, the columns of the rows of indices
+        >>> batch_generator = ds.GeneratorDataset(MyBatchRA(), ["col1"], batch_size=32, drop_remainder=True)
         >>>
     """
 
     @check_generatordataset
     def __init__(self, source, column_names=None, column_types=None, schema=None, num_samples=None,
-                 num_parallel_workers=1, shuffle=None, sampler=None, num_shards=None, shard_id=None):
+                 num_parallel_workers=1, shuffle=None, sampler=None, num_shards=None, shard_id=None, max_rowsize=6,
+                 batch_size=None, drop_remainder=False):
         super().__init__(num_parallel_workers)
         self.source = source
         self.sampler = _select_sampler(num_samples, sampler, shuffle, num_shards, shard_id)
         self.num_samples = num_samples
+        self.max_rowsize = max_rowsize
+        self.batch_size = batch_size
+        self.drop_remainder = drop_remainder
 
         if column_names is not None and not isinstance(column_names, list):
             column_names = [column_names]
@@ -3237,6 +3624,18 @@ class GeneratorDataset(MappableDataset):
         args["column_types"] = self.column_types
         return args
 
+    def _static_output_info(self):
+        if not isinstance(self.source, _NumpySlicesDataset):
+            # the rows are only known by calling the source
+            return None
+        if self.batch_size is not None and not self.drop_remainder:
+            rows_from_sampler = self._get_sampler_dataset_size()
+            num_rows = len(self.source) if rows_from_sampler is None else min(rows_from_sampler, len(self.source))
+            if num_rows < self.batch_size:
+                return None
+        columns = [shape_inference.array_column(data, self.batch_size) for data in self.source.data]
+        return list(self.column_names), [column[0] for column in columns], [column[1] for column in columns]
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -3247,11 +3646,17 @@ class GeneratorDataset(MappableDataset):
         rows_from_sampler = self._get_sampler_dataset_size()
 
         if rows_from_sampler is None:
-            return self._dataset_size
-        if self._dataset_size is None:
+            num_rows = self._dataset_size
+        elif self._dataset_size is None:
             return None
+        else:
+            num_rows = min(rows_from_sampler, self._dataset_size)
 
-        return min(rows_from_sampler, self._dataset_size)
+        if num_rows is None or self.batch_size is None:
+            return num_rows
+        if self.drop_remainder:
+            return num_rows // self.batch_size
+        return math.ceil(num_rows / self.batch_size)
 
     # manually set dataset_size as a temporary solution.
     def set_dataset_size(self, value):
@@ -3273,6 +3678,9 @@ class GeneratorDataset(MappableDataset):
         new_op.column_types = copy.deepcopy(self.column_types, memodict)
         new_op.column_names = copy.deepcopy(self.column_names, memodict)
         new_op.num_samples = copy.deepcopy(self.num_samples, memodict)
+        new_op.max_rowsize = self.max_rowsize
+        new_op.batch_size = self.batch_size
+        new_op.drop_remainder = self.drop_remainder
 
         new_op.sampler = copy.deepcopy(self.sampler)
         if new_op.sampler is not None and hasattr(self.source, "__getitem__"):
@@ -3283,14 +3691,20 @@ class GeneratorDataset(MappableDataset):
                 sampler_instance.set_num_rows(len(self.source))
                 sampler_instance.initialize()
                 if new_op.num_parallel_workers > 1:
-                    new_op.source = (lambda: _cpp_sampler_fn_mp(sampler_instance, self.source, new_op.num_parallel_workers))
+                    new_op.source = (lambda: _cpp_sampler_fn_mp(sampler_instance, self.source,
+                                                                new_op.num_parallel_workers, new_op.max_rowsize,
+                                                                new_op.batch_size, new_op.drop_remainder))
                 else:
-                    new_op.source = (lambda: _cpp_sampler_fn(sampler_instance, self.source))
+                    new_op.source = (lambda: _cpp_sampler_fn(sampler_instance, self.source, new_op.batch_size,
+                                                             new_op.drop_remainder))
             else:
                 if new_op.num_parallel_workers > 1:
-                    new_op.source = (lambda: _py_sampler_fn_mp(new_op.sampler, new_op.num_samples, self.source, new_op.num_parallel_workers))
+                    new_op.source = (lambda: _py_sampler_fn_mp(new_op.sampler, new_op.num_samples, self.source,
+                                                               new_op.num_parallel_workers, new_op.max_rowsize,
+                                                               new_op.batch_size, new_op.drop_remainder))
                 else:
-                    new_op.source = (lambda: _py_sampler_fn(new_op.sampler, new_op.num_samples, self.source))
+                    new_op.source = (lambda: _py_sampler_fn(new_op.sampler, new_op.num_samples, self.source,
+                                                            new_op.batch_size, new_op.drop_remainder))
         else:
             try:
                 iter(self.source)
@@ -3425,18 +3839,30 @@ class TFRecordDataset(SourceDataset):
         args["sampler"] = self.sampler
         return args
 
+    def _static_output_info(self):
+        if self.schema is None:
+            # the columns are only known from the data
+            return None
+        return shape_inference.schema_columns(self.schema, self.columns_list)
+
     def get_dataset_size(self, estimate=False):
         """
         Get the number of batches in an epoch.
 
+        The rows are counted from the row indexes of the files if `mindspore.dataset.config.set_index_dir` is set,
+        so the files are only scanned once.
+
         Args:
-            estimate (bool, optional): Fast estimation of the dataset size instead of a full scan.
+            estimate (bool, optional): Fast estimation of the dataset size instead of a full scan, not used when the
+                rows are counted from the row indexes.
 
         Return:
             Number, number of batches.
         """
         if self._dataset_size is None:
-            num_rows = TFReaderOp.get_num_rows(self.dataset_files, 8, estimate)
+            num_rows = row_index.count_rows(self.dataset_files, row_index.TFRECORD)
+            if num_rows is None:
+                num_rows = TFReaderOp.get_num_rows(self.dataset_files, 8, estimate)
             num_rows = get_num_rows(num_rows, self.num_shards)
             if self.num_samples is None:
                 return num_rows
@@ -3737,6 +4163,9 @@ class Cifar10Dataset(MappableDataset):
         args["shuffle"] = self.shuffle_level
         return args
 
+    def _static_output_info(self):
+        return ["image", "label"], [[32, 32, 3], []], [np.dtype(np.uint8), np.dtype(np.uint32)]
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -3873,6 +4302,10 @@ class Cifar100Dataset(MappableDataset):
         args["shuffle"] = self.shuffle_level
         return args
 
+    def _static_output_info(self):
+        return ["image", "coarse_label", "fine_label"], [[32, 32, 3], [], []], \
+               [np.dtype(np.uint8), np.dtype(np.uint32), np.dtype(np.uint32)]
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -3966,6 +4399,12 @@ class RandomDataset(SourceDataset):
         args["sampler"] = self.sampler
         return args
 
+    def _static_output_info(self):
+        if self.schema is None:
+            # the columns are only known from the data
+            return None
+        return shape_inference.schema_columns(self.schema, self.columns_list)
+
     def get_dataset_size(self):
         """
         Get the number of batches in an epoch.
@@ -4891,7 +5330,9 @@ class CLUEDataset(SourceDataset):
             Number, number of batches.
         """
         if self._dataset_size is None:
-            num_rows = ClueOp.get_num_rows(self.dataset_files)
+            num_rows = row_index.count_rows(self.dataset_files, row_index.TEXT)
+            if num_rows is None:
+                num_rows = ClueOp.get_num_rows(self.dataset_files)
             num_rows = get_num_rows(num_rows, self.num_shards)
             if self.num_samples is None:
                 return num_rows
@@ -4994,7 +5435,10 @@ class CSVDataset(SourceDataset):
             Number, number of batches.
         """
         if self._dataset_size is None:
-            num_rows = CsvOp.get_num_rows(self.dataset_files, self.column_names is None)
+            csv_header = self.column_names is None
+            num_rows = row_index.count_rows(self.dataset_files, row_index.CSV_HEADER if csv_header else row_index.CSV)
+            if num_rows is None:
+                num_rows = CsvOp.get_num_rows(self.dataset_files, csv_header)
             num_rows = get_num_rows(num_rows, self.num_shards)
             if self.num_samples == -1:
                 return num_rows
@@ -5085,7 +5529,9 @@ class TextFileDataset(SourceDataset):
             Number, number of batches.
         """
         if self._dataset_size is None:
-            num_rows = TextFileOp.get_num_rows(self.dataset_files)
+            num_rows = row_index.count_rows(self.dataset_files, row_index.TEXT)
+            if num_rows is None:
+                num_rows = TextFileOp.get_num_rows(self.dataset_files)
             num_rows = get_num_rows(num_rows, self.num_shards)
             # If the user gave a num samples in the dataset, then the sampler will limit the rows returned
             # to that amount.  Account for that here in the row count
@@ -5107,6 +5553,9 @@ class TextFileDataset(SourceDataset):
 class _NumpySlicesDataset:
     """
     Mainly for dealing with several kinds of format of python data, and return one row each time.
+
+    The columns are kept as the given numpy arrays (or the arrays behind pandas columns) without being copied,
+    rows are served as views of them, and a batch of rows is served by a single slice or fancy index per column.
     """
 
     def __init__(self, data, column_list=None):
@@ -5116,12 +5565,9 @@ class _NumpySlicesDataset:
             data = self.process_dict(data)
 
         if isinstance(data, tuple):
-            self.data = ()
-            data_len = len(data)
-            for i in range(data_len):
-                self.data = self.data + (np.array(data[i]),)
+            self.data = tuple([np.asarray(item) for item in data])
         else:
-            self.data = (np.array(data),)
+            self.data = (np.asarray(data),)
 
         # check whether the data length in each column is equal
         data_len = [len(data_item) for data_item in self.data]
@@ -5142,6 +5588,15 @@ class _NumpySlicesDataset:
         data_res = tuple(data_row)
         return data_res
 
+    def __getitems__(self, indices):
+        indices = np.asarray(indices)
+        if indices.size and indices[-1] - indices[0] + 1 == indices.size and np.all(np.diff(indices) == 1):
+            # a range of rows, e.g. from a sequential sampler, is served as views
+            index = slice(int(indices[0]), int(indices[-1]) + 1)
+        else:
+            index = indices
+        return tuple([d[index, ...] for d in self.data])
+
     def __len__(self):
         return len(self.data[0])
 
@@ -5149,23 +5604,15 @@ class _NumpySlicesDataset:
         """
         Convert the dict like data into tuple format, when input is a tuple of dicts then compose it into a dict first.
         """
-        # Convert pandas like dict(has "values" column) into General dict
-        data_keys = list(input_data.keys())
-        data_col = input_data[data_keys[0]]
-        if hasattr(data_col, "values"):
-            new_dict = {}
-            for key in data_keys:
-                item1 = input_data.pop(key)
-                new_dict[key] = item1.values
-            input_data = new_dict
-
-        # Convert the data in dict into tuple
+        # Convert the data in dict into tuple, pandas like columns (has "values") are converted into their arrays
         data = ()
         keys = list(input_data.keys())
         self.column_list = keys
         for key in keys:
             value = input_data[key]
-            data = data + (list(value),)
+            if hasattr(value, "values"):
+                value = value.values
+            data = data + (value,)
 
         return data
 
@@ -5219,6 +5666,14 @@ class NumpySlicesDataset(GeneratorDataset):
             When this argument is specified, 'num_samples' will not effect. Random accessible input is required.
         shard_id (int, optional): The shard ID within num_shards (default=None). This argument should be specified only
             when num_shards is also specified. Random accessible input is required.
+        batch_size (int, optional): Number of rows sliced at once as one row of the dataset, so the dataset produces
+            whole batches without a following batch operation (default=None, slice rows one by one).
+        drop_remainder (bool, optional): Whether to drop the last batch if it has less than batch_size rows,
+            only used when batch_size is set (default=False).
+
+    Note:
+        Numpy arrays and pandas columns are used without being copied, so they should not be modified while the
+        dataset is in use. Shuffle, samplers and shards only select the indices of the rows.
 
     Examples:
         >>> import mindspore.dataset as ds
@@ -5235,15 +5690,19 @@ class NumpySlicesDataset(GeneratorDataset):
         >>> import pandas as pd
         >>> df = pd.read_csv("file.csv")
         >>> dataset4 = ds.NumpySlicesDataset(dict(df), shuffle=False)
+        >>> # 5) Slice batches of 32 rows at once
+        >>> data = {"image": np.zeros((1024, 28, 28), np.float32), "label": np.zeros(1024, np.int32)}
+        >>> dataset5 = ds.NumpySlicesDataset(data, batch_size=32, drop_remainder=True)
     """
 
     @check_numpyslicesdataset
     def __init__(self, data, column_names=None, num_samples=None, num_parallel_workers=1, shuffle=None,
-                 sampler=None, num_shards=None, shard_id=None):
+                 sampler=None, num_shards=None, shard_id=None, batch_size=None, drop_remainder=False):
         dataset = _NumpySlicesDataset(data, column_names)
         super().__init__(dataset, column_names=dataset.column_list, num_samples=num_samples,
                          num_parallel_workers=num_parallel_workers, shuffle=shuffle, sampler=sampler,
-                         num_shards=num_shards, shard_id=shard_id)
+                         num_shards=num_shards, shard_id=shard_id, batch_size=batch_size,
+                         drop_remainder=drop_remainder)
 
 
 class BuildVocabDataset(DatasetOp):
@@ -0,0 +1,273 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+Persistent row index of the files of the TFRecord, text, CLUE and csv datasets.
+
+The index of a file holds its number of rows and, except for csv, the offsets of its rows. It is computed by the
+first scan of the file and stored in the index directory set by `mindspore.dataset.config.set_index_dir`, keyed on
+the path of the file. A stored index is only used while the size and the mtime of the file are unchanged, so the
+later processes count the rows of the dataset without reading it.
+"""
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..core.config import get_index_dir
+
+TFRECORD = "tfrecord"
+# the text and CLUE datasets both have a row per non empty line
+TEXT = "text"
+CSV = "csv"
+CSV_HEADER = "csv_header"
+
+INDEX_VERSION = 1
+_NUM_SCAN_WORKERS = 8
+_BLOCK_SIZE = 1 << 24
+# length, crc of the length, data, crc of the data
+_TFRECORD_HEADER = struct.Struct("<qI")
+_TFRECORD_FOOTER_SIZE = 4
+
+
+def _tfrecord_offsets(path):
+    """offsets of the records of a TFRecord file, the headers are read but not the data"""
+    size = os.path.getsize(path)
+    if size == 0:
+        return np.zeros(0, np.int64)
+    offsets = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        offset = 0
+        header_end = size - 8
+        while offset < size:
+            offsets.append(offset)
+            if offset > header_end:
+                # a truncated record is still a row, as in TFReaderOp
+                break
+            length = struct.unpack_from("<q", buf, offset)[0]
+            offset += _TFRECORD_HEADER.size + length + _TFRECORD_FOOTER_SIZE
+    return np.array(offsets, np.int64)
+
+
+def _line_offsets(path):
+    """offsets of the non empty lines of a text file"""
+    starts = []
+    line_start = 0
+    position = 0
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b""):
+            newlines = np.flatnonzero(np.frombuffer(block, np.uint8) == ord("\n")) + position
+            position += len(block)
+            if newlines.size == 0:
+                continue
+            begins = np.concatenate(([line_start], newlines[:-1] + 1))
+            starts.append(begins[newlines > begins])
+            line_start = int(newlines[-1]) + 1
+    if position > line_start:
+        starts.append(np.array([line_start]))
+    return np.concatenate(starts).astype(np.int64) if starts else np.zeros(0, np.int64)
+
+
+def _csv_num_rows(path, kind):
+    # the quoted fields of csv may hold newlines, so the rows are counted by the csv parser of the dataset
+    from mindspore._c_dataengine import CsvOp
+    return CsvOp.get_num_rows([path], kind == CSV_HEADER)
+
+
+class FileIndex:
+    """
+    Row index of a file.
+
+    Args:
+        path (str): Path of the file.
+        kind (str): Format of the file, TFRECORD, TEXT, CSV or CSV_HEADER.
+        num_rows (int): Number of rows of the file.
+        offsets (numpy.ndarray, optional): The offsets of the rows, None if they are not indexed (default=None).
+    """
+
+    def __init__(self, path, kind, num_rows, offsets=None):
+        self.path = path
+        self.kind = kind
+        self.num_rows = num_rows
+        self.offsets = offsets
+
+    @classmethod
+    def scan(cls, path, kind):
+        """Index a file by reading it."""
+        if kind == TFRECORD:
+            offsets = _tfrecord_offsets(path)
+        elif kind == TEXT:
+            offsets = _line_offsets(path)
+        elif kind in (CSV, CSV_HEADER):
+            return cls(path, kind, _csv_num_rows(path, kind))
+        else:
+            raise ValueError("Unsupported file kind {}.".format(kind))
+        return cls(path, kind, len(offsets), offsets)
+
+    def read(self, row):
+        """
+        Read a row of the file.
+
+        Args:
+            row (int): Index of the row in the file.
+
+        Returns:
+            bytes, the serialized example of a TFRecord file, the line without its newline of a text file.
+        """
+        if self.offsets is None:
+            raise RuntimeError("The rows of {} files are not indexed.".format(self.kind))
+        offset = int(self.offsets[row])
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            if self.kind == TFRECORD:
+                length, _ = _TFRECORD_HEADER.unpack(f.read(_TFRECORD_HEADER.size))
+                return f.read(length)
+            return f.readline().rstrip(b"\n")
+
+
+def _index_file(index_dir, path, kind):
+    key = hashlib.sha256((kind + "\n" + os.path.realpath(path)).encode("utf-8")).hexdigest()
+    return os.path.join(index_dir, key + ".npz")
+
+
+def _stat_key(path):
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _load(index_file, path, kind):
+    try:
+        with np.load(index_file) as index:
+            if int(index["version"]) != INDEX_VERSION or str(index["path"]) != os.path.realpath(path) or \
+                    (int(index["size"]), int(index["mtime"])) != _stat_key(path):
+                return None
+            offsets = index["offsets"] if bool(index["has_offsets"]) else None
+            return FileIndex(path, kind, int(index["num_rows"]), offsets)
+    except (OSError, ValueError, KeyError):
+        # no index, or an index being written by another process
+        return None
+
+
+def _store(index_file, file_index, stat_key):
+    fd, tmp_file = tempfile.mkstemp(prefix=".tmp_", suffix=".npz", dir=os.path.dirname(index_file))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            has_offsets = file_index.offsets is not None
+            np.savez(f, version=INDEX_VERSION, path=os.path.realpath(file_index.path), size=stat_key[0],
+                     mtime=stat_key[1], num_rows=file_index.num_rows, has_offsets=has_offsets,
+                     offsets=file_index.offsets if has_offsets else np.zeros(0, np.int64))
+        os.replace(tmp_file, index_file)
+    except OSError:
+        # the index is only an optimization, the next process scans the file again
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+
+
+def get_file_index(path, kind, index_dir=None):
+    """
+    Index of a file, loaded from the index directory or computed and stored there.
+
+    Args:
+        path (str): Path of the file.
+        kind (str): Format of the file, TFRECORD, TEXT, CSV or CSV_HEADER.
+        index_dir (str, optional): The index directory (default=None, the directory of the config).
+
+    Returns:
+        FileIndex, the index of the file.
+    """
+    index_dir = index_dir or get_index_dir()
+    if index_dir is None:
+        return FileIndex.scan(path, kind)
+    index_file = _index_file(index_dir, path, kind)
+    file_index = _load(index_file, path, kind)
+    if file_index is None:
+        # the stat is taken before the scan, so a file modified while being scanned is scanned again next time
+        stat_key = _stat_key(path)
+        file_index = FileIndex.scan(path, kind)
+        os.makedirs(index_dir, exist_ok=True)
+        _store(index_file, file_index, stat_key)
+    return file_index
+
+
+class RowIndex:
+    """
+    Row index of the files of a dataset, in the order of the files.
+
+    Args:
+        files (list[str]): Paths of the files.
+        kind (str): Format of the files, TFRECORD, TEXT, CSV or CSV_HEADER.
+        index_dir (str, optional): The index directory (default=None, the directory of the config).
+
+    Examples:
+        >>> index = RowIndex(dataset_files, TFRECORD)
+        >>> num_rows = len(index)
+        >>> # the rows of shard 1 of 8, with the same number of rows in every shard up to one
+        >>> begin, end = index.shard(8, 1)
+        >>> example = index.read(begin)
+    """
+
+    def __init__(self, files, kind, index_dir=None):
+        with ThreadPoolExecutor(_NUM_SCAN_WORKERS) as executor:
+            self.file_indexes = list(executor.map(lambda path: get_file_index(path, kind, index_dir), files))
+        self.row_ends = np.cumsum([file_index.num_rows for file_index in self.file_indexes], dtype=np.int64)
+
+    def __len__(self):
+        return int(self.row_ends[-1]) if self.row_ends.size else 0
+
+    def locate(self, row):
+        """
+        File of a row of the dataset.
+
+        Returns:
+            tuple, (FileIndex of the file, index of the row in the file).
+        """
+        if not 0 <= row < len(self):
+            raise IndexError("Row {} is out of range [0, {}).".format(row, len(self)))
+        file_id = int(np.searchsorted(self.row_ends, row, side="right"))
+        begin = int(self.row_ends[file_id - 1]) if file_id > 0 else 0
+        return self.file_indexes[file_id], row - begin
+
+    def read(self, row):
+        """Read a row of the dataset, see FileIndex.read."""
+        file_index, file_row = self.locate(row)
+        return file_index.read(file_row)
+
+    def shard(self, num_shards, shard_id):
+        """
+        Rows of a shard of the dataset, the rows are split in num_shards contiguous ranges whose sizes differ by one
+        at most.
+
+        Returns:
+            tuple, the rows [begin, end) of the shard.
+        """
+        if not 0 <= shard_id < num_shards:
+            raise ValueError("shard_id {} is out of range [0, {}).".format(shard_id, num_shards))
+        num_rows = len(self)
+        return shard_id * num_rows // num_shards, (shard_id + 1) * num_rows // num_shards
+
+
+def count_rows(files, kind):
+    """
+    Number of rows of the files of a dataset, from their indexes.
+
+    Returns:
+        int, None if the index directory is not set, the rows are then counted by the dataset op.
+    """
+    if get_index_dir() is None:
+        return None
+    return len(RowIndex(files, kind))
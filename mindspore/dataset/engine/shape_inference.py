@@ -0,0 +1,170 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+Static inference of the output shapes and types of a data pipeline, without launching it.
+
+A column is described by a (shape, type) pair, the shape is a list of dims and the type a numpy dtype. A dim, a
+whole shape or a type is None when it is only known by running the pipeline, e.g. the size of a decoded image.
+"""
+import json
+import os
+
+import numpy as np
+
+_RULES = None
+
+
+def is_complete(shapes, types):
+    """Whether all the shapes and types of the columns are known."""
+    return None not in types and all(shape is not None and None not in shape for shape in shapes)
+
+
+def numpy_type(type_name):
+    """
+    Numpy type of a dataset type name, like "int32" or the str of a mindspore type like "Float32".
+
+    Returns:
+        numpy.dtype, None for the types without a numeric numpy type, like strings.
+    """
+    try:
+        np_type = np.dtype(str(type_name).lower())
+    except TypeError:
+        return None
+    return np_type if np_type.kind in "biuf" else None
+
+
+def array_column(array, batch_size=None):
+    """(shape, type) of the rows of an array sliced along its first dim, batch_size rows at once if not None."""
+    shape = list(array.shape[1:])
+    if batch_size is not None:
+        shape.insert(0, batch_size)
+    return shape, (array.dtype if array.dtype.kind in "biuf" else None)
+
+
+def schema_columns(schema, columns_list=None):
+    """
+    Columns described by a schema, in the order the dataset loads them.
+
+    Args:
+        schema (Union[str, Schema]): Path of a schema file or Schema object.
+        columns_list (list[str], optional): The columns to load, in their order (default=None, all the columns).
+
+    Returns:
+        tuple, (list of column names, list of shapes, list of types), None if the columns can not be found.
+    """
+    if isinstance(schema, str):
+        if not os.path.isfile(schema):
+            return None
+        with open(schema, "r") as f:
+            columns = json.load(f).get("columns")
+        if isinstance(columns, dict):
+            # the columns of a dict are loaded in the order of their names
+            columns = [dict(value, name=name) for name, value in sorted(columns.items())]
+    else:
+        columns = schema.columns
+    if not isinstance(columns, list):
+        return None
+    columns = {column["name"]: column for column in columns}
+    names = list(columns_list) if columns_list else list(columns)
+    if any(name not in columns for name in names):
+        return None
+    shapes = []
+    types = []
+    for name in names:
+        shape = columns[name].get("shape")
+        shapes.append(None if shape is None else [None if dim < 0 else dim for dim in shape])
+        types.append(numpy_type(columns[name]["type"]))
+    return names, shapes, types
+
+
+def _hw(size):
+    return (size, size) if isinstance(size, int) else tuple(size)
+
+
+def _resize_image(shape, size):
+    if shape is None or len(shape) not in (2, 3):
+        return None
+    return list(size) + shape[2:]
+
+
+def _rules():
+    """(shape, type) of the output of the c transforms of one input and one output, by transform class."""
+    global _RULES
+    if _RULES is not None:
+        return _RULES
+    from ..transforms import c_transforms
+    from ..transforms.vision import c_transforms as c_vision
+
+    def same(op, shape, np_type):
+        return shape, np_type
+
+    def to_float(op, shape, np_type):
+        return shape, np.dtype(np.float32)
+
+    def crop(op, shape, np_type):
+        return _resize_image(shape, _hw(op.size)), np_type
+
+    def resize(op, shape, np_type):
+        if isinstance(op.size, int):
+            # the smaller edge is resized, the other one depends on the image
+            return (None if shape is None else [None, None] + shape[2:]), np_type
+        return _resize_image(shape, op.size), np_type
+
+    def decode(op, shape, np_type):
+        return [None, None, 3] if op.rgb else None, np.dtype(np.uint8)
+
+    def decode_resize(op, shape, np_type):
+        return list(_hw(op.size)) + [3], np.dtype(np.uint8)
+
+    def hwc2chw(op, shape, np_type):
+        if shape is None or len(shape) != 3:
+            return None, np_type
+        return [shape[2], shape[0], shape[1]], np_type
+
+    def type_cast(op, shape, np_type):
+        return shape, numpy_type(op.data_type)
+
+    def one_hot(op, shape, np_type):
+        return (None if shape is None else shape + [op.num_classes]), np_type
+
+    _RULES = {
+        c_vision.AutoContrast: same, c_vision.Equalize: same, c_vision.Invert: same, c_vision.CutOut: same,
+        c_vision.RandomHorizontalFlip: same, c_vision.RandomVerticalFlip: same, c_vision.RandomColorAdjust: same,
+        c_vision.Normalize: to_float, c_vision.Rescale: to_float,
+        c_vision.CenterCrop: crop, c_vision.RandomCrop: crop, c_vision.RandomResizedCrop: crop,
+        c_vision.Resize: resize, c_vision.Decode: decode, c_vision.RandomCropDecodeResize: decode_resize,
+        c_vision.HWC2CHW: hwc2chw, c_transforms.TypeCast: type_cast, c_transforms.OneHot: one_hot,
+    }
+    return _RULES
+
+
+def apply_operations(operations, columns):
+    """
+    (shape, type) of the outputs of a list of map operations.
+
+    Args:
+        operations (list): The operations of a map.
+        columns (list[tuple]): (shape, type) of the input columns.
+
+    Returns:
+        list[tuple], (shape, type) of the output columns, None if an operation has no rule, e.g. a python function.
+    """
+    rules = _rules()
+    for op in operations:
+        rule = rules.get(type(op))
+        if rule is None or len(columns) != 1:
+            return None
+        columns = [rule(op, *columns[0])]
+    return columns
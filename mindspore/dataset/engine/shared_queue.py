@@ -0,0 +1,120 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+Shared memory transport of numpy rows between a worker process and the master process.
+"""
+
+import ctypes
+import multiprocessing
+
+import numpy as np
+
+# Offsets of the columns inside a slot are aligned, so the views of the columns are aligned as well.
+_ALIGNMENT = 64
+
+
+def _align(size):
+    return (size + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class SharedRingBuffer:
+    """
+    A ring of fixed size slots in shared memory, written by one worker process and read by the master process.
+
+    The worker copies the columns of a row into the next free slot and only sends the small metadata returned by
+    `write` through a queue, so the arrays are never pickled. The master copies the row out with `read`, which also
+    frees the slot. The worker blocks when all slots are waiting to be read.
+
+    Args:
+        num_slots (int): Number of slots.
+        slot_size (int): Size of a slot in bytes, the maximum size of a row.
+    """
+
+    def __init__(self, num_slots, slot_size):
+        self.num_slots = num_slots
+        self.slot_size = _align(slot_size)
+        self._buffer = multiprocessing.RawArray(ctypes.c_uint8, self.num_slots * self.slot_size)
+        self._free_slots = multiprocessing.Semaphore(num_slots)
+        # only used in the worker process
+        self._next_slot = 0
+
+    @staticmethod
+    def row_size(row):
+        """
+        Size of the slot holding a row.
+
+        Args:
+            row (tuple): The columns of the row.
+
+        Returns:
+            int, the size in bytes, or None if the row contains python objects.
+        """
+        size = 0
+        for column in row:
+            column = np.asarray(column)
+            if column.dtype.hasobject:
+                return None
+            size += _align(column.nbytes)
+        return size
+
+    def write(self, row):
+        """
+        Write a row into the next slot, called in the worker process.
+
+        Args:
+            row (tuple): The columns of the row.
+
+        Returns:
+            tuple, (slot, metadata of the columns), or None if the row can not be put into a slot, for it is
+            too large or contains python objects.
+        """
+        columns = [np.asarray(column) for column in row]
+        size = self.row_size(columns)
+        if size is None or size > self.slot_size:
+            return None
+
+        self._free_slots.acquire()
+        slot = self._next_slot
+        self._next_slot = (slot + 1) % self.num_slots
+        slot_view = np.frombuffer(self._buffer, np.uint8, self.slot_size, slot * self.slot_size)
+        offset = 0
+        metadata = []
+        for column in columns:
+            nbytes = column.nbytes
+            slot_view[offset:offset + nbytes] = np.ascontiguousarray(column).reshape(-1).view(np.uint8)
+            metadata.append((column.dtype.str, column.shape, offset))
+            offset += _align(nbytes)
+        return slot, metadata
+
+    def read(self, slot, metadata):
+        """
+        Copy a row out of a slot and free the slot, called in the master process.
+
+        Args:
+            slot (int): The slot returned by `write`.
+            metadata (list): The metadata of the columns returned by `write`.
+
+        Returns:
+            tuple, the columns of the row.
+        """
+        base = slot * self.slot_size
+        row = []
+        for dtype, shape, offset in metadata:
+            dtype = np.dtype(dtype)
+            count = int(np.prod(shape, dtype=np.int64))
+            column = np.frombuffer(self._buffer, dtype, count, base + offset)
+            row.append(column.reshape(shape).copy())
+        self._free_slots.release()
+        return tuple(row)
@@ -323,11 +323,18 @@ def check_generatordataset(method):
                 raise ValueError("schema should be a path to schema file or a schema object.")
 
         # check optional argument
-        nreq_param_int = ["num_samples", "num_parallel_workers", "num_shards", "shard_id"]
+        nreq_param_int = ["num_samples", "num_parallel_workers", "num_shards", "shard_id", "max_rowsize",
+                          "batch_size"]
         validate_dataset_param_value(nreq_param_int, param_dict, int)
+        max_rowsize = param_dict.get("max_rowsize")
+        if max_rowsize is not None:
+            check_pos_int32(max_rowsize, "max_rowsize")
+        batch_size = param_dict.get("batch_size")
+        if batch_size is not None:
+            check_pos_int32(batch_size, "batch_size")
         nreq_param_list = ["column_types"]
         validate_dataset_param_value(nreq_param_list, param_dict, list)
-        nreq_param_bool = ["shuffle"]
+        nreq_param_bool = ["shuffle", "drop_remainder"]
         validate_dataset_param_value(nreq_param_bool, param_dict, bool)
 
         num_shards = param_dict.get("num_shards")
@@ -356,6 +363,8 @@ def check_generatordataset(method):
             raise ValueError("sampler is not supported if source does not have attribute '__getitem__'")
         if num_shards is not None and not hasattr(source, "__getitem__"):
             raise ValueError("num_shards is not supported if source does not have attribute '__getitem__'")
+        if batch_size is not None and not hasattr(source, "__getitem__"):
+            raise ValueError("batch_size is not supported if source does not have attribute '__getitem__'")
 
         return method(self, *args, **kwargs)
 
@@ -544,8 +553,8 @@ def check_map(method):
 
     @wraps(method)
     def new_method(self, *args, **kwargs):
-        [input_columns, _, output_columns, columns_order, num_parallel_workers, python_multiprocessing, cache], _ = \
-            parse_user_args(method, *args, **kwargs)
+        [input_columns, _, output_columns, columns_order, num_parallel_workers, python_multiprocessing, cache,
+         chunk_size], _ = parse_user_args(method, *args, **kwargs)
 
         nreq_param_columns = ['input_columns', 'output_columns']
 
@@ -554,6 +563,7 @@ def check_map(method):
         if num_parallel_workers is not None:
             check_num_parallel_workers(num_parallel_workers)
         type_check(python_multiprocessing, (bool,), "python_multiprocessing")
+        check_pos_int32(chunk_size, "chunk_size")
         if cache is not None:
             type_check(cache, (cache_client.DatasetCache,), "cache")
 
@@ -1125,7 +1135,8 @@ def check_numpyslicesdataset(method):
 
         data = param_dict.get("data")
         column_names = param_dict.get("column_names")
-        if not data:
+        # numpy arrays have no truth value, check their size instead
+        if data is None or (data.size == 0 if isinstance(data, np.ndarray) else not data):
             raise ValueError("Argument data cannot be empty")
         type_check(data, (list, tuple, dict, np.ndarray), "data")
         if isinstance(data, tuple):
@@ -18,7 +18,6 @@ import io
 import math
 import numbers
 import random
-import colorsys
 
 import numpy as np
 from PIL import Image, ImageOps, ImageEnhance, __version__
@@ -1280,10 +1279,57 @@ def mix_up_muti(tmp, batch_size, img, label, alpha=0.2):
     return mix_img, mix_label
 
 
+def _color_channel_axis(is_hwc):
+    """The axis of the color channel, counted from the end so that it works for both images and batches."""
+    return -1 if is_hwc else -3
+
+
+def _float_image(np_img):
+    """Keep floating point images as they are, convert the others to float64."""
+    if np.issubdtype(np_img.dtype, np.floating):
+        return np_img
+    return np_img.astype(np.float64)
+
+
+def _rgb_to_hsv_channels(r, g, b):
+    """Array version of colorsys.rgb_to_hsv, which is applied to every element of r, g and b."""
+    maxc = np.maximum(np.maximum(r, g), b)
+    minc = np.minimum(np.minimum(r, g), b)
+    delta = maxc - minc
+    gray = delta == 0
+    # the denominators of gray pixels are replaced by 1, their hue and saturation are set to 0 afterwards
+    safe_delta = np.where(gray, 1, delta)
+    s = np.where(gray, 0, delta / np.where(gray, 1, maxc))
+    rc = (maxc - r) / safe_delta
+    gc = (maxc - g) / safe_delta
+    bc = (maxc - b) / safe_delta
+    h = np.where(r == maxc, bc - gc, np.where(g == maxc, 2.0 + rc - bc, 4.0 + gc - rc))
+    h = np.where(gray, 0, (h / 6.0) % 1.0)
+    return h, s, maxc
+
+
+def _hsv_to_rgb_channels(h, s, v):
+    """Array version of colorsys.hsv_to_rgb, which is applied to every element of h, s and v."""
+    i = np.trunc(h * 6.0)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    # gray pixels (s == 0) need no special case, since p, q and t are all equal to v then
+    i = i.astype(np.int64) % 6
+    r = np.choose(i, (v, q, p, p, t, v))
+    g = np.choose(i, (t, v, v, q, p, p))
+    b = np.choose(i, (p, p, t, v, v, q))
+    return r, g, b
+
+
 def rgb_to_hsv(np_rgb_img, is_hwc):
     """
     Convert RGB img to HSV img.
 
+    The conversion is the same as colorsys.rgb_to_hsv, but is done on the whole array at once, so it also accepts
+    a batch of images of shape (N, H, W, C) or (N, C, H, W).
+
     Args:
         np_rgb_img (numpy.ndarray): Numpy RGB image array of shape (H, W, C) or (C, H, W) to be converted.
         is_hwc (Bool): If True, the shape of np_hsv_img is (H, W, C), otherwise must be (C, H, W).
@@ -1291,17 +1337,11 @@ def rgb_to_hsv(np_rgb_img, is_hwc):
     Returns:
         np_hsv_img (numpy.ndarray), Numpy HSV image with same type of np_rgb_img.
     """
-    if is_hwc:
-        r, g, b = np_rgb_img[:, :, 0], np_rgb_img[:, :, 1], np_rgb_img[:, :, 2]
-    else:
-        r, g, b = np_rgb_img[0, :, :], np_rgb_img[1, :, :], np_rgb_img[2, :, :]
-    to_hsv = np.vectorize(colorsys.rgb_to_hsv)
-    h, s, v = to_hsv(r, g, b)
-    if is_hwc:
-        axis = 2
-    else:
-        axis = 0
-    np_hsv_img = np.stack((h, s, v), axis=axis)
+    axis = _color_channel_axis(is_hwc)
+    np_rgb_img = _float_image(np_rgb_img)
+    r, g, b = np.moveaxis(np_rgb_img, axis, 0)
+    h, s, v = _rgb_to_hsv_channels(r, g, b)
+    np_hsv_img = np.stack((h, s, v), axis=axis).astype(np_rgb_img.dtype, copy=False)
     return np_hsv_img
 
 
@@ -1327,30 +1367,20 @@ def rgb_to_hsvs(np_rgb_imgs, is_hwc):
         raise TypeError('img shape should be (H, W, C)/(N, H, W, C)/(C,H,W)/(N,C,H,W). \
                          Got {}'.format(np_rgb_imgs.shape))
 
-    if shape_size == 3:
-        batch_size = 0
-        if is_hwc:
-            num_channels = np_rgb_imgs.shape[2]
-        else:
-            num_channels = np_rgb_imgs.shape[0]
-    else:
-        batch_size = np_rgb_imgs.shape[0]
-        if is_hwc:
-            num_channels = np_rgb_imgs.shape[3]
-        else:
-            num_channels = np_rgb_imgs.shape[1]
+    num_channels = np_rgb_imgs.shape[_color_channel_axis(is_hwc)]
 
     if num_channels != 3:
         raise TypeError('img should be 3 channels RGB img. Got {} channels'.format(num_channels))
-    if batch_size == 0:
-        return rgb_to_hsv(np_rgb_imgs, is_hwc)
-    return np.array([rgb_to_hsv(img, is_hwc) for img in np_rgb_imgs])
+    return rgb_to_hsv(np_rgb_imgs, is_hwc)
 
 
 def hsv_to_rgb(np_hsv_img, is_hwc):
     """
     Convert HSV img to RGB img.
 
+    The conversion is the same as colorsys.hsv_to_rgb, but is done on the whole array at once, so it also accepts
+    a batch of images of shape (N, H, W, C) or (N, C, H, W).
+
     Args:
         np_hsv_img (numpy.ndarray): Numpy HSV image array of shape (H, W, C) or (C, H, W) to be converted.
         is_hwc (Bool): If True, the shape of np_hsv_img is (H, W, C), otherwise must be (C, H, W).
@@ -1358,18 +1388,11 @@ def hsv_to_rgb(np_hsv_img, is_hwc):
     Returns:
         np_rgb_img (numpy.ndarray), Numpy HSV image with same shape of np_hsv_img.
     """
-    if is_hwc:
-        h, s, v = np_hsv_img[:, :, 0], np_hsv_img[:, :, 1], np_hsv_img[:, :, 2]
-    else:
-        h, s, v = np_hsv_img[0, :, :], np_hsv_img[1, :, :], np_hsv_img[2, :, :]
-    to_rgb = np.vectorize(colorsys.hsv_to_rgb)
-    r, g, b = to_rgb(h, s, v)
-
-    if is_hwc:
-        axis = 2
-    else:
-        axis = 0
-    np_rgb_img = np.stack((r, g, b), axis=axis)
+    axis = _color_channel_axis(is_hwc)
+    np_hsv_img = _float_image(np_hsv_img)
+    h, s, v = np.moveaxis(np_hsv_img, axis, 0)
+    r, g, b = _hsv_to_rgb_channels(h, s, v)
+    np_rgb_img = np.stack((r, g, b), axis=axis).astype(np_hsv_img.dtype, copy=False)
     return np_rgb_img
 
 
@@ -1395,24 +1418,40 @@ def hsv_to_rgbs(np_hsv_imgs, is_hwc):
         raise TypeError('img shape should be (H, W, C)/(N, H, W, C)/(C,H,W)/(N,C,H,W). \
                          Got {}'.format(np_hsv_imgs.shape))
 
-    if shape_size == 3:
-        batch_size = 0
-        if is_hwc:
-            num_channels = np_hsv_imgs.shape[2]
-        else:
-            num_channels = np_hsv_imgs.shape[0]
-    else:
-        batch_size = np_hsv_imgs.shape[0]
-        if is_hwc:
-            num_channels = np_hsv_imgs.shape[3]
-        else:
-            num_channels = np_hsv_imgs.shape[1]
+    num_channels = np_hsv_imgs.shape[_color_channel_axis(is_hwc)]
 
     if num_channels != 3:
         raise TypeError('img should be 3 channels RGB img. Got {} channels'.format(num_channels))
-    if batch_size == 0:
-        return hsv_to_rgb(np_hsv_imgs, is_hwc)
-    return np.array([hsv_to_rgb(img, is_hwc) for img in np_hsv_imgs])
+    return hsv_to_rgb(np_hsv_imgs, is_hwc)
+
+
+def adjust_hue_saturation(np_rgb_imgs, hue_factor, saturation_factor, is_hwc):
+    """
+    Adjust hue and saturation of numpy RGB images in one HSV round trip.
+
+    Args:
+        np_rgb_imgs (numpy.ndarray): Numpy RGB images array with values in [0, 1], of shape (H, W, C) or
+            (N, H, W, C), or (C, H, W) or (N, C, H, W) to be adjusted.
+        hue_factor (float): Amount to shift the Hue channel, should be in [-0.5, 0.5]. 0 means no shift.
+        saturation_factor (float): A non negative number by which the saturation is multiplied, the result is
+            clipped to [0, 1]. 0 gives a gray image, 1 gives the original.
+        is_hwc (Bool): If True, the shape of np_rgb_imgs is (H, W, C) or (N, H, W, C);
+                       If False, the shape of np_rgb_imgs is (C, H, W) or (N, C, H, W).
+
+    Returns:
+        np_rgb_imgs (numpy.ndarray), Adjusted Numpy RGB images with same shape of the input.
+    """
+    if not -0.5 <= hue_factor <= 0.5:
+        raise ValueError('hue_factor {} is not in [-0.5, 0.5].'.format(hue_factor))
+    if saturation_factor < 0:
+        raise ValueError('saturation_factor {} should be non negative.'.format(saturation_factor))
+
+    np_hsv_imgs = rgb_to_hsvs(np_rgb_imgs, is_hwc)
+    h, s, v = np.moveaxis(np_hsv_imgs, _color_channel_axis(is_hwc), 0)
+    h = (h + hue_factor) % 1.0
+    s = np.clip(s * saturation_factor, 0, 1)
+    r, g, b = _hsv_to_rgb_channels(h, s, v)
+    return np.stack((r, g, b), axis=_color_channel_axis(is_hwc)).astype(np_hsv_imgs.dtype, copy=False)
 
 
 def random_color(img, degrees):
@@ -18,10 +18,15 @@ Users can load pre-trained models using mindspore.hub.load() API.
 """
 import os
 import re
+import json
+import time
 import shutil
 import tarfile
 import hashlib
-from urllib.request import urlretrieve
+import tempfile
+import threading
+from urllib.parse import urlparse
+from urllib.request import url2pathname
 import requests
 from bs4 import BeautifulSoup
 
@@ -33,9 +38,15 @@ from mindspore.train.serialization import load_checkpoint, load_param_into_net
 DOWNLOAD_BASIC_URL = "http://download.mindspore.cn/model_zoo"
 OFFICIAL_NAME = "official"
 DEFAULT_CACHE_DIR = '.cache'
+# max size of the downloaded archives and their unpacked files kept in the cache
+DEFAULT_CACHE_SIZE = 10 << 30
 MODEL_TARGET_CV = ['alexnet', 'fasterrcnn', 'googlenet', 'lenet', 'resnet', 'resnet50', 'ssd', 'vgg', 'yolo']
 MODEL_TARGET_NLP = ['bert', 'mass', 'transformer']
 
+_CHUNK_SIZE = 1 << 20
+_DOWNLOAD_TIMEOUT = 60
+_MANIFEST = "manifest.json"
+
 
 def _packing_targz(output_filename, savepath=DEFAULT_CACHE_DIR):
     """
@@ -53,8 +64,13 @@ def _unpacking_targz(input_filename, savepath=DEFAULT_CACHE_DIR):
     Unpacking the input filename to dirs.
     """
     try:
-        t = tarfile.open(input_filename)
-        t.extractall(path=savepath)
+        with tarfile.open(input_filename) as t:
+            real_savepath = os.path.realpath(savepath)
+            for member in t.getmembers():
+                member_path = os.path.realpath(os.path.join(real_savepath, member.name))
+                if os.path.commonpath([real_savepath, member_path]) != real_savepath:
+                    raise ValueError("member {} is outside of the target directory".format(member.name))
+            t.extractall(path=savepath)
     except Exception as e:
         raise OSError("Cannot untar file {} for - {}".format(input_filename, e))
 
@@ -75,63 +91,279 @@ def _create_path_if_not_exists(path):
             os.mkdir(path)
 
 
-def _get_weights_file(url, hash_md5=None, savepath=DEFAULT_CACHE_DIR):
+def _path_size(path):
+    """size of a file or of all the files in a directory"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    size = 0
+    for root, _, files in os.walk(path):
+        size += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+    return size
+
+
+def _open_url(url, offset=0, validator=None):
+    """
+    Open a url to read from offset, the url can be a http(s) url, a file url or a local path.
+
+    If validator is not None, the data is only read from offset if the file is still the one it identifies, by the
+    ETag or the Last-Modified date of a http file, or the size and mtime of a local file.
+
+    Returns:
+        tuple, (iterator of the data chunks, total size or None if unknown, whether the data starts at offset,
+        validator of the file or None if it has none). The data starts at 0 when the file has changed or the server
+        does not support ranges.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme in ("", "file"):
+        path = url2pathname(parsed.path) if parsed.scheme else url
+        stat_result = os.stat(path)
+        file_validator = "{}-{}".format(stat_result.st_size, stat_result.st_mtime_ns)
+        if validator is not None and validator != file_validator:
+            offset = 0
+
+        def read_file():
+            with open(path, "rb") as f:
+                f.seek(offset)
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                    yield chunk
+        return read_file(), stat_result.st_size, True, file_validator
+
+    headers = {}
+    if offset:
+        headers["Range"] = "bytes={}-".format(offset)
+        if validator:
+            headers["If-Range"] = validator
+    response = requests.get(url, headers=headers, stream=True, timeout=_DOWNLOAD_TIMEOUT)
+    if response.status_code == 416:
+        # the partial file is not a prefix of the file anymore
+        response.close()
+        chunks, total, _, response_validator = _open_url(url)
+        return chunks, total, False, response_validator
+    response.raise_for_status()
+    resumed = bool(headers) and response.status_code == 206
+    total = None
+    if resumed and "Content-Range" in response.headers:
+        total = int(response.headers["Content-Range"].rsplit("/", 1)[-1])
+    elif "Content-Length" in response.headers:
+        total = int(response.headers["Content-Length"]) + (offset if resumed else 0)
+    # a weak ETag can not be used in If-Range
+    etag = response.headers.get("ETag")
+    response_validator = etag if etag and not etag.startswith("W/") else response.headers.get("Last-Modified")
+    return response.iter_content(_CHUNK_SIZE), total, resumed or not offset, response_validator
+
+
+class _WeightsCache:
+    """
+    Content addressed cache of the downloaded weights archives.
+
+    An archive is stored in `blobs/<sha256>` and unpacked once in `unpacked/<sha256>`. The manifest maps the urls to
+    the sha256 of their archives, and records the size, md5 and last use of each archive. Downloads go to
+    `downloads/` first, an interrupted download is resumed with a range request if the file is unchanged. The hashes
+    are computed while the data is written, so an archive is never read again to be verified. The least recently
+    used archives are removed when the cache exceeds max_size bytes.
+
+    Args:
+        cache_dir (str): Directory of the cache. Default: DEFAULT_CACHE_DIR.
+        max_size (int): Max size of the cache in bytes. Default: DEFAULT_CACHE_SIZE.
+    """
+
+    # locks of the urls being fetched, by cache directory and url
+    _url_locks = {}
+    _url_locks_lock = threading.Lock()
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_size=DEFAULT_CACHE_SIZE):
+        self.cache_dir = os.path.realpath(cache_dir)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        for sub_dir in ("blobs", "unpacked", "downloads"):
+            os.makedirs(os.path.join(self.cache_dir, sub_dir), exist_ok=True)
+
+    def _load_manifest(self):
+        try:
+            with open(os.path.join(self.cache_dir, _MANIFEST), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"urls": {}, "blobs": {}}
+
+    def _save_manifest(self, manifest):
+        fd, tmp_file = tempfile.mkstemp(dir=self.cache_dir, prefix=".manifest_")
+        with os.fdopen(fd, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp_file, os.path.join(self.cache_dir, _MANIFEST))
+
+    def _blob_path(self, sha256):
+        return os.path.join(self.cache_dir, "blobs", sha256)
+
+    def _unpacked_path(self, sha256):
+        return os.path.join(self.cache_dir, "unpacked", sha256)
+
+    def lookup(self, url, hash_md5=None):
+        """
+        Returns:
+            str, sha256 of the cached archive of the url, None if it is not cached or does not match hash_md5.
+        """
+        with self._lock:
+            manifest = self._load_manifest()
+        sha256 = manifest["urls"].get(url)
+        blob = manifest["blobs"].get(sha256)
+        if blob is None or (hash_md5 and blob["md5"] != hash_md5):
+            return None
+        blob_path = self._blob_path(sha256)
+        if not os.path.isfile(blob_path) or os.path.getsize(blob_path) != blob["size"]:
+            return None
+        return sha256
+
+    def download(self, url, hash_md5=None, force_reload=False):
+        """
+        Download the archive of a url into the cache, resuming a previous partial download unless force_reload.
+
+        A partial download is only resumed if the file is unchanged since it was started, as told by the validator
+        stored next to it, or if hash_md5 can verify the whole archive.
+
+        Returns:
+            str, sha256 of the archive.
+        """
+        part_file = os.path.join(self.cache_dir, "downloads",
+                                 hashlib.sha256(url.encode("utf-8")).hexdigest() + ".part")
+        validator_file = part_file + ".validator"
+        if force_reload:
+            _remove_path_if_exists(part_file)
+            _remove_path_if_exists(validator_file)
+        offset = os.path.getsize(part_file) if os.path.isfile(part_file) else 0
+        validator = None
+        if offset and os.path.isfile(validator_file):
+            with open(validator_file, "r") as f:
+                validator = f.read() or None
+        if offset and validator is None and not hash_md5:
+            # nothing tells whether the partial download is a prefix of the current file
+            offset = 0
+        chunks, total, from_offset, validator = _open_url(url, offset, validator)
+        if not from_offset:
+            offset = 0
+        if not offset:
+            with open(validator_file, "w") as f:
+                f.write(validator or "")
+
+        sha256 = hashlib.sha256()
+        md5 = hashlib.md5()
+        if offset:
+            # hash the part downloaded before, then go on with the new data
+            with open(part_file, "rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+                    md5.update(chunk)
+            logger.info("Resume downloading {} from {} bytes.".format(url, offset))
+        size = offset
+        with open(part_file, "ab" if offset else "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                sha256.update(chunk)
+                md5.update(chunk)
+                size += len(chunk)
+                if total:
+                    print("\rDownloading {}: {:5.1f}%".format(os.path.basename(url), size * 100.0 / total), end="")
+        print("")
+
+        download_md5 = md5.hexdigest()
+        _remove_path_if_exists(validator_file)
+        if hash_md5 and download_md5 != hash_md5:
+            os.remove(part_file)
+            raise ValueError("The md5 of {} is {}, but expect {}.".format(url, download_md5, hash_md5))
+        digest = sha256.hexdigest()
+        os.replace(part_file, self._blob_path(digest))
+        with self._lock:
+            manifest = self._load_manifest()
+            manifest["urls"][url] = digest
+            manifest["blobs"][digest] = {"size": size, "md5": download_md5, "last_used": time.time()}
+            self._save_manifest(manifest)
+        logger.info("Downloaded {}, size: {:.2f} Mb.".format(url, size / 1024 / 1024))
+        return digest
+
+    def unpack(self, sha256):
+        """
+        Unpack a cached archive, once.
+
+        Returns:
+            str, the directory it is unpacked to.
+        """
+        unpacked_path = self._unpacked_path(sha256)
+        if not os.path.isdir(unpacked_path):
+            tmp_path = tempfile.mkdtemp(dir=os.path.join(self.cache_dir, "unpacked"), prefix=".tmp_")
+            try:
+                _unpacking_targz(self._blob_path(sha256), tmp_path)
+                os.rename(tmp_path, unpacked_path)
+            except OSError:
+                shutil.rmtree(tmp_path, ignore_errors=True)
+                if not os.path.isdir(unpacked_path):
+                    raise
+        return unpacked_path
+
+    def _url_lock(self, url):
+        with _WeightsCache._url_locks_lock:
+            return _WeightsCache._url_locks.setdefault((self.cache_dir, url), threading.Lock())
+
+    def fetch(self, url, hash_md5=None, force_reload=False):
+        """
+        Get the archive of a url from the cache, download it if it is not cached or force_reload.
+
+        Returns:
+            str, the directory the archive is unpacked to.
+        """
+        # one download of a url at a time, the others wait for it and take the archive from the cache
+        with self._url_lock(url):
+            sha256 = None if force_reload else self.lookup(url, hash_md5)
+            if sha256 is None:
+                logger.info("Downloading data from url {}.".format(url))
+                sha256 = self.download(url, hash_md5, force_reload)
+            else:
+                logger.info("Use the cached data of url {}.".format(url))
+            unpacked_path = self.unpack(sha256)
+        with self._lock:
+            manifest = self._load_manifest()
+            if sha256 in manifest["blobs"]:
+                manifest["blobs"][sha256]["last_used"] = time.time()
+                self._save_manifest(manifest)
+        self.evict(keep=(sha256,))
+        return unpacked_path
+
+    def evict(self, keep=()):
+        """remove the least recently used archives until the cache fits in max_size, except the sha256s of keep"""
+        with self._lock:
+            manifest = self._load_manifest()
+            blobs = manifest["blobs"]
+            sizes = {sha256: blob["size"] + (_path_size(self._unpacked_path(sha256))
+                                             if os.path.isdir(self._unpacked_path(sha256)) else 0)
+                     for sha256, blob in blobs.items()}
+            total_size = sum(sizes.values())
+            for sha256 in sorted(blobs, key=lambda sha256: blobs[sha256]["last_used"]):
+                if total_size <= self.max_size:
+                    break
+                if sha256 in keep:
+                    continue
+                _remove_path_if_exists(self._blob_path(sha256))
+                _remove_path_if_exists(self._unpacked_path(sha256))
+                total_size -= sizes[sha256]
+                del blobs[sha256]
+                manifest["urls"] = {url: digest for url, digest in manifest["urls"].items() if digest != sha256}
+            self._save_manifest(manifest)
+
+
+def _get_weights_file(url, hash_md5=None, savepath=DEFAULT_CACHE_DIR, force_reload=False):
     """
     get checkpoint weight from giving url.
 
     Args:
        url(string): checkpoint tar.gz url path.
        hash_md5(string): checkpoint file md5.
-       savepath(string): checkpoint download save path.
+       savepath(string): directory of the weights cache.
+       force_reload(bool): download the checkpoint even if it is in the cache.
 
     Returns:
-       string.
+       string, the directory the checkpoint is unpacked to.
     """
-
-    def reporthook(a, b, c):
-        percent = a * b * 100.0 / c
-        show_str = ('[%%-%ds]' % 70) % (int(percent * 80) * '#')
-        print("\rDownloading:", show_str, " %5.1f%%" % (percent), end="")
-
-    def md5sum(file_name, hash_md5):
-        fp = open(file_name, 'rb')
-        content = fp.read()
-        fp.close()
-        m = hashlib.md5()
-        m.update(content.encode('utf-8'))
-        download_md5 = m.hexdigest()
-        return download_md5 == hash_md5
-
-    _remove_path_if_exists(os.path.realpath(savepath))
-    _create_path_if_not_exists(os.path.realpath(savepath))
+    unpacked_path = _WeightsCache(savepath).fetch(url, hash_md5, force_reload)
     ckpt_name = os.path.basename(url.split("/")[-1])
-    # identify file exist or not
-    file_path = os.path.join(savepath, ckpt_name)
-    if os.path.isfile(file_path):
-        if hash_md5 and md5sum(file_path, hash_md5):
-            print('File already exists!')
-            return file_path
-
-    file_path_ = file_path[:-7] if ".tar.gz" in file_path else file_path
-    _remove_path_if_exists(file_path_)
-
-    # download the checkpoint file
-    print('Downloading data from url {}'.format(url))
-    try:
-        urlretrieve(url, file_path, reporthook=reporthook)
-    except HTTPError as e:
-        raise Exception(e.code, e.msg, url)
-    except URLError as e:
-        raise Exception(e.errno, e.reason, url)
-    print('\nDownload finished!')
-
-    # untar file_path
-    _unpacking_targz(file_path, os.path.realpath(savepath))
-
-    filesize = os.path.getsize(file_path)
-    # turn the file size to Mb format
-    print('File size = %.2f Mb' % (filesize / 1024 / 1024))
-    return file_path_
+    return os.path.join(unpacked_path, ckpt_name[:-7] if ckpt_name.endswith(".tar.gz") else ckpt_name)
 
 
 def _get_url_paths(url, ext='.tar.gz'):
@@ -157,14 +389,15 @@ def _get_file_from_url(base_url, base_name):
     return urls[idx]
 
 
-def load_weights(network, network_name=None, force_reload=True, **kwargs):
+def load_weights(network, network_name=None, force_reload=False, **kwargs):
     r"""
     Load a model from mindspore, with pretrained weights.
 
     Args:
         network (Cell): Cell network.
         network_name (string, optional): Cell network name get from network. Default: None.
-        force_reload (bool, optional): Whether to force a fresh download unconditionally. Default: False.
+        force_reload (bool, optional): Whether to force a fresh download unconditionally, otherwise the checkpoint
+            in the local cache is used if any and an interrupted download is resumed. Default: False.
         kwargs (dict, optional): The corresponding kwargs for download for model.
 
             - device_target (str, optional): Runtime device target. Default: 'ascend'.
@@ -204,10 +437,7 @@ def load_weights(network, network_name=None, force_reload=True, **kwargs):
         [network_name, device_target, version, dataset, OFFICIAL_NAME])
     download_url = _get_file_from_url(download_base_url, download_file_name)
 
-    if force_reload:
-        ckpt_path = _get_weights_file(download_url, None, DEFAULT_CACHE_DIR)
-    else:
-        raise ValueError("Unsupported not force reload.")
+    ckpt_path = _get_weights_file(download_url, None, DEFAULT_CACHE_DIR, force_reload)
 
     ckpt_file = os.path.join(ckpt_path, network_name + ".ckpt")
     param_dict = load_checkpoint(ckpt_file)
@@ -18,6 +18,7 @@ This module is to write data into mindrecord.
 import os
 import re
 import stat
+import time
 import numpy as np
 from mindspore import log as logger
 from .shardwriter import ShardWriter
@@ -30,6 +31,32 @@ from .common.exceptions import ParamValueError, ParamTypeError, MRMInvalidSchema
 
 __all__ = ['FileWriter']
 
+
+def _match_shape(sizes, shape):
+    """
+    Check which arrays can be reshaped to the shape of the schema, like np.reshape does.
+
+    Args:
+        sizes (numpy.ndarray): Number of elements of each array.
+        shape (list[int]): Shape in the schema, may contain one negative dimension which is inferred,
+            None if the schema has no shape.
+
+    Returns:
+        numpy.ndarray, bool mask of the arrays matching the shape.
+    """
+    if shape is None:
+        return np.zeros(len(sizes), np.bool_)
+    known = [dim for dim in shape if dim >= 0]
+    if len(shape) - len(known) > 1:
+        return np.zeros(len(sizes), np.bool_)
+    count = int(np.prod(known, dtype=np.int64))
+    if len(known) == len(shape):
+        return sizes == count
+    if count == 0:
+        return np.zeros(len(sizes), np.bool_)
+    return sizes % count == 0
+
+
 class FileWriter:
     """
     Class to write user defined raw data into MindRecord File series.
@@ -160,41 +187,38 @@ class FileWriter:
 
         1) allowed data type contains: "int32", "int64", "float32", "float64", "string", "bytes".
 
+        The rows are checked one column at a time, and the shapes of a column of ndarray are checked
+        with one comparison of their sizes instead of reshaping each of them.
+
         Args:
            raw_data (list[dict]): List of raw data.
         """
         error_data_dic = {}
         schema_content = self._header.schema
         for field in schema_content:
+            field_type = schema_content[field]["type"]
+            valid_types = {name for name, types in VALUE_TYPE_MAP.items() if field_type in types}
+            array_rows = []
             for i, v in enumerate(raw_data):
                 if i in error_data_dic:
                     continue
-
                 if field not in v:
                     error_data_dic[i] = "for schema, {} th data is wrong, " \
                     "there is not '{}' object in the raw data.".format(i, field)
                     continue
-                field_type = type(v[field]).__name__
-                if field_type not in VALUE_TYPE_MAP:
+                value_type = type(v[field]).__name__
+                if value_type not in valid_types:
                     error_data_dic[i] = "for schema, {} th data is wrong, " \
                     "data type for '{}' is not matched.".format(i, field)
-                    continue
-
-                if schema_content[field]["type"] not in VALUE_TYPE_MAP[field_type]:
-                    error_data_dic[i] = "for schema, {} th data is wrong, " \
-                    "data type for '{}' is not matched.".format(i, field)
-                    continue
-
-                if field_type == 'ndarray':
-                    if 'shape' not in schema_content[field]:
-                        error_data_dic[i] = "for schema, {} th data is wrong, " \
-                                            "data type for '{}' is not matched.".format(i, field)
-                    else:
-                        try:
-                            np.reshape(v[field], schema_content[field]['shape'])
-                        except ValueError:
-                            error_data_dic[i] = "for schema, {} th data is wrong, " \
-                                                "data type for '{}' is not matched.".format(i, field)
+                elif value_type == 'ndarray':
+                    array_rows.append(i)
+            if not array_rows:
+                continue
+            sizes = np.fromiter((raw_data[i][field].size for i in array_rows), np.int64, len(array_rows))
+            valid = _match_shape(sizes, schema_content[field].get('shape'))
+            for i in np.asarray(array_rows)[~valid].tolist():
+                error_data_dic[i] = "for schema, {} th data is wrong, " \
+                                    "data type for '{}' is not matched.".format(i, field)
         error_data_dic = sorted(error_data_dic.items(), reverse=True)
         for i, v in error_data_dic:
             raw_data.pop(i)
@@ -235,7 +259,9 @@ class FileWriter:
         for each_raw in raw_data:
             if not isinstance(each_raw, dict):
                 raise ParamTypeError('raw_data item', 'dict')
+        start = time.time()
         self._verify_based_on_schema(raw_data)
+        self._writer.add_validate_time(time.time() - start)
         return self._writer.write_raw_data(raw_data, True, parallel_writer)
 
     def set_header_size(self, header_size):
@@ -318,6 +344,16 @@ class FileWriter:
 
         return ret
 
+    @property
+    def statistics(self):
+        """
+        Throughput of validating, merging and writing the raw data written so far.
+
+        Returns:
+            dict, see ShardWriter.statistics.
+        """
+        return self._writer.statistics
+
     def _validate_array(self, k, v):
         """
         Validate array item in schema
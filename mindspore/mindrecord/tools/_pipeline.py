@@ -0,0 +1,168 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+Conversion pipeline shared by the convert tools.
+
+The rows of the source dataset are produced in a background thread and handed to the FileWriter in batches
+through a bounded queue, so reading the source overlaps with writing the MindRecord files.
+"""
+import collections
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mindspore import log as logger
+
+BATCH_SIZE = 256
+# the number of batches waiting to be written
+QUEUE_SIZE = 4
+# the number of threads reading the source files
+DEFAULT_IO_WORKERS = 8
+
+
+def check_num_workers(num_workers, name):
+    """check a number of workers is a positive int"""
+    if not isinstance(num_workers, int) or isinstance(num_workers, bool) or num_workers < 1:
+        raise ValueError("The parameter {} must be int and greater than 0.".format(name))
+
+
+def parallel_map(func, items, num_workers, max_pending=None):
+    """
+    Like map, but calls func in a pool of threads, for functions which mostly wait on file I/O.
+
+    The results are yielded in the order of the items, and at most max_pending calls are submitted ahead of
+    the consumer, so a slow consumer does not pile up results in memory.
+
+    Args:
+        func (function): The function to call on each item.
+        items (iterable): The items.
+        num_workers (int): The number of threads.
+        max_pending (int, optional): The maximum number of calls submitted ahead (default=4 * num_workers).
+    """
+    if num_workers <= 1:
+        yield from map(func, items)
+        return
+    max_pending = max_pending or 4 * num_workers
+    with ThreadPoolExecutor(num_workers) as executor:
+        pending = collections.deque()
+        for item in items:
+            pending.append(executor.submit(func, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class _Failure:
+    """exception raised while producing the rows, re-raised in the writing thread"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+_END = object()
+
+
+class TransformProgress:
+    """
+    Counts the rows written by a transform and logs the throughput.
+
+    Args:
+        name (str): Name of the transform in the log.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.count = 0
+        self.start = time.time()
+
+    def update(self, count):
+        """account count more rows written"""
+        self.count += count
+        logger.info("{}: transformed {} records, {:.1f} records/s.".format(self.name, self.count, self.rate))
+
+    @property
+    def elapsed(self):
+        return time.time() - self.start
+
+    @property
+    def rate(self):
+        elapsed = self.elapsed
+        return self.count / elapsed if elapsed > 0 else 0.0
+
+    def finish(self):
+        """log the totals of the transform"""
+        logger.info("{}: END. transformed {} records, total time: {:.2f}s, {:.1f} records/s.".format(
+            self.name, self.count, self.elapsed, self.rate))
+
+
+def write_rows(writer, rows, name, batch_size=BATCH_SIZE, queue_size=QUEUE_SIZE):
+    """
+    Write the rows with writer.write_raw_data in batches, while the next rows are produced in a background thread.
+
+    Args:
+        writer (FileWriter): The writer, its schema is already added.
+        rows (iterable): The rows, dicts of the fields in the schema.
+        name (str): Name of the transform in the log.
+        batch_size (int, optional): The number of rows written at once (default=BATCH_SIZE).
+        queue_size (int, optional): The maximum number of batches waiting to be written (default=QUEUE_SIZE).
+
+    Returns:
+        TransformProgress, the number of rows written and the throughput.
+    """
+    batches = queue.Queue(queue_size)
+    stop = threading.Event()
+
+    def put(item):
+        # after the writing failed, the queue is drained once, so only one more item fits
+        batches.put(item)
+        return not stop.is_set()
+
+    def produce():
+        try:
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == batch_size:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+            put(_END)
+        except BaseException as e:
+            put(_Failure(e))
+
+    producer = threading.Thread(target=produce, name=name + "_reader", daemon=True)
+    producer.start()
+    progress = TransformProgress(name)
+    try:
+        while True:
+            batch = batches.get()
+            if batch is _END:
+                break
+            if isinstance(batch, _Failure):
+                raise batch.error
+            writer.write_raw_data(batch)
+            progress.update(len(batch))
+    except BaseException:
+        # unblock the producer, it stops after its next put
+        stop.set()
+        while not batches.empty():
+            batches.get_nowait()
+        raise
+    producer.join()
+    return progress
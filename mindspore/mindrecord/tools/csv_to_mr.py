@@ -21,6 +21,7 @@ import os
 from mindspore import log as logger
 from ..filewriter import FileWriter
 from ..shardutils import check_filename
+from ._pipeline import BATCH_SIZE, write_rows
 
 try:
     pd = import_module("pandas")
@@ -106,15 +107,21 @@ class CsvToMR:
         return schema
 
     def _get_row_of_csv(self, df):
-        """Get row data from csv file."""
-        for _, r in df.iterrows():
-            row = {}
-            for col in self.columns_list:
-                if str(df[col].dtype) == 'bool':
-                    row[col] = int(r[col])
-                else:
-                    row[col] = r[col]
-            yield row
+        """
+        Get row data from csv file.
+
+        The columns are converted to python values a chunk of rows at a time, instead of a pandas Series per row.
+        """
+        columns = []
+        for col in self.columns_list:
+            values = df[col].values
+            if str(df[col].dtype) == 'bool':
+                values = values.astype('int32')
+            columns.append(values)
+        for start in range(0, len(df), BATCH_SIZE):
+            chunk = [values[start:start + BATCH_SIZE].tolist() for values in columns]
+            for row in zip(*chunk):
+                yield dict(zip(self.columns_list, row))
 
     def transform(self):
         """
@@ -145,24 +152,9 @@ class CsvToMR:
         # add the index
         self.writer.add_index(list(self.columns_list))
 
-        csv_iter = self._get_row_of_csv(df)
-        batch_size = 256
-        transform_count = 0
-        while True:
-            data_list = []
-            try:
-                for _ in range(batch_size):
-                    data_list.append(csv_iter.__next__())
-                    transform_count += 1
-                self.writer.write_raw_data(data_list)
-                logger.info("transformed {} record...".format(transform_count))
-            except StopIteration:
-                if data_list:
-                    self.writer.write_raw_data(data_list)
-                    logger.info(
-                        "transformed {} record...".format(transform_count))
-                break
+        progress = write_rows(self.writer, self._get_row_of_csv(df), "CsvToMR")
 
         ret = self.writer.commit()
+        progress.finish()
 
         return ret
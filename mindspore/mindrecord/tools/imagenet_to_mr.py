@@ -16,15 +16,35 @@
 Imagenet convert tool for MindRecord.
 """
 import os
-import time
 
 from mindspore import log as logger
 from ..common.exceptions import PathNotExistsError
 from ..filewriter import FileWriter
 from ..shardutils import check_filename
+from ._pipeline import DEFAULT_IO_WORKERS, check_num_workers, parallel_map, write_rows
 
 __all__ = ['ImageNetToMR']
 
+
+def _read_image(image_info):
+    """
+    Read an image file.
+
+    Args:
+        image_info (tuple): file name and label of the image.
+
+    Returns:
+        dict, the row of the image, None if the image file is empty.
+    """
+    file_name, label = image_info
+    with open(file_name, "rb") as image_file:
+        image_bytes = image_file.read()
+    if not image_bytes:
+        logger.warning("The image file: {} is invalid.".format(file_name))
+        return None
+    return {"file_name": str(file_name), "label": int(label), "image": image_bytes}
+
+
 class ImageNetToMR:
     """
     Class is for transformation from imagenet to MindRecord.
@@ -43,11 +63,13 @@ class ImageNetToMR:
         image_dir (str): image directory contains n02119789, n02100735, n02110185, n02096294 dir.
         destination (str): the MindRecord file path to transform into.
         partition_number (int, optional): partition size (default=1).
+        num_parallel_workers (int, optional): number of threads reading the images (default=8).
 
     Raises:
-        ValueError: If map_file, image_dir or destination is invalid.
+        ValueError: If map_file, image_dir, destination or num_parallel_workers is invalid.
     """
-    def __init__(self, map_file, image_dir, destination, partition_number=1):
+    def __init__(self, map_file, image_dir, destination, partition_number=1,
+                 num_parallel_workers=DEFAULT_IO_WORKERS):
         check_filename(map_file)
         self.map_file = map_file
 
@@ -64,6 +86,9 @@ class ImageNetToMR:
         else:
             raise ValueError("The parameter partition_number must be int")
 
+        check_num_workers(num_parallel_workers, "num_parallel_workers")
+        self.num_parallel_workers = num_parallel_workers
+
         self.writer = FileWriter(self.destination, self.partition_number)
 
     def _get_imagenet_as_dict(self):
@@ -96,25 +121,18 @@ class ImageNetToMR:
         if not dir_paths:
             raise PathNotExistsError("not valid image dir in {}".format(self.image_dir))
 
-        # get the filename, label and image binary as a dict
-        for label in dir_paths:
-            for item in os.listdir(dir_paths[label]):
-                file_name = os.path.join(dir_paths[label], item)
-                if not item.endswith("JPEG") and not item.endswith("jpg"):
-                    logger.warning("{} file is not suffix with JPEG/jpg, skip it.".format(file_name))
-                    continue
-                data = {}
-                data["file_name"] = str(file_name)
-                data["label"] = int(label)
-
-                # get the image data
-                image_file = open(file_name, "rb")
-                image_bytes = image_file.read()
-                image_file.close()
-                if not image_bytes:
-                    logger.warning("The image file: {} is invalid.".format(file_name))
-                    continue
-                data["image"] = image_bytes
+        # get the filename, label and image binary as a dict, the images are read by a pool of threads
+        def list_images():
+            for label in dir_paths:
+                for item in os.listdir(dir_paths[label]):
+                    file_name = os.path.join(dir_paths[label], item)
+                    if not item.endswith("JPEG") and not item.endswith("jpg"):
+                        logger.warning("{} file is not suffix with JPEG/jpg, skip it.".format(file_name))
+                        continue
+                    yield file_name, label
+
+        for data in parallel_map(_read_image, list_images(), self.num_parallel_workers):
+            if data is not None:
                 yield data
 
     def transform(self):
@@ -124,8 +142,6 @@ class ImageNetToMR:
         Returns:
             SUCCESS/FAILED, whether successfully written into MindRecord.
         """
-        t0_total = time.time()
-
         imagenet_schema_json = {"label": {"type": "int32"},
                                 "image": {"type": "bytes"},
                                 "file_name": {"type": "string"}}
@@ -144,28 +160,9 @@ class ImageNetToMR:
         # add the index
         self.writer.add_index(["label", "file_name"])
 
-        imagenet_iter = self._get_imagenet_as_dict()
-        batch_size = 256
-        transform_count = 0
-        while True:
-            data_list = []
-            try:
-                for _ in range(batch_size):
-                    data_list.append(imagenet_iter.__next__())
-                    transform_count += 1
-                self.writer.write_raw_data(data_list)
-                logger.info("transformed {} record...".format(transform_count))
-            except StopIteration:
-                if data_list:
-                    self.writer.write_raw_data(data_list)
-                    logger.info("transformed {} record...".format(transform_count))
-                break
+        progress = write_rows(self.writer, self._get_imagenet_as_dict(), "ImageNetToMR")
 
         ret = self.writer.commit()
-
-        t1_total = time.time()
-        logger.info("--------------------------------------------")
-        logger.info("END. Total time: {}".format(t1_total - t0_total))
-        logger.info("--------------------------------------------")
+        progress.finish()
 
         return ret
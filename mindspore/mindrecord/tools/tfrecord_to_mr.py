@@ -22,6 +22,7 @@ import numpy as np
 from mindspore import log as logger
 from ..filewriter import FileWriter
 from ..shardutils import check_filename
+from ._pipeline import BATCH_SIZE, write_rows
 
 try:
     tf = import_module("tensorflow")    # just used to convert tfrecord to mindrecord
@@ -196,42 +197,49 @@ class TFRecordToMR:
         features = tf.io.parse_single_example(example, features=self.feature_dict)
         return features
 
-    def _get_data_when_scalar_field(self, ms_dict, cast_key, key, val):
-        """put data in ms_dict when field type is string"""
-        if isinstance(val.numpy(), (np.ndarray, list)):
+    def _get_scalar_column(self, cast_key, key, val):
+        """get the values of a scalar field in a batch of records"""
+        values = val.numpy()
+        if values.ndim != 1:
             raise ValueError("The response key: {}, value: {} from TFRecord should be a scalar.".format(key, val))
         if self.feature_dict[key].dtype == tf.string:
             if cast_key in self.bytes_fields_list:
-                ms_dict[cast_key] = val.numpy()
-            else:
-                ms_dict[cast_key] = str(val.numpy(), encoding="utf-8")
-        elif _cast_type(self.feature_dict[key].dtype).startswith("int"):
-            ms_dict[cast_key] = int(val.numpy())
-        else:
-            ms_dict[cast_key] = float(val.numpy())
+                return values.tolist()
+            return [str(value, encoding="utf-8") for value in values]
+        if values.dtype == np.bool_:
+            values = values.astype(np.int32)
+        return values.tolist()
+
+    def _get_list_column(self, cast_key, key, val):
+        """get the values of a list field in a batch of records, as rows of one array"""
+        values = val.numpy()
+        if values.ndim != 2:
+            raise ValueError("The response key: {}, value: {} from TFRecord should be a ndarray or " \
+                "list.".format(key, val))
+        return list(np.asarray(values, _cast_string_type_to_np_type(self.mindrecord_schema[cast_key]["type"])))
 
     def tfrecord_iterator(self):
-        """Yield a dict with key to be fields in schema, and value to be data."""
+        """
+        Yield a dict with key to be fields in schema, and value to be data.
+
+        The records are parsed in parallel by tf.data and converted to python values a batch at a time.
+        """
         dataset = tf.data.TFRecordDataset(self.source)
-        dataset = dataset.map(self._parse_record)
+        dataset = dataset.map(self._parse_record, num_parallel_calls=tf.data.experimental.AUTOTUNE)
+        dataset = dataset.batch(BATCH_SIZE).prefetch(tf.data.experimental.AUTOTUNE)
         iterator = dataset.__iter__()
-        index_id = 0
         try:
             for features in iterator:
-                ms_dict = {}
-                index_id = index_id + 1
+                columns = {}
                 for key, val in features.items():
                     cast_key = _cast_name(key)
                     if cast_key in self.scalar_set:
-                        self._get_data_when_scalar_field(ms_dict, cast_key, key, val)
+                        columns[cast_key] = self._get_scalar_column(cast_key, key, val)
                     else:
-                        if not isinstance(val.numpy(), np.ndarray) and not isinstance(val.numpy(), list):
-                            raise ValueError("The response key: {}, value: {} from TFRecord should be a ndarray or " \
-                                "list.".format(key, val))
-                        # list set
-                        ms_dict[cast_key] = \
-                            np.asarray(val, _cast_string_type_to_np_type(self.mindrecord_schema[cast_key]["type"]))
-                yield ms_dict
+                        columns[cast_key] = self._get_list_column(cast_key, key, val)
+                keys = list(columns)
+                for row in zip(*columns.values()):
+                    yield dict(zip(keys, row))
         except tf.errors.InvalidArgumentError:
             raise ValueError("TFRecord feature_dict parameter error.")
 
@@ -248,22 +256,7 @@ class TFRecordToMR:
 
         writer.add_schema(self.mindrecord_schema, "TFRecord to MindRecord")
 
-        tf_iter = self.tfrecord_iterator()
-        batch_size = 256
-
-        transform_count = 0
-        while True:
-            data_list = []
-            try:
-                for _ in range(batch_size):
-                    data_list.append(tf_iter.__next__())
-                    transform_count += 1
-
-                writer.write_raw_data(data_list)
-                logger.info("Transformed {} records...".format(transform_count))
-            except StopIteration:
-                if data_list:
-                    writer.write_raw_data(data_list)
-                    logger.info("Transformed {} records...".format(transform_count))
-                break
-        return writer.commit()
+        progress = write_rows(writer, self.tfrecord_iterator(), "TFRecordToMR")
+        ret = writer.commit()
+        progress.finish()
+        return ret
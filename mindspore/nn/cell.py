@@ -30,6 +30,37 @@ from ..ops.functional import cast
 from ..parallel._tensor import _load_tensor_by_layout
 from ..common.tensor import Tensor
 
+# the number of input signatures remembered by the dispatch cache of a cell
+_DISPATCH_CACHE_SIZE = 64
+
+
+def _inputs_signature(inputs):
+    """
+    Signature of the inputs of a cell in graph mode, inputs with the same signature run the same compiled graph.
+
+    Tensors are described by their shape and dtype, scalars, strings and None are constants of the graph so they
+    are described by their value.
+
+    Returns:
+        tuple, the signature, None if it is unknown for the inputs.
+    """
+    signature = []
+    for item in inputs:
+        if isinstance(item, Tensor):
+            if item.virtual_flag:
+                return None
+            signature.append((tuple(item.shape), item.dtype))
+        elif item is None or isinstance(item, (bool, int, float, str)):
+            signature.append((type(item), item))
+        elif isinstance(item, (tuple, list)):
+            item_signature = _inputs_signature(item)
+            if item_signature is None:
+                return None
+            signature.append((type(item), item_signature))
+        else:
+            return None
+    return tuple(signature)
+
 
 class Cell:
     """
@@ -63,6 +94,10 @@ class Cell:
         self._params = OrderedDict()
         self._cells = OrderedDict()
         self._params_list = OrderedDict()
+        # compiled phases of the input signatures, see `dispatch_cache_info`
+        self._dispatch_cache = OrderedDict()
+        self._dispatch_hits = 0
+        self._dispatch_misses = 0
         self.training = False
         self.requires_grad = False
         self.pynative = False
@@ -300,6 +335,7 @@ class Cell:
             if self._auto_prefix:
                 value.update_parameters_name(name + '.')
             cells[name] = value
+            self._dispatch_cache.clear()
         elif params and name in params:
             if isinstance(value, Tensor) and self._params[name] is not None:
                 self._params[name].set_parameter_data(value)
@@ -433,7 +469,7 @@ class Cell:
         Returns:
             Object, the result of executing.
         """
-        _executor.compile(self, *inputs, phase=self.phase, auto_parallel_mode=self._auto_parallel_mode)
+        self._dispatch_compile(inputs)
 
         if self._auto_parallel_mode:
             if inputs and isinstance(inputs[0], Tensor) and inputs[0].virtual_flag:
@@ -446,6 +482,42 @@ class Cell:
             return _executor(self, *parallel_inputs_run, phase=self.phase)
         return _executor(self, *inputs, phase=self.phase)
 
+    def _dispatch_compile(self, inputs):
+        """
+        Compiles cell unless a graph is already compiled for inputs of the same signature.
+
+        On a hit of the dispatch cache, the parameter name check, the argument conversion and the key generation
+        of `_executor.compile` are skipped, only the state `_executor.run` depends on is restored.
+        """
+        signature = _inputs_signature(inputs) if inputs else None
+        if signature is not None:
+            key = (self.phase, self._auto_parallel_mode, signature)
+            cached = self._dispatch_cache.get(key)
+            if cached is not None and cached[1] in _executor.compile_cache:
+                self._dispatch_hits += 1
+                _executor.phase_prefix = cached[0]
+                _executor._set_dataset_mode(inputs)
+                return
+        self._dispatch_misses += 1
+        phase, _ = _executor.compile(self, *inputs, phase=self.phase, auto_parallel_mode=self._auto_parallel_mode)
+        if signature is not None:
+            if len(self._dispatch_cache) >= _DISPATCH_CACHE_SIZE:
+                self._dispatch_cache.popitem(last=False)
+            self._dispatch_cache[key] = (_executor.phase_prefix, phase)
+
+    @property
+    def dispatch_cache_info(self):
+        """
+        Get the statistics of the dispatch cache of the cell in graph mode.
+
+        A call hits the cache when the cell already compiled a graph for inputs of the same shapes, dtypes and
+        constant values, so the graph is run without checking the compile cache of the executor again.
+
+        Returns:
+            dict, the number of hits and misses, and the number of input signatures in the cache.
+        """
+        return {"hits": self._dispatch_hits, "misses": self._dispatch_misses, "size": len(self._dispatch_cache)}
+
     def exec_checkpoint_graph(self):
         """Executes saving checkpoint graph operation."""
         _executor(self, phase='save')
@@ -478,6 +550,7 @@ class Cell:
         if not isinstance(param, Parameter) and param is not None:
             raise TypeError("The type of parameter should be 'Parameter' if not None.")
         self._params[param_name] = param
+        self._dispatch_cache.clear()
 
     def cast_param(self, param):
         """
@@ -516,6 +589,7 @@ class Cell:
         if not isinstance(child, Cell) and child is not None:
             raise TypeError("Child cell type is incorrect.")
         self._cells[child_name] = child
+        self._dispatch_cache.clear()
 
     def construct(self, *inputs):
         """
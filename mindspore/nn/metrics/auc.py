@@ -0,0 +1,188 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""AUC."""
+import numpy as np
+
+from mindspore._checkparam import Validator as validator
+from mindspore._checkparam import Rel
+from .metric import Metric
+
+
+def _curve_area(tps, fps, curve):
+    """
+    Area under the curve given by the cumulative true and false positives of decreasing thresholds.
+
+    The ROC area is computed with the trapezoidal rule, the PR area is the average precision,
+    :math:`\\sum_n (R_n - R_{n-1}) P_n`.
+    """
+    positives = tps[-1]
+    negatives = fps[-1]
+    if curve == 'ROC':
+        if positives == 0 or negatives == 0:
+            raise RuntimeError('ROC AUC needs both positive and negative samples.')
+        tpr = np.concatenate(([0.0], tps / positives))
+        fpr = np.concatenate(([0.0], fps / negatives))
+        return float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1])) / 2)
+
+    if positives == 0:
+        raise RuntimeError('PR AUC needs positive samples.')
+    predicted = tps + fps
+    valid = predicted > 0
+    precision = tps[valid] / predicted[valid]
+    recall = np.concatenate(([0.0], tps[valid] / positives))
+    return float(np.sum(np.diff(recall) * precision))
+
+
+class AUC(Metric):
+    r"""
+    Calculates the area under the ROC curve or the precision-recall curve of binary classification.
+
+    By default the predictions are counted in a histogram of `num_bins` equal bins over :math:`[0, 1]`, separately for
+    the positive and the negative samples, so the memory does not grow with the number of samples and the
+    histograms of several devices can be merged with `merge`. The predictions in the same bin are taken as tied,
+    so the error of the area is bounded by the fraction of the samples whose bin holds both classes. With `exact`,
+    all the predictions are kept and the area is computed exactly.
+
+    Args:
+        curve (str): 'ROC' for the area under the receiver operating characteristic curve, 'PR' for the area under
+            the precision-recall curve, i.e. the average precision. Default: 'ROC'.
+        num_bins (int): The number of bins of the histograms. Default: 10000.
+        exact (bool): Whether to keep all the predictions and compute the exact area. Default: False.
+
+    Examples:
+        >>> x = Tensor(np.array([0.1, 0.4, 0.35, 0.8]))
+        >>> y = Tensor(np.array([0, 0, 1, 1]))
+        >>> metric = nn.AUC()
+        >>> metric.clear()
+        >>> metric.update(x, y)
+        >>> auc = metric.eval()
+    """
+    def __init__(self, curve='ROC', num_bins=10000, exact=False):
+        super(AUC, self).__init__()
+        self._curve = validator.check_string('curve', curve, ['ROC', 'PR'], self.__class__.__name__)
+        self._num_bins = validator.check_integer('num_bins', num_bins, 1, Rel.GE, self.__class__.__name__)
+        self._exact = validator.check_value_type('exact', exact, [bool], self.__class__.__name__)
+        self.clear()
+
+    def clear(self):
+        """Clears the internal evaluation result."""
+        self._positives = np.zeros(self._num_bins, np.int64)
+        self._negatives = np.zeros(self._num_bins, np.int64)
+        self._y_pred = []
+        self._y = []
+
+    def update(self, *inputs):
+        """
+        Updates the internal evaluation result with `y_pred` and `y`.
+
+        Args:
+            inputs: Input `y_pred` and `y`. `y_pred` and `y` are Tensor, list or numpy.ndarray with the same number
+                of elements. `y_pred` is the predicted probabilities of the positive class, in the range
+                :math:`[0, 1]` unless `exact`, and `y` is the labels, 0 or 1.
+
+        Raises:
+            ValueError: If the number of input is not 2, the sizes of `y_pred` and `y` are different, or their values
+                are out of range.
+        """
+        if len(inputs) != 2:
+            raise ValueError('AUC need 2 inputs (y_pred, y), but got {}'.format(len(inputs)))
+        y_pred = self._convert_data(inputs[0]).reshape(-1)
+        y = self._convert_data(inputs[1]).reshape(-1)
+        if y_pred.size != y.size:
+            raise ValueError('y_pred and y should have the same number of elements, but got {} and {}.'
+                             .format(y_pred.size, y.size))
+        if y.size == 0:
+            return
+        is_positive = y == 1
+        if not (is_positive | (y == 0)).all():
+            raise ValueError('The labels y should be 0 or 1.')
+
+        if self._exact:
+            self._y_pred.append(y_pred.astype(np.float64))
+            self._y.append(is_positive)
+            return
+
+        if y_pred.min() < 0 or y_pred.max() > 1:
+            raise ValueError('y_pred should be in the range [0, 1], but got [{}, {}].'.format(y_pred.min(),
+                                                                                           y_pred.max()))
+        bins = np.minimum((y_pred * self._num_bins).astype(np.int64), self._num_bins - 1)
+        positives = np.bincount(bins[is_positive], minlength=self._num_bins)
+        self._positives += positives
+        self._negatives += np.bincount(bins, minlength=self._num_bins) - positives
+
+    def merge(self, other):
+        """
+        Adds the samples counted by another AUC metric, e.g. of another device.
+
+        Args:
+            other (AUC): A metric with the same `curve`, `num_bins` and `exact`.
+        """
+        if not isinstance(other, AUC) or (other._curve, other._num_bins, other._exact) != \
+                (self._curve, self._num_bins, self._exact):
+            raise TypeError('Only an AUC metric with the same curve, num_bins and exact can be merged.')
+        self._positives += other._positives
+        self._negatives += other._negatives
+        self._y_pred.extend(other._y_pred)
+        self._y.extend(other._y)
+
+    def _cumulative_counts(self):
+        """true and false positives of the thresholds from the highest to the lowest"""
+        if self._exact:
+            if not self._y_pred:
+                raise RuntimeError('Input number of samples can not be 0.')
+            y_pred = np.concatenate(self._y_pred)
+            y = np.concatenate(self._y)
+            order = np.argsort(-y_pred, kind='mergesort')
+            y_pred = y_pred[order]
+            # the last sample of each distinct prediction
+            last = np.append(np.flatnonzero(np.diff(y_pred)), y_pred.size - 1)
+            tps = np.cumsum(y[order])[last]
+            fps = last + 1 - tps
+            return tps, fps, y_pred[last]
+        tps = np.cumsum(self._positives[::-1])
+        fps = np.cumsum(self._negatives[::-1])
+        if tps[-1] + fps[-1] == 0:
+            raise RuntimeError('Input number of samples can not be 0.')
+        thresholds = np.arange(self._num_bins - 1, -1, -1) / self._num_bins
+        return tps, fps, thresholds
+
+    def curve(self):
+        """
+        Computes the points of the curve, from the highest threshold to the lowest.
+
+        Returns:
+            tuple, for 'ROC' (false positive rates, true positive rates, thresholds), for 'PR'
+            (precisions, recalls, thresholds). A sample is predicted positive if its prediction is no less than the
+            threshold.
+        """
+        tps, fps, thresholds = self._cumulative_counts()
+        if self._curve == 'ROC':
+            return fps / max(fps[-1], 1), tps / max(tps[-1], 1), thresholds
+        predicted = tps + fps
+        valid = predicted > 0
+        return tps[valid] / predicted[valid], tps[valid] / max(tps[-1], 1), thresholds[valid]
+
+    def eval(self):
+        """
+        Computes the area under the curve.
+
+        Returns:
+            Float, the computed result.
+
+        Raises:
+            RuntimeError: If there is no sample, or no sample of a class the curve needs.
+        """
+        tps, fps, _ = self._cumulative_counts()
+        return _curve_area(tps, fps, self._curve)
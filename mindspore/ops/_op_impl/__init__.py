@@ -12,12 +12,42 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ============================================================================
-"""Operators info register."""
+"""
+Operators info register.
 
+The op info of the built-in operators is registered by importing the registration packages of an imply type, which
+encode hundreds of op infos. The backend imports them on its first lookup of an op of that imply type, through
+`load_op_info`, so importing mindspore stays cheap and a CPU only process never imports them.
+"""
+
+import importlib
 import platform
-from .aicpu import *
-if "Windows" not in platform.system():
-    from .akg import *
-    from .tbe import *
+
+# imply type of the op info -> registration packages
+_OP_INFO_PACKAGES = {"AiCPU": ("aicpu",), "TBE": ("tbe",), "AKG": ("akg",)}
+_WINDOWS_PACKAGES = ("aicpu",)
+
+
+def load_op_info(imply_type):
+    """
+    Registers the op info of the built-in operators of an imply type.
+
+    The packages are registered once by the import, concurrent calls wait for the import in progress.
+
+    Args:
+        imply_type (str): Imply type of the operators, one of "TBE", "AKG" and "AiCPU".
+    """
+    is_windows = "Windows" in platform.system()
+    for package in _OP_INFO_PACKAGES.get(imply_type, ()):
+        if is_windows and package not in _WINDOWS_PACKAGES:
+            continue
+        importlib.import_module("." + package, __name__)
+
+
+def load_all_op_info():
+    """Registers the op info of the built-in operators of all imply types."""
+    for imply_type in _OP_INFO_PACKAGES:
+        load_op_info(imply_type)
+
 
 __all__ = []
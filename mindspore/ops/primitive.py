@@ -17,6 +17,7 @@
 
 import inspect
 import copy
+from collections import OrderedDict
 from mindspore.common.api import _wrap_func
 from mindspore.common import Parameter
 from mindspore.common._register_for_tensor import tensor_operator_registry
@@ -25,6 +26,7 @@ from .._c_expression import Primitive_, real_run_op, prim_type
 from .._c_expression import signature_rw as sig_rw
 from .._c_expression import signature_kind as sig_kind
 from .._c_expression import signature_dtype as sig_dtype
+from .._c_expression.typing import Type
 
 
 class Primitive(Primitive_):
@@ -201,6 +203,109 @@ class Primitive(Primitive_):
         return self._update_parameter
 
 
+class _Unhashable(Exception):
+    """raised when a value can not be part of an infer cache key"""
+
+
+def _freeze(value):
+    """Converts a value of an abstract input or of a primitive attribute to a hashable key, by value."""
+    if value is None or isinstance(value, (bool, int, float, str, Type, type)):
+        return type(value), value
+    if isinstance(value, (tuple, list)):
+        return type(value), tuple(_freeze(item) for item in value)
+    if isinstance(value, dict) and all(isinstance(key, str) for key in value):
+        return dict, tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    raise _Unhashable
+
+
+class _InferCache:
+    """
+    Cache of the infer results of PrimitiveWithInfer.
+
+    Deep networks infer the same primitive with the same abstract inputs over and over during compilation. The
+    results are keyed on the class and the attributes of the primitive and on the shapes, dtypes and values of the
+    inputs, so instances of the same primitive share their results. Infer functions which set attributes of the
+    primitive are supported, the attributes they set are recorded and set again on a hit.
+
+    Args:
+        max_size (int): The maximum number of results, the least recently used ones are dropped.
+    """
+    # attributes which differ between instances without changing the infer result
+    _ignored_attrs = ('attrs', 'init_attrs', 'instance_name')
+
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self._results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def key(self, prim, args):
+        """
+        Returns the cache key of inferring prim with args, None if the attributes or the inputs can not be hashed.
+        """
+        try:
+            attrs = tuple(sorted((name, _freeze(value)) for name, value in prim.__dict__.items()
+                                 if name not in self._ignored_attrs))
+            return (type(prim), context.get_context("mode"), context.get_context("device_target"), attrs,
+                    tuple(_freeze(arg) for arg in args))
+        except _Unhashable:
+            return None
+
+    def infer(self, prim, args, infer_fn):
+        """Returns the result of infer_fn(*args), from the cache if it was inferred before."""
+        if self.max_size <= 0:
+            return infer_fn(*args)
+        key = self.key(prim, args)
+        if key is None:
+            self.uncached += 1
+            return infer_fn(*args)
+        cached = self._results.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._results.move_to_end(key)
+            out, added_attrs, set_attrs = cached
+            for name, value in added_attrs:
+                prim.add_prim_attr(name, value)
+            prim.__dict__.update(set_attrs)
+            return dict(out)
+
+        self.misses += 1
+        attrs_before = dict(prim.attrs)
+        dict_before = dict(prim.__dict__)
+        out = infer_fn(*args)
+        added_attrs = tuple((name, value) for name, value in prim.attrs.items()
+                            if name not in attrs_before or attrs_before[name] is not value)
+        set_attrs = {name: value for name, value in prim.__dict__.items()
+                     if (name not in dict_before or dict_before[name] is not value) and name not in prim.attrs}
+        try:
+            _freeze(out.get('value'))
+        except _Unhashable:
+            # do not share constant tensors between graph nodes
+            return out
+        self._results[key] = (dict(out), added_attrs, set_attrs)
+        if len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+        return out
+
+    def info(self):
+        """
+        Returns:
+            dict, the number of hits, misses, calls which can not be cached, and results in the cache.
+        """
+        return {"hits": self.hits, "misses": self.misses, "uncached": self.uncached, "size": len(self._results)}
+
+    def clear(self):
+        """Drops the cached results and resets the statistics."""
+        self._results.clear()
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+
+_infer_cache = _InferCache()
+
+
 class PrimitiveWithInfer(Primitive):
     """
     PrimitiveWithInfer is the base class of primitives in python defines functions for tracking inference in python.
@@ -295,7 +400,11 @@ class PrimitiveWithInfer(Primitive):
                 # fn may return None
                 out[track] = fn(*(x[track] for x in args))
             return out
+        return _infer_cache.infer(self, args, self._infer_static_shape)
 
+    def _infer_static_shape(self, *args):
+        """Infer shape, type, and value of inputs without dynamic shape inference."""
+        is_graph_mode = context.get_context("mode") == context.GRAPH_MODE
         tracks = ['dtype', 'shape', 'value']
         out = {}
         for track in tracks:
@@ -238,6 +238,65 @@ def _load_tensor_by_layout(tensor, layout):
     return _load_tensor(tensor, dev_mat, tensor_map)
 
 
+def _merge_slices(np_data, dev_mat, tensor_map):
+    """
+    Combine the slices of all the devices, concatenated along axis 0 in the order of the ranks, into the whole data.
+
+    The rank of a device is its row-major index in the device matrix, so np_data is viewed as
+    (dev_mat..., slice_shape...). The devices along the device axes no tensor dim is mapped to hold the same slice,
+    only the first of them is kept. The remaining device axes are moved next to the tensor dims they split and
+    merged into them, so the whole data is built by a single copy.
+
+    Args:
+        np_data (numpy.ndarray): The slices of all the devices.
+        dev_mat (list): The device matrix of devices.
+        tensor_map (list): The split strategy of tensor.
+
+    Returns:
+        numpy.ndarray, the whole data.
+    """
+    dev_num = len(dev_mat)
+    dev_mat = [int(dim) for dim in dev_mat]
+    slice_shape = list(np_data.shape)
+    slice_shape[0] //= int(np.prod(dev_mat))
+    data = np_data.reshape(dev_mat + slice_shape)
+
+    # the device axis splitting each tensor dim, None if the dim is not split
+    split_axes = [None if dim == -1 else dev_num - 1 - dim for dim in tensor_map]
+    unused_axes = tuple(axis for axis in range(dev_num) if axis not in split_axes)
+    data = data[tuple(0 if axis in unused_axes else slice(None) for axis in range(dev_num))]
+    used_axes = [axis for axis in range(dev_num) if axis not in unused_axes]
+
+    perm = []
+    shape = []
+    for i, axis in enumerate(split_axes):
+        if axis is not None:
+            perm.append(used_axes.index(axis))
+        perm.append(len(used_axes) + i)
+        shape.append(slice_shape[i] * (dev_mat[axis] if axis is not None else 1))
+    return np.ascontiguousarray(data.transpose(perm)).reshape(shape)
+
+
+def _merge_slices_with_weight(np_data, dev_mat, field_size):
+    """
+    Combine the slices of all the devices split by field, concatenated along axis 0 in the order of the ranks.
+
+    The rows of each slice are (field, slice of the rows of the field), the slices of a field are put side by side.
+
+    Args:
+        np_data (numpy.ndarray): The slices of all the devices.
+        dev_mat (list): The device matrix of devices.
+        field_size (list): The field size of the parameter.
+
+    Returns:
+        numpy.ndarray, the whole data.
+    """
+    device_count = int(np.prod(dev_mat))
+    cols = np_data.shape[1]
+    data = np_data.reshape(device_count, field_size[0], -1, cols)
+    return np.ascontiguousarray(data.transpose(1, 0, 2, 3)).reshape(-1, cols)
+
+
 def _reshape_param_data(param_data, dev_mat, tensor_map):
     """
     Combine param slice by the device matrix and the tensor map, used in model parallel scenario.
@@ -256,40 +315,8 @@ def _reshape_param_data(param_data, dev_mat, tensor_map):
         >>> tensor_map = [1, 0]
         >>> tensor = _reshape_param_data(tensor_slices, dev_mat, tensor_map)
     """
+    return Tensor(_merge_slices(param_data.asnumpy(), dev_mat, tensor_map))
 
-    device_count = 1
-    for dim in dev_mat:
-        device_count *= dim
-
-    tensor_slices = np.split(param_data.asnumpy(), device_count, axis=0)
-    tensor_strategy = _get_tensor_strategy(dev_mat, tensor_map)
-
-    # get the actual number of slices,as: different devices may load the same slice
-    slice_count = 1
-    for dim in tensor_strategy:
-        slice_count *= dim
-
-    # reorder slices and remove duplicates based on device matrix and tensor_map
-    tensor_slices_new = list(range(slice_count))
-    for i in range(device_count):
-        slice_index = _get_tensor_slice_index(dev_mat, tensor_strategy, tensor_map, i)
-        tensor_slices_new[int(slice_index)] = np.array(tensor_slices[i])
-
-    # combine slices to generate complete parameter
-    dim_len = len(tensor_strategy)
-    for i in range(dim_len):
-        ele_count = int(len(tensor_slices_new) / tensor_strategy[dim_len - 1 - i])
-        tensor_slices_new_inner = []
-        for j in range(ele_count):
-            new_tensor = tensor_slices_new[j * tensor_strategy[dim_len - 1 - i]]
-            for l in range(j * tensor_strategy[dim_len - 1 - i] + 1,
-                           (j + 1) * tensor_strategy[dim_len - 1 - i]):
-                new_tensor = np.concatenate((new_tensor, tensor_slices_new[l]), axis=dim_len - 1 - i)
-
-            tensor_slices_new_inner.insert(len(tensor_slices_new_inner), np.array(new_tensor))
-        tensor_slices_new = tensor_slices_new_inner
-
-    return Tensor(tensor_slices_new[0])
 
 def _reshape_param_data_with_weight(param_data, dev_mat, field_size):
     """
@@ -308,19 +335,4 @@ def _reshape_param_data_with_weight(param_data, dev_mat, field_size):
         >>> field_size = [39]
         >>> tensor = _reshape_param_data_with_weight(param_data, dev_mat, field_size)
     """
-    device_count = 1
-    for dim in dev_mat:
-        device_count *= dim
-
-    tensor_slices = np.split(param_data.asnumpy(), device_count, axis=0)
-    tensor_slices_col = []
-    for i in range(len(tensor_slices[0][0])):
-        tensor_slices_new = np.array(tensor_slices[0][:, i]).reshape(field_size[0], -1)
-        for j in range(1, device_count):
-            tensor_slices_new = np.concatenate((tensor_slices_new,\
-                                   np.array(tensor_slices[j][:, i]).reshape(field_size[0], -1)), axis=1)
-        tensor_slices_col.append(tensor_slices_new)
-    new_tensor = np.array(tensor_slices_col[0]).reshape(-1, 1)
-    for i in range(1, len(tensor_slices_col)):
-        new_tensor = np.concatenate((new_tensor, np.array(tensor_slices_col[i]).reshape(-1, 1)), axis=1)
-    return Tensor(new_tensor)
+    return Tensor(_merge_slices_with_weight(param_data.asnumpy(), dev_mat, field_size))
@@ -14,15 +14,106 @@
 # ============================================================================
 """The parser for hwts log file."""
 import os
-import struct
+import numpy as np
 from mindspore.profiler.common.util import fwrite_format, get_file_join_name
 from mindspore import log as logger
 
+# The layout of a 64 bytes hwts log record. The first byte holds the count (bits 4-7), the warn flag (bit 3) and the
+# log type (bits 0-2). Log type 0-3 have the system count at byte 8, log type 4 (Block PMU) has it at byte 24.
+# The stream id is at byte 16 for all log types.
+HWTS_RECORD_DTYPE = np.dtype([
+    ('head', 'u1'), ('core_id', 'u1'), ('reserved0', '<u2'), ('blk_id', '<u2'), ('task_id', '<u2'),
+    ('syscnt', '<u8'), ('stream_id', '<u4'), ('reserved1', '<u4'), ('pmu_syscnt', '<u8'), ('reserved2', 'V32')
+])
+
+# The columns of the intermediate columnar output, one entry per valid record.
+HWTS_COLUMNS = ('log_type', 'cnt', 'core_id', 'blk_id', 'task_id', 'stream_id', 'syscnt', 'syscnt_valid')
+
+LOG_TYPE_NAMES = ('Start of task', 'End of task', 'Start of block', 'End of block', 'Block PMU')
+_BLOCK_PMU_TYPE = 4
+_WHITESPACE_BYTES = np.frombuffer(b' \t\n\r\x0b\x0c', np.uint8)
+
+
+def decode_hwts_records(records):
+    """
+    Decode hwts log records at once.
+
+    Args:
+        records (numpy.ndarray): The records of `HWTS_RECORD_DTYPE`.
+
+    Returns:
+        dict, the columns in `HWTS_COLUMNS` of the valid records.
+    """
+    head = records['head']
+    log_type = head & 0x7
+    valid = log_type <= _BLOCK_PMU_TYPE
+    # records only made of white spaces are padding
+    raw_bytes = records.view(np.uint8).reshape(len(records), HWTS_RECORD_DTYPE.itemsize)
+    valid &= ~np.isin(raw_bytes, _WHITESPACE_BYTES).all(axis=1)
+    invalid_types = np.unique(log_type[~valid & (log_type > _BLOCK_PMU_TYPE)])
+    for invalid_type in invalid_types:
+        logger.info("Profiling: invalid hwts log record type %s", format(int(invalid_type), '03b'))
+
+    records = records[valid]
+    head = head[valid]
+    log_type = log_type[valid]
+    is_pmu = log_type == _BLOCK_PMU_TYPE
+    is_warn = (head & 0x8) != 0
+    return {
+        'log_type': log_type,
+        'cnt': head >> 4,
+        'core_id': records['core_id'],
+        'blk_id': records['blk_id'],
+        'task_id': records['task_id'],
+        'stream_id': records['stream_id'],
+        'syscnt': np.where(is_pmu, records['pmu_syscnt'], records['syscnt']),
+        'syscnt_valid': ~(is_pmu & is_warn),
+    }
+
+
+def hwts_task_names(task_id, stream_id):
+    """
+    Get the task names used by the framework data, `<stream_id>_<task_id>` for task ids less than 25000,
+    otherwise the task id itself.
+
+    Args:
+        task_id (numpy.ndarray): The task ids.
+        stream_id (numpy.ndarray): The stream ids.
+
+    Returns:
+        list[str], the task names.
+    """
+    return ["%s_%s" % (stream, task) if task < 25000 else str(task)
+            for task, stream in zip(task_id.tolist(), stream_id.tolist())]
+
+
+def get_hwts_columnar_file(hwts_output_file):
+    """Get the file of the columnar output beside the text output of the hwts log parser."""
+    return os.path.splitext(hwts_output_file)[0] + '.npz'
+
+
+def get_hwts_output_stamp(hwts_output_file):
+    """
+    Get the stamp of the text output of the hwts log parser, saved into the columnar output.
+
+    The columnar output is only read back if it has the stamp of the current text output, so that the columns of an
+    earlier profiling in the same directory are not read after the text output is written again.
+
+    Returns:
+        numpy.ndarray, the size and the modification time in nanoseconds of the text output.
+    """
+    stat = os.stat(hwts_output_file)
+    return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
 
 class HWTSLogParser:
     """
     The Parser for hwts log files.
 
+    Besides the text output, the parsed records are saved as columns into a numpy `.npz` file beside the output
+    file, see `get_hwts_columnar_file`, which is read by `OPComputeTimeParser` instead of parsing the text again as
+    long as it has the stamp of the text output, see `get_hwts_output_stamp`.
+
     Args:
          input_path (str): The profiling job path. Such as: '/var/log/npu/profiling/JOBAIFGJEJFEDCBAEADIFJAAAAAAAAAA".
          output_filename (str): The output data path and name. Such as: './output_format_data_hwts_0.txt'.
@@ -31,6 +122,8 @@ class HWTSLogParser:
     _source_file_target = 'hwts.log.data.45.dev.profiler_default_tag'
     _dst_file_title = 'title:45 HWTS data'
     _dst_file_column_title = 'Type           cnt  Core_ID  Block_ID  Task_ID  Cycle_counter   Stream_ID'
+    # the number of records decoded at once, bounds the memory used for a large log
+    _chunk_records = 1 << 20
 
     def __init__(self, input_path, output_filename):
         self._input_path = input_path
@@ -57,53 +150,45 @@ class HWTSLogParser:
         Returns:
             bool, whether succeed to analyse hwts log.
         """
-
-        content_format = ['QIIIIIIIIIIII', 'QIIQIIIIIIII', 'IIIIQIIIIIIII']
-        log_type = ['Start of task', 'End of task', 'Start of block', 'End of block', 'Block PMU']
-
-        result_data = ""
-
-        with open(self._source_flie_name, 'rb') as hwts_data:
-            while True:
-                line = hwts_data.read(64)
-                if line:
-                    if not line.strip():
-                        continue
-                else:
-                    break
-                byte_first_four = struct.unpack('BBHHH', line[0:8])
-                byte_first = bin(byte_first_four[0]).replace('0b', '').zfill(8)
-                ms_type = byte_first[-3:]
-                is_warn_res0_ov = byte_first[4]
-                cnt = int(byte_first[0:4], 2)
-                core_id = byte_first_four[1]
-                blk_id, task_id = byte_first_four[3], byte_first_four[4]
-                if ms_type in ['000', '001', '010']:  # log type 0,1,2
-                    result = struct.unpack(content_format[0], line[8:])
-                    syscnt = result[0]
-                    stream_id = result[1]
-                elif ms_type == '011':  # log type 3
-                    result = struct.unpack(content_format[1], line[8:])
-                    syscnt = result[0]
-                    stream_id = result[1]
-                elif ms_type == '100':  # log type 4
-                    result = struct.unpack(content_format[2], line[8:])
-                    stream_id = result[2]
-                    if is_warn_res0_ov == '0':
-                        syscnt = result[4]
-                    else:
-                        syscnt = None
-                else:
-                    logger.info("Profiling: invalid hwts log record type %s", ms_type)
-                    continue
-
-                if int(task_id) < 25000:
-                    task_id = str(stream_id) + "_" + str(task_id)
-                result_data += ("%-14s %-4s %-8s %-9s %-8s %-15s %s\n" %(log_type[int(ms_type, 2)], cnt, core_id,
-                                                                         blk_id, task_id, syscnt, stream_id))
+        file_size = os.path.getsize(self._source_flie_name)
+        record_size = HWTS_RECORD_DTYPE.itemsize
+        if file_size % record_size:
+            logger.warning("Profiling: the last %d bytes of the hwts log file are not a complete record, "
+                           "they are ignored.", file_size % record_size)
+        num_records = file_size // record_size
 
         fwrite_format(self._output_filename, data_source=self._dst_file_title, is_start=True)
         fwrite_format(self._output_filename, data_source=self._dst_file_column_title)
-        fwrite_format(self._output_filename, data_source=result_data)
+
+        # starts with the empty columns, so that the columns have their types even if there is no record
+        column_chunks = {name: [column] for name, column in
+                         decode_hwts_records(np.zeros(0, HWTS_RECORD_DTYPE)).items()}
+        with open(self._source_flie_name, 'rb') as hwts_data, open(self._output_filename, 'a+') as output:
+            for start in range(0, num_records, self._chunk_records):
+                count = min(self._chunk_records, num_records - start)
+                records = np.fromfile(hwts_data, dtype=HWTS_RECORD_DTYPE, count=count)
+                columns = decode_hwts_records(records)
+                for name in HWTS_COLUMNS:
+                    column_chunks[name].append(columns[name])
+                output.write(self._format_columns(columns))
+            output.write("\n")
+
+        columns = {name: np.concatenate(chunks) for name, chunks in column_chunks.items()}
+        # the text output is closed, so its stamp does not change any more
+        output_stamp = get_hwts_output_stamp(self._output_filename)
+        np.savez(get_hwts_columnar_file(self._output_filename), output_stamp=output_stamp, **columns)
 
         return True
+
+    @staticmethod
+    def _format_columns(columns):
+        """Format the decoded records as the lines of the text output."""
+        task_names = hwts_task_names(columns['task_id'], columns['stream_id'])
+        syscnt = [value if valid else None
+                  for value, valid in zip(columns['syscnt'].tolist(), columns['syscnt_valid'].tolist())]
+        lines = ["%-14s %-4s %-8s %-9s %-8s %-15s %s\n" % (LOG_TYPE_NAMES[log_type], cnt, core_id, blk_id, task_name,
+                                                           cycle, stream_id)
+                 for log_type, cnt, core_id, blk_id, task_name, cycle, stream_id in
+                 zip(columns['log_type'].tolist(), columns['cnt'].tolist(), columns['core_id'].tolist(),
+                     columns['blk_id'].tolist(), task_names, syscnt, columns['stream_id'].tolist())]
+        return "".join(lines)
@@ -14,12 +14,15 @@
 # ============================================================================
 """Op compute time files parser."""
 import os
+import numpy as np
 from mindspore.profiler.common.util import fwrite_format
 from mindspore.profiler.common.exceptions.exceptions import ProfilerFileNotFoundException, \
     ProfilerIOException
 from mindspore import log as logger
 from mindspore.profiler.common.validator.validate_path import validate_and_normalize_path
 from mindspore.profiler.parser.container import HWTSContainer
+from mindspore.profiler.parser.hwts_log_parser import get_hwts_columnar_file, get_hwts_output_stamp, \
+    hwts_task_names
 
 TIMELINE_FILE_COLUMN_TITLE = 'op_name, stream_id, start_time(ms), duration(ms)'
 
@@ -56,12 +59,26 @@ class OPComputeTimeParser:
         """
 
         op_map_result = []
-        hwts_list = []
 
         if not os.path.exists(self._hwts_output_file):
             logger.error('The hwts output file does not exist.')
             raise ProfilerFileNotFoundException('hwts output file')
 
+        hwts_list = self._read_hwts_columns()
+        if hwts_list is None:
+            hwts_list = self._read_hwts_text()
+
+        # hwts op map by taskId
+        for hwts in hwts_list:
+            if hwts.task_id in self._op_task_info.keys():
+                hwts.op_name = self._op_task_info[hwts.task_id]
+                op_map_result.append(hwts)
+
+        return op_map_result
+
+    def _read_hwts_text(self):
+        """Read the task start and end records from the text output of the hwts log parser."""
+        hwts_list = []
         with open(self._hwts_output_file, 'r') as data_file:
             lines = data_file.readlines()
             for line in lines:
@@ -69,14 +86,40 @@ class OPComputeTimeParser:
                     line_split = line.split()
                     container = HWTSContainer(line_split)
                     hwts_list.append(container)
+        return hwts_list
 
-        # hwts op map by taskId
-        for hwts in hwts_list:
-            if hwts.task_id in self._op_task_info.keys():
-                hwts.op_name = self._op_task_info[hwts.task_id]
-                op_map_result.append(hwts)
+    def _read_hwts_columns(self):
+        """
+        Read the task start and end records from the columnar output of the hwts log parser.
 
-        return op_map_result
+        Returns:
+            list, the task records, None if there is no columnar output or it was written for an earlier text output.
+        """
+        hwts_file = validate_and_normalize_path(get_hwts_columnar_file(self._hwts_output_file))
+        if not os.path.exists(hwts_file):
+            return None
+        with np.load(hwts_file) as columns:
+            if 'output_stamp' not in columns or \
+                    not np.array_equal(columns['output_stamp'], get_hwts_output_stamp(self._hwts_output_file)):
+                logger.info('The columnar hwts output is older than the text output, read the text output instead.')
+                return None
+            # log type 0 is the start of a task, 1 is the end of a task
+            is_task = columns['log_type'] <= 1
+            log_type = columns['log_type'][is_task]
+            task_id = columns['task_id'][is_task]
+            stream_id = columns['stream_id'][is_task]
+            syscnt = columns['syscnt'][is_task]
+
+        hwts_list = []
+        status_names = ('Start', 'End')
+        for status, task_name, cycle, stream in zip(log_type.tolist(), hwts_task_names(task_id, stream_id),
+                                                    syscnt.tolist(), stream_id.tolist()):
+            if task_name not in self._op_task_info:
+                continue
+            # the same fields as a line of the text output: "Start of task cnt core_id blk_id task cycle stream"
+            hwts_list.append(HWTSContainer([status_names[status], 'of', 'task', None, None, None,
+                                            task_name, cycle, str(stream)]))
+        return hwts_list
 
     def execute(self):
         """Execute the parser, compute all op, get op time, and write it to the output file."""
@@ -0,0 +1,126 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Streaming checkpoint serialization and the background checkpoint writer."""
+import atexit
+import math
+import queue
+from threading import Thread, Lock
+
+import numpy as np
+
+from mindspore import log as logger
+
+_WIRE_VARINT = 0
+_WIRE_LENGTH_DELIMITED = 2
+
+ASYNC_SAVE_QUEUE_SIZE = 2
+
+
+def _encode_varint(value):
+    """Encodes a non-negative int (or int64 as its two's complement) into base 128 varint bytes."""
+    if value < 0:
+        value += 1 << 64
+    out = bytearray()
+    while True:
+        bits = value & 0x7f
+        value >>= 7
+        if value:
+            out.append(bits | 0x80)
+        else:
+            out.append(bits)
+            return bytes(out)
+
+
+def _encode_key(field_number, wire_type):
+    return _encode_varint((field_number << 3) | wire_type)
+
+
+def _encode_bytes_field(field_number, data):
+    return _encode_key(field_number, _WIRE_LENGTH_DELIMITED) + _encode_varint(len(data)) + data
+
+
+def _write_param(f, name, dims, tensor_type, data, slice_size):
+    """
+    Writes one parameter as `Checkpoint.value` records, split into slices of at most slice_size bytes.
+
+    Only the small record headers are built in Python, the tensor content is written straight from the numpy buffer,
+    so the data is not copied into an intermediate bytes object or protobuf message.
+
+    Returns:
+        int, the number of bytes written.
+    """
+    data = np.ascontiguousarray(data).reshape(-1)
+    if data.nbytes > slice_size:
+        param_slice_list = np.array_split(data, math.ceil(data.nbytes / slice_size))
+    else:
+        param_slice_list = [data]
+
+    tag_field = _encode_bytes_field(1, name.encode("utf-8"))
+    tensor_head = b"".join(_encode_key(1, _WIRE_VARINT) + _encode_varint(dim) for dim in dims)
+    tensor_head += _encode_bytes_field(2, tensor_type.encode("utf-8"))
+    written = 0
+    for param_slice in param_slice_list:
+        content_head = _encode_key(3, _WIRE_LENGTH_DELIMITED) + _encode_varint(param_slice.nbytes)
+        tensor_size = len(tensor_head) + len(content_head) + param_slice.nbytes
+        value_head = tag_field + _encode_key(2, _WIRE_LENGTH_DELIMITED) + _encode_varint(tensor_size)
+        value_size = len(value_head) + len(tensor_head) + len(content_head) + param_slice.nbytes
+        head = _encode_key(1, _WIRE_LENGTH_DELIMITED) + _encode_varint(value_size) + value_head + tensor_head \
+            + content_head
+        f.write(head)
+        f.write(memoryview(param_slice.view(np.uint8)))
+        written += len(head) + param_slice.nbytes
+    return written
+
+
+class _AsyncCheckpointWriter:
+    """
+    Background checkpoint writer.
+
+    A single daemon thread drains a bounded queue of pending saves. When the queue is full, `submit` blocks until a
+    pending save is finished, so saving faster than the disk can write neither piles up threads nor parameter copies.
+
+    Args:
+        save_func (function): The function to write a checkpoint file, called as save_func(*args).
+        max_pending (int): The maximum number of saves waiting to be written. Default: ASYNC_SAVE_QUEUE_SIZE.
+    """
+
+    def __init__(self, save_func, max_pending=ASYNC_SAVE_QUEUE_SIZE):
+        self._save_func = save_func
+        self._queue = queue.Queue(max_pending)
+        self._thread = None
+        self._lock = Lock()
+
+    def submit(self, *args):
+        """Queues a save, blocks while `max_pending` saves are already waiting."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name="asyn_save_ckpt", daemon=True)
+                self._thread.start()
+                atexit.register(self.wait)
+        self._queue.put(args)
+
+    def wait(self):
+        """Blocks until all the queued saves are written."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            args = self._queue.get()
+            try:
+                self._save_func(*args)
+            except BaseException as e:
+                logger.error("Failed to save the checkpoint asynchronously: %s.", e)
+            finally:
+                self._queue.task_done()
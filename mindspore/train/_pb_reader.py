@@ -0,0 +1,162 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""
+Incremental reader for checkpoint and print protobuf files.
+
+Both `checkpoint.proto` and `print.proto` are a top level message holding a repeated `Value` (field 1), where each
+value carries a string (field 1) and a `TensorProto` (field 2). The reader walks the protobuf wire format directly
+on a buffer (usually a read-only mmap), so records can be visited one by one and the tensor content can be viewed
+in place instead of parsing the whole file into memory.
+"""
+import mmap
+
+_WIRE_VARINT = 0
+_WIRE_FIXED64 = 1
+_WIRE_LENGTH_DELIMITED = 2
+_WIRE_FIXED32 = 5
+
+_VALUE_FIELD = 1
+_VALUE_STR_FIELD = 1
+_VALUE_TENSOR_FIELD = 2
+
+_TENSOR_DIMS_FIELD = 1
+_TENSOR_TYPE_FIELD = 2
+_TENSOR_CONTENT_FIELD = 3
+
+
+class _TensorRecord:
+    """
+    Location of a `TensorProto` inside a buffer.
+
+    Args:
+        dims (list): Shape of the tensor.
+        tensor_type (str): Type name of the tensor, such as "Float32".
+        content_offset (int): Offset of the tensor content in the buffer.
+        content_size (int): Size of the tensor content in bytes.
+    """
+
+    def __init__(self, dims, tensor_type, content_offset, content_size):
+        self.dims = dims
+        self.tensor_type = tensor_type
+        self.content_offset = content_offset
+        self.content_size = content_size
+
+
+def _read_varint(buf, pos):
+    """Decodes a base 128 varint at `pos`, returns the value and the position after it."""
+    result = 0
+    shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        result |= (byte & 0x7f) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 64:
+            raise ValueError("Varint is too long at position {}.".format(pos))
+
+
+def _to_int64(value):
+    """Converts an unsigned 64 bit varint value to signed int64."""
+    if value >= 1 << 63:
+        value -= 1 << 64
+    return value
+
+
+def _iter_fields(buf, start, end):
+    """
+    Iterates the fields of a message stored in buf[start:end].
+
+    Yields:
+        Tuple, (field_number, wire_type, value). For length delimited fields the value is the (offset, size) of the
+        payload, for the other wire types it is the decoded integer.
+    """
+    pos = start
+    while pos < end:
+        key, pos = _read_varint(buf, pos)
+        field_number = key >> 3
+        wire_type = key & 0x7
+        if wire_type == _WIRE_VARINT:
+            value, pos = _read_varint(buf, pos)
+        elif wire_type == _WIRE_LENGTH_DELIMITED:
+            size, pos = _read_varint(buf, pos)
+            value = (pos, size)
+            pos += size
+        elif wire_type == _WIRE_FIXED64:
+            value = int.from_bytes(buf[pos:pos + 8], "little")
+            pos += 8
+        elif wire_type == _WIRE_FIXED32:
+            value = int.from_bytes(buf[pos:pos + 4], "little")
+            pos += 4
+        else:
+            raise ValueError("Unsupported protobuf wire type {} at position {}.".format(wire_type, pos))
+        if pos > end:
+            raise ValueError("Protobuf field {} exceeds the message boundary.".format(field_number))
+        yield field_number, wire_type, value
+
+
+def _parse_tensor(buf, start, end):
+    """Parses the `TensorProto` stored in buf[start:end] without copying its content."""
+    dims = []
+    tensor_type = None
+    content_offset, content_size = start, 0
+    for field_number, wire_type, value in _iter_fields(buf, start, end):
+        if field_number == _TENSOR_DIMS_FIELD:
+            if wire_type == _WIRE_LENGTH_DELIMITED:
+                # packed encoding
+                pos, packed_end = value[0], value[0] + value[1]
+                while pos < packed_end:
+                    dim, pos = _read_varint(buf, pos)
+                    dims.append(_to_int64(dim))
+            else:
+                dims.append(_to_int64(value))
+        elif field_number == _TENSOR_TYPE_FIELD:
+            tensor_type = bytes(buf[value[0]:value[0] + value[1]]).decode("utf-8")
+        elif field_number == _TENSOR_CONTENT_FIELD:
+            content_offset, content_size = value
+    if tensor_type is None:
+        raise ValueError("The tensor at position {} has no tensor_type.".format(start))
+    return _TensorRecord(dims, tensor_type, content_offset, content_size)
+
+
+def _iter_values(buf):
+    """
+    Iterates the `Value` records of a checkpoint or print buffer one by one.
+
+    Yields:
+        Tuple, (name, tensor). `name` is the tag of a checkpoint value or the desc of a print value, None if the
+        value has no string field. `tensor` is a `_TensorRecord`, None if the value has no tensor.
+    """
+    for field_number, wire_type, value in _iter_fields(buf, 0, len(buf)):
+        if field_number != _VALUE_FIELD or wire_type != _WIRE_LENGTH_DELIMITED:
+            continue
+        name = None
+        tensor = None
+        value_start, value_size = value
+        for sub_field, sub_wire_type, sub_value in _iter_fields(buf, value_start, value_start + value_size):
+            if sub_wire_type != _WIRE_LENGTH_DELIMITED:
+                continue
+            if sub_field == _VALUE_STR_FIELD:
+                name = bytes(buf[sub_value[0]:sub_value[0] + sub_value[1]]).decode("utf-8")
+            elif sub_field == _VALUE_TENSOR_FIELD:
+                tensor = _parse_tensor(buf, sub_value[0], sub_value[0] + sub_value[1])
+        yield name, tensor
+
+
+def _mmap_file(file_name):
+    """Maps a file read-only. The mapping is released once the returned object and all its views are freed."""
+    with open(file_name, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
@@ -18,12 +18,11 @@ import os
 import stat
 import time
 
-import threading
 import mindspore.context as context
 from mindspore import log as logger
 from mindspore._checkparam import check_bool, check_int_non_negative
 from mindspore.train._utils import _make_directory
-from mindspore.train.serialization import _exec_save_checkpoint, _save_graph
+from mindspore.train.serialization import _exec_save_checkpoint, _save_graph, _wait_async_save, LAYOUT_SUFFIX
 from ._callback import Callback, set_cur_net
 
 
@@ -86,6 +85,7 @@ class CheckpointConfig:
             Can't be used with keep_checkpoint_max at the same time.
         integrated_save (bool): Whether to intergrated save in automatic model parallel scene. Default: True.
             Integrated save function is only supported in automatic parallel scene, not supported in manual parallel.
+            Otherwise each device saves its own slices with their layouts, see `merge_sliced_checkpoints`.
         async_save (bool): Whether asynchronous execute save checkpoint into file. Default: False
 
     Raises:
@@ -245,11 +245,7 @@ class ModelCheckpoint(Callback):
         _to_save_last_ckpt = True
         self._save_ckpt(cb_params, _to_save_last_ckpt)
 
-        thread_list = threading.enumerate()
-        if len(thread_list) > 1:
-            for thread in thread_list:
-                if thread.getName() == "asyn_save_ckpt":
-                    thread.join()
+        _wait_async_save()
 
         from mindspore.parallel._cell_wrapper import destroy_allgather_cell
         destroy_allgather_cell()
@@ -348,6 +344,8 @@ class CheckpointManager:
             os.chmod(file_name, stat.S_IWRITE)
             os.remove(file_name)
             self._ckpoint_filelist.remove(file_name)
+            if os.path.exists(file_name + LAYOUT_SUFFIX):
+                os.remove(file_name + LAYOUT_SUFFIX)
         except OSError:
             logger.warning("OSError, failed to remove the older ckpt file %s.", file_name)
         except ValueError:
@@ -46,16 +46,16 @@ class LossMonitor(Callback):
         cb_params = run_context.original_args()
         loss = cb_params.net_outputs
 
-        if isinstance(loss, (tuple, list)):
-            if isinstance(loss[0], Tensor) and isinstance(loss[0].asnumpy(), np.ndarray):
-                loss = loss[0]
+        if isinstance(loss, (tuple, list)) and loss and isinstance(loss[0], Tensor):
+            loss = loss[0]
 
-        if isinstance(loss, Tensor) and isinstance(loss.asnumpy(), np.ndarray):
+        if isinstance(loss, Tensor):
             loss = np.mean(loss.asnumpy())
 
         cur_step_in_epoch = (cb_params.cur_step_num - 1) % cb_params.batch_num + 1
 
-        if isinstance(loss, float) and (np.isnan(loss) or np.isinf(loss)):
+        # the mean of a float32 loss is a numpy float32, which is not a python float
+        if isinstance(loss, (float, np.floating)) and (np.isnan(loss) or np.isinf(loss)):
             raise ValueError("epoch: {} step: {}. Invalid loss, terminating training.".format(
                 cb_params.cur_epoch_num, cur_step_in_epoch))
         if self._per_print_times != 0 and cb_params.cur_step_num % self._per_print_times == 0:
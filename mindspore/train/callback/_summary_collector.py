@@ -121,6 +121,9 @@ class SummaryCollector(Callback):
         max_file_size (Optional[int]): The maximum size in bytes each file can be written to the disk.
             Default: None, which means no limit. For example, to write not larger than 4GB,
             specify `max_file_size=4 * 1024**3`.
+        histogram_max_sample (Optional[int]): The maximum number of values used to count the histogram buckets of
+            a parameter. For a larger parameter, the buckets are counted on a uniform random sample of this size,
+            which keeps collecting histograms of a huge model cheap. Default: None, count all values.
 
     Raises:
         ValueError: If the parameter value is not expected.
@@ -165,7 +168,8 @@ class SummaryCollector(Callback):
                  keep_default_action=True,
                  custom_lineage_data=None,
                  collect_tensor_freq=None,
-                 max_file_size=None):
+                 max_file_size=None,
+                 histogram_max_sample=None):
         super(SummaryCollector, self).__init__()
 
         self._summary_dir = self._process_summary_dir(summary_dir)
@@ -180,6 +184,9 @@ class SummaryCollector(Callback):
         self._check_positive('max_file_size', max_file_size, allow_none=True)
         self._max_file_size = max_file_size
 
+        self._check_positive('histogram_max_sample', histogram_max_sample, allow_none=True)
+        self._histogram_max_sample = histogram_max_sample
+
         self._check_action(keep_default_action)
 
         self._collect_specified_data = self._process_specified_data(collect_specified_data, keep_default_action)
@@ -197,7 +204,8 @@ class SummaryCollector(Callback):
         self._dataset_sink_mode = True
 
     def __enter__(self):
-        self._record = SummaryRecord(log_dir=self._summary_dir, max_file_size=self._max_file_size)
+        self._record = SummaryRecord(log_dir=self._summary_dir, max_file_size=self._max_file_size,
+                                     histogram_max_sample=self._histogram_max_sample)
         self._first_step, self._dataset_sink_mode = True, True
         return self
 
@@ -19,8 +19,11 @@ User can use quantization aware to train a model. MindSpore supports quantizatio
 which models quantization errors in both the forward and backward passes using fake-quantization
 ops. Note that the entire computation is carried out in floating point. At the end of quantization
 aware training, MindSpore provides conversion functions to convert the trained model into lower precision.
+
+A trained float model can also be quantized without training, its quantization ranges are calibrated on a
+calibration dataset by post training quantization.
 """
 
-from .quant import convert_quant_network
+from .quant import convert_quant_network, post_training_quant
 
-__all__ = ["convert_quant_network"]
+__all__ = ["convert_quant_network", "post_training_quant"]
@@ -0,0 +1,241 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""post training calibration of the quantization ranges."""
+
+import numpy as np
+import mindspore.context as context
+
+from ... import nn
+from ..._checkparam import ParamValidator as validator
+from ..._checkparam import Rel
+from ...common import Tensor
+from ...nn.layer import quant
+from . import quant_utils
+
+_METHODS = ("minmax", "percentile", "kl")
+
+
+class HistogramObserver:
+    """
+    Observer of the values of an activation.
+
+    It keeps the min and the max of the values, and the histogram of their absolute values in `num_bins` bins over
+    [0, bound]. When a value exceeds the bound, the bound is doubled and the bins are merged by pairs, so the
+    histogram is accumulated with one bincount per update and never rebuilt from the values.
+
+    Args:
+        num_bins (int): The number of bins of the histogram, even. Default: 2048.
+    """
+
+    def __init__(self, num_bins=2048):
+        self.num_bins = validator.check_integer("num_bins", num_bins, 2, Rel.GE)
+        if num_bins % 2:
+            raise ValueError("num_bins should be even, but got {}.".format(num_bins))
+        self.min = np.inf
+        self.max = -np.inf
+        self.bound = 0.0
+        self.hist = np.zeros(num_bins, np.int64)
+
+    def update(self, data):
+        """Add the values of a numpy.ndarray."""
+        data = np.asarray(data, np.float32).reshape(-1)
+        if data.size == 0:
+            return
+        self.min = min(self.min, float(data.min()))
+        self.max = max(self.max, float(data.max()))
+        abs_max = max(-self.min, self.max)
+        if self.bound == 0.0:
+            self.bound = abs_max if abs_max > 0 else 1.0
+        while abs_max > self.bound:
+            half = self.hist.reshape(-1, 2).sum(axis=1)
+            self.hist = np.concatenate((half, np.zeros_like(half)))
+            self.bound *= 2
+        bins = np.minimum((np.abs(data) * (self.num_bins / self.bound)).astype(np.int64), self.num_bins - 1)
+        self.hist += np.bincount(bins, minlength=self.num_bins)
+
+    def threshold(self, method, percentile=99.99, num_quant_bins=128):
+        """
+        Clipping threshold of the absolute values.
+
+        Args:
+            method (str): 'percentile' for the `percentile` percentile of the absolute values, 'kl' for the threshold
+                of the least KL divergence between the histogram and its quantization to `num_quant_bins` bins.
+            percentile (float): The percentile of 'percentile'. Default: 99.99.
+            num_quant_bins (int): The number of quantization bins of 'kl'. Default: 128.
+
+        Returns:
+            float, the threshold.
+        """
+        if method == "percentile":
+            cumsum = np.cumsum(self.hist)
+            end = int(np.searchsorted(cumsum, cumsum[-1] * percentile / 100.0)) + 1
+        else:
+            end = _kl_end(self.hist, num_quant_bins)
+        return self.bound * min(end, self.num_bins) / self.num_bins
+
+    def range(self, method="minmax", percentile=99.99, num_quant_bins=128):
+        """
+        Quantization range of the observed values.
+
+        Returns:
+            tuple, (min, max), the observed ones for 'minmax', else clipped to [-threshold, threshold].
+        """
+        if self.min > self.max:
+            raise RuntimeError("No value has been observed.")
+        if method == "minmax":
+            return self.min, self.max
+        threshold = self.threshold(method, percentile, num_quant_bins)
+        return max(self.min, -threshold), min(self.max, threshold)
+
+
+def _kl_end(hist, num_quant_bins):
+    """
+    End bin of the clipping of a histogram of absolute values with the least KL divergence, as in the entropy
+    calibration of TensorRT.
+    """
+    hist = hist.astype(np.float64)
+    num_bins = hist.size
+    if num_bins <= num_quant_bins:
+        return num_bins
+    outliers = np.concatenate((np.cumsum(hist[::-1])[::-1], [0.0]))
+    best_end = num_bins
+    best_kl = np.inf
+    for end in range(num_quant_bins, num_bins + 1):
+        reference = hist[:end].copy()
+        reference[-1] += outliers[end]
+        # merge the bins into num_quant_bins bins, and spread each merged bin over its nonzero bins
+        groups = np.arange(end) * num_quant_bins // end
+        nonzero = hist[:end] > 0
+        sums = np.bincount(groups, weights=hist[:end], minlength=num_quant_bins)
+        counts = np.bincount(groups, weights=nonzero, minlength=num_quant_bins)
+        candidate = np.where(nonzero, sums[groups] / np.maximum(counts[groups], 1), 0.0)
+        valid = reference > 0
+        if not (candidate[valid] > 0).all():
+            continue
+        p = reference[valid] / reference.sum()
+        q = candidate[valid] / candidate.sum()
+        kl = np.sum(p * np.log(p / q))
+        if kl < best_kl:
+            best_kl = kl
+            best_end = end
+    return best_end
+
+
+class _ObserveActivation(nn.Cell):
+    """replace a FakeQuantWithMinMax of an activation in calibration, it records its input and returns it as it is"""
+
+    def __init__(self, observer):
+        super(_ObserveActivation, self).__init__(auto_prefix=False)
+        self.observer = observer
+
+    def construct(self, x):
+        self.observer.update(x.asnumpy())
+        return x
+
+
+def _fake_quant_cells(network):
+    """(parent cell, child name, FakeQuantWithMinMax) of the fake quant cells of a network"""
+    fake_quants = []
+    for _, cell in network.cells_and_names():
+        for name, child in cell.name_cells().items():
+            if isinstance(child, quant.FakeQuantWithMinMax):
+                fake_quants.append((cell, name, child))
+    return fake_quants
+
+
+def _set_range(fake_quant, min_value, max_value):
+    shape = fake_quant.minq.data.shape
+    fake_quant.minq.set_parameter_data(Tensor(np.reshape(min_value, shape).astype(np.float32)))
+    fake_quant.maxq.set_parameter_data(Tensor(np.reshape(max_value, shape).astype(np.float32)))
+
+
+def _calibrate_weight(cell_core):
+    """set the range of the weight fake quant of a quant conv or dense to the range of its weight"""
+    weight = cell_core.weight.data.asnumpy()
+    if isinstance(cell_core, quant.Conv2dBnFoldQuant):
+        # the weight is quantized after the batchnorm is folded into it
+        weight, _ = quant_utils.fold_batchnorm(weight, cell_core)
+    fake_quant = cell_core.fake_quant_weight
+    if fake_quant.per_channel:
+        axes = tuple(axis for axis in range(weight.ndim) if axis != fake_quant.channel_axis)
+        _set_range(fake_quant, weight.min(axis=axes), weight.max(axis=axes))
+    else:
+        _set_range(fake_quant, weight.min(), weight.max())
+
+
+def calibrate(network, dataset, method="minmax", percentile=99.99, num_bins=2048, num_batches=None):
+    r"""
+    Calibrate the quantization ranges of a network made by `convert_quant_network`, without training.
+
+    The ranges of the weights are set to the ranges of the weights, folded with their batchnorm for
+    `Conv2dBnFoldQuant`. The ranges of the activations are computed from the activations of the float network on
+    the calibration dataset, which runs in PyNative mode with the fake quantization of the activations disabled.
+
+    Args:
+        network (Cell): Network made by `convert_quant_network`, with the weights of the trained float network.
+        dataset (Dataset): Calibration dataset, its columns are the inputs of the network.
+        method (str): 'minmax' for the min and max of the activations, 'percentile' to clip the activations at the
+            `percentile` percentile of their absolute values, 'kl' to clip them at the threshold of the least KL
+            divergence. Default: 'minmax'.
+        percentile (float): The percentile of 'percentile'. Default: 99.99.
+        num_bins (int): The number of bins of the histograms of the activations. Default: 2048.
+        num_batches (int): The number of batches of the dataset to run, None for all of them. Default: None.
+
+    Returns:
+        dict, the (min, max) calibrated for each activation fake quant cell, by the name of the cell.
+    """
+    network = validator.check_isinstance('network', network, (nn.Cell,))
+    validator.check_string('method', method, _METHODS)
+    validator.check_number_range('percentile', percentile, 0, 100, Rel.INC_RIGHT)
+    if num_batches is not None:
+        validator.check_integer('num_batches', num_batches, 0, Rel.GT)
+
+    network.init_parameters_data()
+    network.set_train(False)
+    for _, cell in network.cells_and_names():
+        if isinstance(cell, (quant.Conv2dBnFoldQuant, quant.Conv2dBnWithoutFoldQuant, quant.Conv2dQuant,
+                             quant.DenseQuant)):
+            _calibrate_weight(cell)
+
+    activations = []
+    names = {id(cell): name for name, cell in network.cells_and_names()}
+    for parent, name, fake_quant in _fake_quant_cells(network):
+        if name == "fake_quant_weight":
+            continue
+        if fake_quant.per_channel:
+            raise ValueError("Post training quantization only supports per layer quantization of activations.")
+        activations.append((parent, name, fake_quant, HistogramObserver(num_bins)))
+
+    mode = context.get_context("mode")
+    context.set_context(mode=context.PYNATIVE_MODE)
+    try:
+        for parent, name, _, observer in activations:
+            parent.insert_child_to_cell(name, _ObserveActivation(observer))
+        for i, data in enumerate(dataset.create_tuple_iterator()):
+            if num_batches is not None and i >= num_batches:
+                break
+            network(*[Tensor(column) for column in data])
+    finally:
+        for parent, name, fake_quant, _ in activations:
+            parent.insert_child_to_cell(name, fake_quant)
+        context.set_context(mode=mode)
+
+    ranges = {}
+    for parent, name, fake_quant, observer in activations:
+        num_quant_bins = 2 ** (fake_quant.num_bits - 1)
+        min_value, max_value = observer.range(method, percentile, num_quant_bins)
+        _set_range(fake_quant, min_value, max_value)
+        ranges[names[id(parent)] + "." + name if names[id(parent)] else name] = (min_value, max_value)
+    return ranges
@@ -32,6 +32,7 @@ from ...ops import functional as F
 from ...ops import operations as P
 from ...ops.operations import _inner_ops as inner
 from ...train import serialization
+from . import calibration
 from . import quant_utils
 
 _ACTIVATION_MAP = {nn.ReLU: quant.ActQuant,
@@ -531,3 +532,63 @@ def convert_quant_network(network,
                                 symmetric=symmetric,
                                 narrow_range=narrow_range)
     return net.run()
+
+
+def post_training_quant(network,
+                        calibration_dataset,
+                        *inputs,
+                        method="minmax",
+                        percentile=99.99,
+                        num_batches=None,
+                        mean=127.5,
+                        std_dev=127.5,
+                        per_channel=(False, False),
+                        symmetric=(False, False),
+                        narrow_range=(False, False)):
+    r"""
+    Create the quantization infer network of a trained float network, without quantization aware training.
+
+    The network is converted by `convert_quant_network` with the batchnorm folded, the quantization ranges are
+    calibrated on the calibration dataset by `calibration.calibrate`, and the infer network is made by
+    `ExportToQuantInferNetwork`, like `export` does for a quantization aware trained network.
+
+    Args:
+        network (Cell): Trained float network, made of `Conv2dBnAct` and `DenseBnAct` cells.
+        calibration_dataset (Dataset): Calibration dataset, its columns are the inputs of the network.
+        inputs (Tensor): Inputs of the network, to compile it.
+        method (str): Calibration of the activation ranges, 'minmax', 'percentile' or 'kl'. Default: 'minmax'.
+        percentile (float): The percentile of the absolute values of the activations for 'percentile'.
+            Default: 99.99.
+        num_batches (int): The number of batches of the calibration dataset to run, None for all of them.
+            Default: None.
+        mean (int): Input data mean. Default: 127.5.
+        std_dev (int, float): Input data variance. Default: 127.5.
+        per_channel (bool, list or tuple): Quantization granularity of weights and activations, see
+            `convert_quant_network`. Activations are only quantized per layer. Default: (False, False)
+        symmetric (bool, list or tuple): Quantization algorithm of weights and activations, see
+            `convert_quant_network`. Default: (False, False)
+        narrow_range (bool, list or tuple): Quantization range of weights and activations, see
+            `convert_quant_network`. Default: (False, False)
+
+    Returns:
+        Cell, Infer network, which can be exported by `serialization.export`.
+
+    Examples:
+        >>> network = LeNet5()
+        >>> load_param_into_net(network, load_checkpoint("lenet.ckpt"))
+        >>> deploy_net = post_training_quant(network, calibration_dataset, img, method="kl", num_batches=32)
+        >>> serialization.export(deploy_net, img, file_name="lenet_quant.pb", file_format="GEIR")
+    """
+    mean = validator.check_type("mean", mean, (int, float))
+    std_dev = validator.check_type("std_dev", std_dev, (int, float))
+
+    network = convert_quant_network(network,
+                                    bn_fold=True,
+                                    per_channel=per_channel,
+                                    symmetric=symmetric,
+                                    narrow_range=narrow_range)
+    calibration.calibrate(network, calibration_dataset, method=method, percentile=percentile,
+                          num_batches=num_batches)
+    network.set_train(False)
+    exporter = ExportToQuantInferNetwork(network, mean, std_dev, *inputs)
+    return exporter.run()
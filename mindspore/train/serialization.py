@@ -14,23 +14,25 @@
 # ============================================================================
 """Model and parameters serialization."""
 import os
+import json
 import stat
-import math
-from threading import Thread, Lock
+from threading import Lock
 import numpy as np
 
 import mindspore.nn as nn
 from mindspore import log as logger
 from mindspore.train.checkpoint_pb2 import Checkpoint
-from mindspore.train.print_pb2 import Print
 from mindspore.common.tensor import Tensor
 from mindspore.common.initializer import initializer
 from mindspore.common.parameter import Parameter
 from mindspore.common.api import _executor
 from mindspore.common import dtype as mstype
 from mindspore._checkparam import check_input_data
+from mindspore.train._pb_reader import _iter_values, _mmap_file
+from mindspore.train._checkpoint_writer import _write_param, _AsyncCheckpointWriter
 
-__all__ = ["save_checkpoint", "load_checkpoint", "load_param_into_net", "export", "parse_print"]
+__all__ = ["save_checkpoint", "load_checkpoint", "load_param_into_net", "export", "parse_print", "iter_print",
+           "merge_sliced_checkpoints"]
 
 tensor_to_ms_type = {"Int8": mstype.int8, "Uint8": mstype.uint8, "Int16": mstype.int16, "Uint16": mstype.uint16,
                      "Int32": mstype.int32, "Uint32": mstype.uint32, "Int64": mstype.int64, "Uint64": mstype.uint64,
@@ -43,6 +45,8 @@ tensor_to_np_type = {"Int8": np.int8, "Uint8": np.uint8, "Int16": np.int16, "Uin
 
 _ckpt_mutex = Lock()
 SLICE_SIZE = 512 * 1024 * 1024
+# suffix of the layout manifest saved next to a checkpoint of the local slices
+LAYOUT_SUFFIX = ".layout"
 
 
 def _special_process_par(par, new_par):
@@ -110,39 +114,37 @@ def _exec_save(ckpt_file_name, data_list):
 
     try:
         with _ckpt_mutex:
-            if os.path.exists(ckpt_file_name):
-                os.remove(ckpt_file_name)
-            with open(ckpt_file_name, "ab") as f:
+            # write to a temporary file first, so that no partial checkpoint is visible under the final name.
+            tmp_file_name = ckpt_file_name + ".tmp"
+            if os.path.exists(tmp_file_name):
+                os.remove(tmp_file_name)
+            with open(tmp_file_name, "wb") as f:
                 for name, value in data_list.items():
-                    data_size = value[2].nbytes
-                    if data_size > SLICE_SIZE:
-                        slice_count = math.ceil(data_size / SLICE_SIZE)
-                        param_slice_list = np.array_split(value[2], slice_count)
-                    else:
-                        param_slice_list = [value[2]]
-
-                    for param_slice in param_slice_list:
-                        checkpoint_list = Checkpoint()
-                        param_value = checkpoint_list.value.add()
-                        param_value.tag = name
-                        param_tensor = param_value.tensor
-                        param_tensor.dims.extend(value[0])
-                        param_tensor.tensor_type = value[1]
-                        param_tensor.tensor_content = param_slice.tostring()
-
-                        f.write(checkpoint_list.SerializeToString())
-
-        os.chmod(ckpt_file_name, stat.S_IRUSR)
+                    _write_param(f, name, value[0], value[1], value[2], SLICE_SIZE)
+            os.chmod(tmp_file_name, stat.S_IRUSR)
+            os.replace(tmp_file_name, ckpt_file_name)
 
     except BaseException as e:
         logger.error("Failed to save the checkpoint file %s.", ckpt_file_name)
         raise RuntimeError(e.__str__())
 
 
+_async_writer = _AsyncCheckpointWriter(_exec_save)
+
+
+def _wait_async_save():
+    """Waits until all the checkpoints saved with `async_save` are written into files."""
+    _async_writer.wait()
+
+
 def save_checkpoint(parameter_list, ckpt_file_name, async_save=False):
     """
     Saves checkpoint info to a specified file.
 
+    Note:
+        With `async_save`, the parameters are copied and the file is written by a single background thread. At most
+        two saves wait to be written at the same time, a further save blocks until one of them is finished.
+
     Args:
         parameter_list (list): Parameters list, each element is a dict
                                like {"name":xx, "type":xx, "shape":xx, "data":xx}.
@@ -155,39 +157,116 @@ def save_checkpoint(parameter_list, ckpt_file_name, async_save=False):
     logger.info("Execute save checkpoint process.")
 
     data_list = {}
-    with _ckpt_mutex:
-        for param in parameter_list:
-            key = param["name"]
-            data_list[key] = []
-            if isinstance(param["data"], Parameter):
-                param["data"].init_data()
-            dims = []
-            if param['data'].shape == ():
-                dims.append(0)
-            else:
-                for dim in param['data'].shape:
-                    dims.append(dim)
-            data_list[key].append(dims)
-            tensor_type = str(param["data"].dtype)
-            data_list[key].append(tensor_type)
-            data = param["data"].asnumpy().reshape(-1)
-            data_list[key].append(data)
+    for param in parameter_list:
+        key = param["name"]
+        data_list[key] = []
+        if isinstance(param["data"], Parameter):
+            param["data"].init_data()
+        dims = []
+        if param['data'].shape == ():
+            dims.append(0)
+        else:
+            for dim in param['data'].shape:
+                dims.append(dim)
+        data_list[key].append(dims)
+        tensor_type = str(param["data"].dtype)
+        data_list[key].append(tensor_type)
+        data = param["data"].asnumpy().reshape(-1)
+        if async_save:
+            # asnumpy views the host buffer of the tensor, which the next step may overwrite before it is written
+            data = data.copy()
+        data_list[key].append(data)
 
     if async_save:
-        thr = Thread(target=_exec_save, args=(ckpt_file_name, data_list), name="asyn_save_ckpt")
-        thr.start()
+        _async_writer.submit(ckpt_file_name, data_list)
     else:
         _exec_save(ckpt_file_name, data_list)
     logger.info("Save checkpoint process finish.")
 
 
-def load_checkpoint(ckpt_file_name, net=None):
+def _check_filter_prefix(filter_prefix):
+    """Checks filter_prefix and converts it into a tuple of str."""
+    if filter_prefix is None:
+        return None
+    if isinstance(filter_prefix, str):
+        filter_prefix = (filter_prefix,)
+    if not isinstance(filter_prefix, (list, tuple)) or not filter_prefix:
+        raise TypeError("The filter_prefix should be str or a non-empty list/tuple of str, but got {}."
+                        .format(type(filter_prefix)))
+    for prefix in filter_prefix:
+        if not isinstance(prefix, str):
+            raise TypeError("The element of filter_prefix should be str, but got {}.".format(type(prefix)))
+    return tuple(filter_prefix)
+
+
+def _build_parameter(name, data_type, dims, param_data):
+    """Builds a Parameter from the flattened data of a checkpoint tensor."""
+    ms_type = tensor_to_ms_type[data_type]
+    if dims == [0]:
+        if 'Float' in data_type:
+            param_data = float(param_data[0])
+        elif 'Int' in data_type:
+            param_data = int(param_data[0])
+        return Parameter(Tensor(param_data, ms_type), name=name)
+    if dims == [1]:
+        return Parameter(Tensor(param_data, ms_type), name=name)
+    param_value = param_data.reshape(list(dims))
+    return Parameter(Tensor(param_value, ms_type), name=name)
+
+
+def _load_checkpoint_by_mmap(ckpt_file_name, filter_prefix):
+    """
+    Loads checkpoint by walking the records of a memory mapped file.
+
+    Only the records matching `filter_prefix` are touched. A parameter stored in one slice is viewed in place, a
+    parameter split into several slices is copied once into a preallocated array.
+    """
+    buf = _mmap_file(ckpt_file_name)
+    records = []
+    for tag, tensor in _iter_values(buf):
+        if tag is None:
+            raise ValueError("The checkpoint value has no tag.")
+        if tensor is None:
+            raise ValueError("The checkpoint value `{}` has no tensor.".format(tag))
+        if filter_prefix is not None and not tag.startswith(filter_prefix):
+            continue
+        if records and records[-1][0] == tag:
+            records[-1][1].append(tensor)
+        else:
+            records.append((tag, [tensor]))
+
+    parameter_dict = {}
+    for tag, slices in records:
+        data_type = slices[0].tensor_type
+        np_type = tensor_to_np_type[data_type]
+        if len(slices) == 1:
+            param_data = np.frombuffer(buf, np_type, slices[0].content_size // np.dtype(np_type).itemsize,
+                                       slices[0].content_offset)
+        else:
+            total_size = sum(item.content_size for item in slices)
+            param_data = np.empty(total_size // np.dtype(np_type).itemsize, np_type)
+            raw_data = param_data.view(np.uint8)
+            offset = 0
+            for item in slices:
+                raw_data[offset:offset + item.content_size] = \
+                    np.frombuffer(buf, np.uint8, item.content_size, item.content_offset)
+                offset += item.content_size
+        parameter_dict[tag] = _build_parameter(tag, data_type, slices[-1].dims, param_data)
+    return parameter_dict
+
+
+def load_checkpoint(ckpt_file_name, net=None, filter_prefix=None, mmap_load=False):
     """
     Loads checkpoint info from a specified file.
 
     Args:
         ckpt_file_name (str): Checkpoint file name.
         net (Cell): Cell network. Default: None
+        filter_prefix (Union[str, list[str], tuple[str]]): Only the parameters whose name starts with the
+            filter_prefix are loaded. Default: None, load all parameters.
+        mmap_load (bool): Whether to map the checkpoint file into memory and decode the parameters one by one,
+            instead of reading and parsing the whole file at once. It reduces the peak memory when loading a large
+            checkpoint. Default: False.
 
     Returns:
         Dict, key is parameter name, value is a Parameter.
@@ -207,7 +286,21 @@ def load_checkpoint(ckpt_file_name, net=None):
     if os.path.getsize(ckpt_file_name) == 0:
         raise ValueError("The checkpoint file may be empty, please make sure enter the correct file name.")
 
+    filter_prefix = _check_filter_prefix(filter_prefix)
     logger.info("Execute load checkpoint process.")
+
+    if mmap_load:
+        try:
+            parameter_dict = _load_checkpoint_by_mmap(ckpt_file_name, filter_prefix)
+            logger.info("Load checkpoint process finish.")
+        except BaseException as e:
+            logger.error("Failed to load the checkpoint file `%s`.", ckpt_file_name)
+            raise ValueError(e.__str__())
+
+        if net is not None:
+            load_param_into_net(net, parameter_dict)
+        return parameter_dict
+
     checkpoint_list = Checkpoint()
 
     try:
@@ -223,10 +316,12 @@ def load_checkpoint(ckpt_file_name, net=None):
         element_id = 0
         param_data_list = []
         for element in checkpoint_list.value:
+            if filter_prefix is not None and not element.tag.startswith(filter_prefix):
+                element_id += 1
+                continue
             data = element.tensor.tensor_content
             data_type = element.tensor.tensor_type
             np_type = tensor_to_np_type[data_type]
-            ms_type = tensor_to_ms_type[data_type]
             element_data = np.frombuffer(data, np_type)
             param_data_list.append(element_data)
             if (element_id == len(checkpoint_list.value) - 1) or \
@@ -234,21 +329,7 @@ def load_checkpoint(ckpt_file_name, net=None):
                 param_data = np.concatenate((param_data_list), axis=0)
                 param_data_list.clear()
                 dims = element.tensor.dims
-
-                if dims == [0]:
-                    if 'Float' in data_type:
-                        param_data = float(param_data[0])
-                    elif 'Int' in data_type:
-                        param_data = int(param_data[0])
-                    parameter_dict[element.tag] = Parameter(Tensor(param_data, ms_type), name=element.tag)
-                elif dims == [1]:
-                    parameter_dict[element.tag] = Parameter(Tensor(param_data, ms_type), name=element.tag)
-                else:
-                    param_dim = []
-                    for dim in dims:
-                        param_dim.append(dim)
-                    param_value = param_data.reshape(param_dim)
-                    parameter_dict[element.tag] = Parameter(Tensor(param_value, ms_type), name=element.tag)
+                parameter_dict[element.tag] = _build_parameter(element.tag, data_type, dims, param_data)
 
             element_id += 1
 
@@ -355,6 +436,10 @@ def _exec_save_checkpoint(train_network, ckpt_file_name, integrated_save=True, a
     """
     Saves checkpoint for 'ms' backend.
 
+    Without `integrated_save`, every device saves its own slices, and the layouts of the sliced parameters are saved
+    in `ckpt_file_name + LAYOUT_SUFFIX`, so the checkpoints of all the devices can be merged offline with
+    `merge_sliced_checkpoints` instead of gathering the slices while training.
+
     Args:
         train_network (Network): The train network for training.
         ckpt_file_name (str): The name of checkpoint file.
@@ -381,9 +466,76 @@ def _exec_save_checkpoint(train_network, ckpt_file_name, integrated_save=True, a
         each_param["data"] = param_data
         param_list.append(each_param)
 
+    if not integrated_save and train_network.parameter_layout_dict:
+        _save_layout(train_network.parameter_layout_dict, param_dict, ckpt_file_name)
     save_checkpoint(param_list, ckpt_file_name, async_save)
 
 
+def _save_layout(parameter_layout_dict, param_names, ckpt_file_name):
+    """Saves the rank of the local device and the layouts of the parameters in param_names next to a checkpoint."""
+    from mindspore.communication.management import get_rank
+    layouts = {name: [[int(dim) for dim in item] for item in layout]
+               for name, layout in parameter_layout_dict.items() if name in param_names}
+    layout_file_name = ckpt_file_name + LAYOUT_SUFFIX
+    tmp_file_name = layout_file_name + ".tmp"
+    with open(tmp_file_name, "w") as f:
+        json.dump({"rank": get_rank(), "layouts": layouts}, f)
+    os.replace(tmp_file_name, layout_file_name)
+
+
+def merge_sliced_checkpoints(ckpt_file_names, merged_file_name):
+    """
+    Merges the checkpoints saved by all the devices with `integrated_save=False` into one checkpoint.
+
+    Each checkpoint needs its layout manifest, `ckpt_file_name + ".layout"`, saved with it. The sliced parameters are
+    rebuilt from the slices of all the ranks, the other parameters are taken from the checkpoint of rank 0.
+
+    Args:
+        ckpt_file_names (list[str]): The checkpoints of all the devices, in any order.
+        merged_file_name (str): The name of the merged checkpoint file.
+
+    Raises:
+        ValueError: If the layout manifest of a checkpoint is missing, or the checkpoints of some ranks are missing.
+
+    Examples:
+        >>> ckpt_file_names = ["./rank_{}/ck_prefix-10_32.ckpt".format(rank) for rank in range(8)]
+        >>> merge_sliced_checkpoints(ckpt_file_names, "./merged.ckpt")
+    """
+    from mindspore.parallel._tensor import _merge_slices, _merge_slices_with_weight
+    rank_files = {}
+    layouts = {}
+    for ckpt_file_name in ckpt_file_names:
+        layout_file_name = ckpt_file_name + LAYOUT_SUFFIX
+        if not os.path.isfile(layout_file_name):
+            raise ValueError("The layout file {} of the checkpoint is not found.".format(layout_file_name))
+        with open(layout_file_name, "r") as f:
+            manifest = json.load(f)
+        rank_files[manifest["rank"]] = ckpt_file_name
+        layouts = manifest["layouts"]
+    if 0 not in rank_files:
+        raise ValueError("The checkpoint of rank 0 is missing.")
+
+    param_dicts = {rank: load_checkpoint(file_name, mmap_load=True) for rank, file_name in rank_files.items()}
+    param_list = []
+    for name, param in param_dicts[0].items():
+        layout = layouts.get(name)
+        param_data = param.data
+        if layout is not None and len(layout) >= 2 and any(dim != -1 for dim in layout[1]):
+            dev_mat, tensor_map = layout[0], layout[1]
+            device_count = int(np.prod(dev_mat))
+            missing = [rank for rank in range(device_count) if rank not in param_dicts]
+            if missing:
+                raise ValueError("The checkpoints of ranks {} are missing to merge {}.".format(missing, name))
+            np_data = np.concatenate([param_dicts[rank][name].data.asnumpy() for rank in range(device_count)])
+            if len(layout) > 3 and layout[3][0]:
+                np_data = _merge_slices_with_weight(np_data, dev_mat, layout[3])
+            else:
+                np_data = _merge_slices(np_data, dev_mat, tensor_map)
+            param_data = Tensor(np_data)
+        param_list.append({"name": name, "data": param_data})
+    save_checkpoint(param_list, merged_file_name)
+
+
 def _get_merged_param_data(net, param_name, param_data):
     """
     Gets the merged data(tensor) from tensor slice, by device arrangement and tensor map.
@@ -497,68 +649,135 @@ def export(net, *inputs, file_name, file_format='GEIR'):
         net.set_train(mode=True)
 
 
-def parse_print(print_file_name):
+def _iter_print_values(print_file_name, desc=None, steps=None):
     """
-    Loads Print data from a specified file.
+    Iterates the values of a print file, see `iter_print`.
+
+    Yields:
+        Tuple, (desc, step, value, tensor_type). The value of a tensor is a flat numpy.ndarray viewing the file,
+        its shape is (dims of the tensor) and `tensor_type` is its type name, None for a string.
+    """
+    print_file_path = os.path.realpath(print_file_name)
+    if os.path.getsize(print_file_path) == 0:
+        raise ValueError("The print file may be empty, please make sure enter the correct file name.")
+    if isinstance(steps, int):
+        steps = (steps,)
+    if steps is not None and not isinstance(steps, range):
+        steps = set(steps)
+    desc_filter = desc
+    if desc is not None and not callable(desc):
+        def desc_filter(value_desc):
+            return value_desc == desc
+
+    buf = _mmap_file(print_file_path)
+    cur_desc = None
+    desc_steps = {}
+    for value_desc, tensor in _iter_values(buf):
+        if tensor is None and value_desc is None:
+            continue
+        if tensor is None:
+            cur_desc = value_desc
+            desc_steps[cur_desc] = desc_steps.get(cur_desc, -1) + 1
+        elif cur_desc is None:
+            # every tensor printed before the first string is a step of its own
+            desc_steps[None] = desc_steps.get(None, -1) + 1
+        step = desc_steps[cur_desc]
+        if desc_filter is not None and (cur_desc is None or not desc_filter(cur_desc)):
+            continue
+        if steps is not None and step not in steps:
+            continue
+        if tensor is None:
+            yield cur_desc, step, value_desc, None
+        else:
+            np_type = tensor_to_np_type[tensor.tensor_type]
+            value = np.frombuffer(buf, np_type, tensor.content_size // np.dtype(np_type).itemsize,
+                                  tensor.content_offset)
+            yield cur_desc, step, (value, tensor.dims), tensor.tensor_type
+
+
+def iter_print(print_file_name, desc=None, steps=None):
+    """
+    Iterates the Print data of a specified file one value at a time.
+
+    The file is memory mapped and decoded incrementally, the tensors are numpy arrays viewing the file instead of
+    copies, so large print files can be scanned without loading them into memory. A tensor is described by the last
+    string printed before it, and the step of a value is the number of times its description was printed before,
+    e.g. the tensors printed by `Print("loss:", loss)` in the n-th training step have the description "loss:" and
+    the step n - 1.
 
     Args:
         print_file_name (str): The file name of save print data.
+        desc (Union[str, Callable[[str], bool]]): Only iterate the values with this description, or whose
+            description the callable accepts. Default: None, all values.
+        steps (Union[int, range, list]): Only iterate the values of these steps. Default: None, all steps.
 
-    Returns:
-        List, element of list is Tensor.
+    Yields:
+        Tuple, (desc, step, value). `desc` is the description, None for a tensor printed before any string. `value`
+        is the str of a string, and the read-only numpy.ndarray of a tensor, 0-d for a scalar.
 
     Raises:
         ValueError: The print file may be empty, please make sure enter the correct file name.
+
+    Examples:
+        >>> for _, step, loss in iter_print("print.pb", desc="loss:", steps=range(1000, 2000)):
+        >>>     if isinstance(loss, np.ndarray) and not np.isfinite(loss).all():
+        >>>         print("invalid loss at step", step)
     """
-    print_file_path = os.path.realpath(print_file_name)
+    for value_desc, step, value, tensor_type in _iter_print_values(print_file_name, desc, steps):
+        if tensor_type is not None:
+            value, dims = value
+            value = value.reshape(dims)
+        yield value_desc, step, value
 
-    if os.path.getsize(print_file_path) == 0:
-        raise ValueError("The print file may be empty, please make sure enter the correct file name.")
 
-    logger.info("Execute load print process.")
-    print_list = Print()
+def parse_print(print_file_name):
+    """
+    Loads Print data from a specified file.
 
-    try:
-        with open(print_file_path, "rb") as f:
-            pb_content = f.read()
-        print_list.ParseFromString(pb_content)
-    except BaseException as e:
-        logger.error("Failed to read the print file %s, please check the correct of the file.", print_file_name)
-        raise ValueError(e.__str__())
+    Use `iter_print` to scan large print files.
 
-    tensor_list = []
+    Args:
+        print_file_name (str): The file name of save print data.
 
-    try:
-        for print_ in print_list.value:
-            # String type
-            if print_.HasField("desc"):
-                tensor_list.append(print_.desc)
-            elif print_.HasField("tensor"):
-                dims = print_.tensor.dims
-                data_type = print_.tensor.tensor_type
-                data = print_.tensor.tensor_content
-                np_type = tensor_to_np_type[data_type]
-                param_data = np.fromstring(data, np_type)
-                ms_type = tensor_to_ms_type[data_type]
-                param_dim = []
-                for dim in dims:
-                    param_dim.append(dim)
-                if param_dim:
-                    param_value = param_data.reshape(param_dim)
-                    tensor_list.append(Tensor(param_value, ms_type))
-                # Scale type
-                else:
-                    data_type_ = data_type.lower()
-                    if 'float' in data_type_:
-                        param_data = float(param_data[0])
-                    elif 'int' in data_type_:
-                        param_data = int(param_data[0])
-                    elif 'bool' in data_type_:
-                        param_data = bool(param_data[0])
-                    tensor_list.append(Tensor(param_data, ms_type))
+    Returns:
+        List, element of list is Tensor.
 
-    except BaseException as e:
-        logger.error("Failed to load the print file %s.", print_list)
-        raise RuntimeError(e.__str__())
+    Raises:
+        ValueError: The print file may be empty, please make sure enter the correct file name.
+    """
+    logger.info("Execute load print process.")
+    tensor_list = []
+    values = _iter_print_values(print_file_name)
+    while True:
+        try:
+            _, _, value, data_type = next(values)
+        except StopIteration:
+            break
+        except (ValueError, KeyError, IndexError) as e:
+            logger.error("Failed to read the print file %s, please check the correct of the file.", print_file_name)
+            raise ValueError(e.__str__())
+
+        # String type
+        if data_type is None:
+            tensor_list.append(value)
+            continue
+        try:
+            param_data, dims = value
+            ms_type = tensor_to_ms_type[data_type]
+            if dims:
+                tensor_list.append(Tensor(param_data.reshape(dims), ms_type))
+            # Scale type
+            else:
+                data_type_ = data_type.lower()
+                if 'float' in data_type_:
+                    param_data = float(param_data[0])
+                elif 'int' in data_type_:
+                    param_data = int(param_data[0])
+                elif 'bool' in data_type_:
+                    param_data = bool(param_data[0])
+                tensor_list.append(Tensor(param_data, ms_type))
+        except BaseException as e:
+            logger.error("Failed to load the print file %s.", print_file_name)
+            raise RuntimeError(e.__str__())
 
     return tensor_list
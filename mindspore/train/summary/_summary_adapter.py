@@ -34,6 +34,8 @@ EVENT_FILE_INIT_VERSION_MARK = "MindSpore.Event:"
 EVENT_FILE_INIT_VERSION = 1
 
 F32_MIN, F32_MAX = np.finfo(np.float32).min, np.finfo(np.float32).max
+# The number of values of a tensor swept at a time by the histogram, small enough to stay in the cache
+HISTOGRAM_CHUNK_SIZE = 1 << 18
 
 
 def get_event_file_name(prefix, suffix):
@@ -127,7 +129,7 @@ def package_summary_event(data_list, step, wall_time):
             if not _fill_image_summary(tag, data, summary_value.image, MS_IMAGE_TENSOR_FORMAT):
                 del summary.value[-1]
         elif summary_type == 'Histogram':
-            _fill_histogram_summary(tag, data, summary_value.histogram)
+            _fill_histogram_summary(tag, data, summary_value.histogram, value.get("max_sample"))
         else:
             # The data is invalid ,jump the data
             logger.error(f"Summary type({summary_type}) is error, tag = {tag}")
@@ -257,60 +259,123 @@ def _calc_histogram_bins(count):
     return max_bins
 
 
-def _fill_histogram_summary(tag: str, np_value: np.ndarray, summary) -> None:
+def _sample_reservoir(reservoir, values, max_sample):
+    """
+    Update a reservoir sample with new values.
+
+    Every value gets a uniform random key and the reservoir keeps the values with the max_sample smallest keys, so
+    it always holds a uniform sample without replacement of all the values seen. Once the reservoir is full, only the
+    values whose key is below the largest kept key are merged.
+
+    Args:
+        reservoir (Optional[tuple]): The sampled values and their keys, None before the first update.
+        values (np.ndarray): The new values.
+        max_sample (int): The size of the reservoir.
+
+    Returns:
+        tuple, the sampled values and their keys.
+    """
+    keys = np.random.random_sample(values.size)
+    if reservoir is not None:
+        sample, sample_keys = reservoir
+        if sample.size >= max_sample:
+            kept = keys < sample_keys.max()
+            values, keys = values[kept], keys[kept]
+        values = np.concatenate((sample, values))
+        keys = np.concatenate((sample_keys, keys))
+    if values.size > max_sample:
+        kept = np.argpartition(keys, max_sample - 1)[:max_sample]
+        values, keys = values[kept], keys[kept]
+    return values, keys
+
+
+def _fill_histogram_summary(tag: str, np_value: np.ndarray, summary, max_sample=None) -> None:
     """
     Package the histogram summary.
 
+    The min, max, sum, nan and inf counts and the reservoir sample are gathered in one sweep over chunks of the
+    tensor which fit in the cache. The masks of nan and inf are only built for the chunks whose min or max shows they
+    have invalid values. Without sampling the buckets are counted over uniform bins in a second pass, which skips the
+    invalid values by the range of the bins, so no masked copy of the tensor is made.
+
     Args:
         tag (str): Summary tag describe.
         np_value (np.ndarray): Summary data.
         summary (summary_pb2.Summary.Histogram): Summary histogram data.
+        max_sample (Optional[int]): If the tensor has more values than it, the buckets are counted on max_sample
+            values sampled uniformly at random without replacement and scaled to the valid count, the other
+            statistics stay exact. Default: None, count all values.
     """
     logger.debug(f"Set({tag}) the histogram summary value")
-    # Default bucket for tensor with no valid data.
-    ma_value = np.ma.masked_invalid(np_value)
-    total, valid = np_value.size, ma_value.count()
-    invalids = []
-    for isfn in np.isnan, np.isposinf, np.isneginf:
-        if total - valid > sum(invalids):
-            count = np.count_nonzero(isfn(np_value))
-            invalids.append(count)
-        else:
-            invalids.append(0)
-
+    flat = np_value.reshape(-1)
+    total = flat.size
     summary.count = total
-    summary.nan_count, summary.pos_inf_count, summary.neg_inf_count = invalids
+    if not total:
+        logger.warning(f'There are no valid values in the ndarray(size={total}, shape={np_value.shape})')
+        return
+
+    is_float = issubclass(flat.dtype.type, np.floating)
+    valid, min_value, max_value, sum_value = 0, None, None, 0.0
+    nan_count, pos_inf_count, neg_inf_count = 0, 0, 0
+    reservoir = None
+    for start in range(0, total, HISTOGRAM_CHUNK_SIZE):
+        chunk = flat[start:start + HISTOGRAM_CHUNK_SIZE]
+        chunk_min, chunk_max = chunk.min(), chunk.max()
+        # nan propagates into min and max, and an inf shows up as one of them, so finite extremes mean all valid.
+        if is_float and not (np.isfinite(chunk_min) and np.isfinite(chunk_max)):
+            nan_mask = np.isnan(chunk)
+            pos_inf_mask = np.isposinf(chunk)
+            neg_inf_mask = np.isneginf(chunk)
+            nan_count += int(np.count_nonzero(nan_mask))
+            pos_inf_count += int(np.count_nonzero(pos_inf_mask))
+            neg_inf_count += int(np.count_nonzero(neg_inf_mask))
+            chunk = chunk[~(nan_mask | pos_inf_mask | neg_inf_mask)]
+            if not chunk.size:
+                continue
+            chunk_min, chunk_max = chunk.min(), chunk.max()
+        valid += chunk.size
+        min_value = chunk_min if min_value is None else min(min_value, chunk_min)
+        max_value = chunk_max if max_value is None else max(max_value, chunk_max)
+        sum_value += float(chunk.sum(dtype=np.float64))
+        if max_sample is not None:
+            reservoir = _sample_reservoir(reservoir, chunk, max_sample)
+
+    summary.nan_count = nan_count
+    summary.pos_inf_count = pos_inf_count
+    summary.neg_inf_count = neg_inf_count
     if not valid:
         logger.warning(f'There are no valid values in the ndarray(size={total}, shape={np_value.shape})')
         # summary.{min, max, sum} are 0s by default, no need to explicitly set
+        return
+
+    summary.min = float(min_value)
+    summary.max = float(max_value)
+    if is_float and (summary.min < F32_MIN or summary.max > F32_MAX):
+        logger.warning(f'Values({summary.min}, {summary.max}) are too large, '
+                       f'you may encounter some undefined behaviours hereafter.')
+    summary.sum = sum_value
+
+    bins = _calc_histogram_bins(valid)
+    first_edge, last_edge = summary.min, summary.max
+    if not first_edge < last_edge:
+        first_edge -= 0.5
+        last_edge += 0.5
+
+    if reservoir is None:
+        # nan and inf are out of the finite range, so they are not counted
+        hists, edges = np.histogram(flat, bins=bins, range=(first_edge, last_edge))
     else:
-        # BUG: max of a masked array with dtype np.float16 returns inf
-        # See numpy issue#15077
-        if issubclass(np_value.dtype.type, np.floating):
-            summary.min = ma_value.min(fill_value=np.PINF)
-            summary.max = ma_value.max(fill_value=np.NINF)
-            if summary.min < F32_MIN or summary.max > F32_MAX:
-                logger.warning(f'Values({summary.min}, {summary.max}) are too large, '
-                               f'you may encounter some undefined behaviours hereafter.')
-        else:
-            summary.min = ma_value.min()
-            summary.max = ma_value.max()
-        summary.sum = ma_value.sum(dtype=np.float64)
-        bins = _calc_histogram_bins(valid)
-        first_edge, last_edge = summary.min, summary.max
-
-        if not first_edge < last_edge:
-            first_edge -= 0.5
-            last_edge += 0.5
-
-        bins = np.linspace(first_edge, last_edge, bins + 1, dtype=np_value.dtype)
-        hists, edges = np.histogram(np_value, bins=bins)
-
-        for hist, edge1, edge2 in zip(hists, edges, edges[1:]):
-            bucket = summary.buckets.add()
-            bucket.width = edge2 - edge1
-            bucket.count = hist
-            bucket.left = edge1
+        sample = reservoir[0]
+        hists, edges = np.histogram(sample, bins=bins, range=(first_edge, last_edge))
+        if sample.size < valid:
+            hists = np.rint(hists * (valid / sample.size))
+
+    widths = np.diff(edges)
+    for hist, edge, width in zip(hists.tolist(), edges.tolist(), widths.tolist()):
+        bucket = summary.buckets.add()
+        bucket.width = width
+        bucket.count = int(hist)
+        bucket.left = edge
 
 
 def _fill_image_summary(tag: str, np_value, summary_image, input_format='NCHW'):
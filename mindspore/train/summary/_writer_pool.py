@@ -14,9 +14,10 @@
 # ============================================================================
 """Write events to disk in a base directory."""
 import os
+import queue
 import time
-from collections import deque
-from multiprocessing import Pool, Process, Queue, cpu_count
+from multiprocessing import Pool, Process, Queue, Value, cpu_count
+from threading import Thread
 
 import mindspore.log as logger
 
@@ -35,7 +36,8 @@ def _pack_data(datadict, wall_time):
             elif plugin in ('train_lineage', 'eval_lineage', 'custom_lineage_data', 'dataset_graph'):
                 result.append([plugin, serialize_to_lineage_event(plugin, data.get('value'))])
             elif plugin in ('scalar', 'tensor', 'histogram', 'image'):
-                summaries.append({'_type': plugin.title(), 'name': data.get('tag'), 'data': data.get('value')})
+                summaries.append({'_type': plugin.title(), 'name': data.get('tag'), 'data': data.get('value'),
+                                  'max_sample': data.get('max_sample')})
                 step = data.get('step')
     if summaries:
         result.append(['summary', package_summary_event(summaries, step, wall_time).SerializeToString()])
@@ -46,6 +48,10 @@ class WriterPool(Process):
     """
     Use a set of pooled resident processes for writing a list of file.
 
+    The data is packed by a process pool, and the packed results are written by a writer thread in the order they
+    were submitted. Both the main loop and the writer thread block on queues, so an idle writer costs no CPU. The
+    number of data being packed is bounded, when exceeded `write` blocks until the earlier data is written.
+
     Args:
         base_dir (str): The base directory to hold all the files.
         filelist (str): The mapping from short name to long filename.
@@ -56,29 +62,63 @@ class WriterPool(Process):
         self._base_dir, self._filedict = base_dir, filedict
         self._queue, self._writers_ = Queue(cpu_count() * 2), None
         self._max_file_size = max_file_size
+        self._pending_num = Value('i', 0)
+        self._packed_num = Value('Q', 0)
+        self._pack_latency = Value('d', 0.0)
+        self._bytes_written = Value('Q', 0)
         self.start()
 
     def run(self):
+        pending = queue.Queue(cpu_count() * 2)
+        writer_thread = Thread(target=self._write_results, args=(pending,), name="summary_writer", daemon=True)
+        writer_thread.start()
         with Pool(min(cpu_count(), 32)) as pool:
-            deq = deque()
             while True:
-                while deq and deq[0].ready():
-                    for plugin, data in deq.popleft().get():
-                        self._write(plugin, data)
-
-                if not self._queue.empty():
-                    action, data = self._queue.get()
-                    if action == 'WRITE':
-                        deq.append(pool.apply_async(_pack_data, (data, time.time())))
-                    elif action == 'FLUSH':
-                        self._flush()
-                    elif action == 'END':
-                        break
-            for result in deq:
-                for plugin, data in result.get():
-                    self._write(plugin, data)
-
-            self._close()
+                action, data = self._queue.get()
+                if action == 'WRITE':
+                    with self._pending_num.get_lock():
+                        self._pending_num.value += 1
+                    pending.put((action, pool.apply_async(_pack_data, (data, time.time())), time.time()))
+                elif action == 'FLUSH':
+                    pending.put((action, None, None))
+                elif action == 'END':
+                    break
+            pending.put(('END', None, None))
+            writer_thread.join()
+
+        self._close()
+
+    def _write_results(self, pending):
+        """Write the packed results in the submitted order, run in the writer thread of the subprocess."""
+        while True:
+            action, result, submit_time = pending.get()
+            if action == 'END':
+                break
+            # The thread must keep draining the bounded queue whatever fails, otherwise the main loop blocks on
+            # putting into it and the training hangs.
+            try:
+                if action == 'FLUSH':
+                    self._flush()
+                else:
+                    self._write_result(result, submit_time)
+            except Exception as e:
+                logger.error(f'Failed to write the summary data: {e}')
+
+    def _write_result(self, result, submit_time):
+        """Wait for a packed result and write it."""
+        try:
+            packed = result.get()
+        except Exception as e:
+            logger.error(f'Failed to pack the summary data: {e}')
+            packed = []
+        finally:
+            with self._pack_latency.get_lock():
+                self._packed_num.value += 1
+                self._pack_latency.value += time.time() - submit_time
+            with self._pending_num.get_lock():
+                self._pending_num.value -= 1
+        for plugin, data in packed:
+            self._write(plugin, data)
 
     @property
     def _writers(self):
@@ -96,6 +136,8 @@ class WriterPool(Process):
 
     def _write(self, plugin, data):
         """Write the data in the subprocess."""
+        with self._bytes_written.get_lock():
+            self._bytes_written.value += len(data)
         for writer in self._writers[:]:
             try:
                 writer.write(plugin, data)
@@ -128,6 +170,29 @@ class WriterPool(Process):
         """Flush the writer and sync data to disk."""
         self._queue.put(('FLUSH', None))
 
+    def get_metrics(self):
+        """
+        Get the metrics of the writer.
+
+        Returns:
+            dict, the number of the data waiting in the queue ('queue_depth'), being packed or waiting to be written
+            ('pending_num'), already written ('packed_num'), the average latency in seconds from submitting to the
+            packing finished ('avg_pack_latency'), and the bytes written to the files ('bytes_written').
+        """
+        try:
+            queue_depth = self._queue.qsize()
+        except NotImplementedError:
+            # qsize is not implemented on some platforms, such as macOS.
+            queue_depth = -1
+        with self._pack_latency.get_lock():
+            packed_num = self._packed_num.value
+            pack_latency = self._pack_latency.value
+        return {'queue_depth': queue_depth,
+                'pending_num': self._pending_num.value,
+                'packed_num': packed_num,
+                'avg_pack_latency': pack_latency / packed_num if packed_num else 0.0,
+                'bytes_written': self._bytes_written.value}
+
     def close(self) -> None:
         """Close the writer."""
         self._queue.put(('END', None))
@@ -82,9 +82,12 @@ class SummaryRecord:
         network (Cell): Obtain a pipeline through network for saving graph summary. Default: None.
         max_file_size (Optional[int]): The maximum size in bytes each file can be written to the disk. \
             Unlimited by default. For example, to write not larger than 4GB, specify `max_file_size=4 * 1024**3`.
+        histogram_max_sample (Optional[int]): The maximum number of values used to count the buckets of a
+            histogram. For a larger tensor, the buckets are counted on a uniform random sample of this size, while
+            the count, min, max and sum stay exact. Default: None, count all values.
 
     Raises:
-        TypeError: If `max_file_size`, `queue_max_size` or `flush_time` is not int, \
+        TypeError: If `max_file_size`, `histogram_max_sample`, `queue_max_size` or `flush_time` is not int, \
             or `file_prefix` and `file_suffix` is not str.
         RuntimeError: If the log_dir can not be resolved to a canonicalized absolute pathname.
 
@@ -107,7 +110,8 @@ class SummaryRecord:
                  file_prefix="events",
                  file_suffix="_MS",
                  network=None,
-                 max_file_size=None):
+                 max_file_size=None,
+                 histogram_max_sample=None):
 
         self._closed, self._event_writer = False, None
         self._mode, self._data_pool = 'train', _dictlist()
@@ -129,6 +133,13 @@ class SummaryRecord:
             logger.warning("The 'max_file_size' should be greater than 0.")
             max_file_size = None
 
+        if not isinstance(histogram_max_sample, (int, type(None))) or isinstance(histogram_max_sample, bool):
+            raise TypeError("The 'histogram_max_sample' should be int type.")
+        if histogram_max_sample is not None and histogram_max_sample <= 0:
+            logger.warning("The 'histogram_max_sample' should be greater than 0.")
+            histogram_max_sample = None
+        self._histogram_max_sample = histogram_max_sample
+
         self.queue_max_size = queue_max_size
         if queue_max_size < 0:
             # 0 is not limit
@@ -306,6 +317,9 @@ class SummaryRecord:
             for values in self._data_pool.values():
                 for value in values:
                     value['step'] = step
+            if self._histogram_max_sample is not None:
+                for value in self._data_pool.get('histogram', []):
+                    value['max_sample'] = self._histogram_max_sample
             return self._data_pool
         finally:
             self._data_pool = _dictlist()
@@ -324,6 +338,22 @@ class SummaryRecord:
         """
         return self.full_file_name
 
+    @property
+    def writer_metrics(self):
+        """
+        Get the metrics of the background summary writer.
+
+        Returns:
+            dict, contains 'queue_depth' (data waiting in the queue), 'pending_num' (data being packed or waiting
+            to be written), 'packed_num' (data written), 'avg_pack_latency' (average seconds from recording to
+            the data packed) and 'bytes_written' (bytes written to the files).
+
+        Examples:
+            >>> with SummaryRecord(log_dir="./summary_dir") as summary_record:
+            >>>     print(summary_record.writer_metrics)
+        """
+        return self._event_writer.get_metrics()
+
     def flush(self):
         """
         Flush the event file to disk.
@@ -16,14 +16,13 @@
 import os
 
 import numpy as np
-from sklearn.metrics import roc_auc_score
 import mindspore.common.dtype as mstype
 from mindspore.ops import functional as F
 from mindspore.ops import composite as C
 from mindspore.ops import operations as P
 from mindspore.nn import Dropout
 from mindspore.nn.optim import Adam
-from mindspore.nn.metrics import Metric
+from mindspore.nn.metrics import Metric, AUC
 from mindspore import nn, ParameterTuple, Parameter
 from mindspore.common.initializer import Uniform, initializer, Normal
 from mindspore.train.callback import ModelCheckpoint, CheckpointConfig
@@ -39,25 +38,19 @@ class AUCMetric(Metric):
     """AUC metric for DeepFM model."""
     def __init__(self):
         super(AUCMetric, self).__init__()
-        self.pred_probs = []
-        self.true_labels = []
+        self.auc = AUC()
 
     def clear(self):
         """Clear the internal evaluation result."""
-        self.pred_probs = []
-        self.true_labels = []
+        self.auc.clear()
 
     def update(self, *inputs):
         batch_predict = inputs[1].asnumpy()
         batch_label = inputs[2].asnumpy()
-        self.pred_probs.extend(batch_predict.flatten().tolist())
-        self.true_labels.extend(batch_label.flatten().tolist())
+        self.auc.update(batch_predict, batch_label)
 
     def eval(self):
-        if len(self.true_labels) != len(self.pred_probs):
-            raise RuntimeError('true_labels.size() is not equal to pred_probs.size()')
-        auc = roc_auc_score(self.true_labels, self.pred_probs)
-        return auc
+        return self.auc.eval()
 
 
 def init_method(method, shape, name, max_val=0.01):
@@ -17,9 +17,8 @@
 Area under cure metric
 """
 
-from sklearn.metrics import roc_auc_score
 from mindspore import context
-from mindspore.nn.metrics import Metric
+from mindspore.nn.metrics import Metric, AUC
 from mindspore.communication.management import get_rank, get_group_size
 
 class AUCMetric(Metric):
@@ -29,33 +28,27 @@ class AUCMetric(Metric):
 
     def __init__(self):
         super(AUCMetric, self).__init__()
+        self.auc = AUC()
         self.clear()
         self.full_batch = context.get_auto_parallel_context("full_batch")
 
     def clear(self):
         """Clear the internal evaluation result."""
-        self.true_labels = []
-        self.pred_probs = []
+        self.auc.clear()
 
     def update(self, *inputs): # inputs
-        """Update list of predicts and labels."""
-        all_predict = inputs[1].asnumpy().flatten().tolist() # predict
-        all_label = inputs[2].asnumpy().flatten().tolist() # label
-        self.pred_probs.extend(all_predict)
+        """Update the histograms of predicts and labels."""
+        all_predict = inputs[1].asnumpy().flatten() # predict
+        all_label = inputs[2].asnumpy().flatten() # label
         if self.full_batch:
             rank_id = get_rank()
             group_size = get_group_size()
             gap = len(all_label) // group_size
-            self.true_labels.extend(all_label[rank_id*gap: (rank_id+1)*gap])
-        else:
-            self.true_labels.extend(all_label)
+            all_label = all_label[rank_id*gap: (rank_id+1)*gap]
+        self.auc.update(all_predict, all_label)
 
     def eval(self):
-        if len(self.true_labels) != len(self.pred_probs):
-            raise RuntimeError(
-                'true_labels.size is not equal to pred_probs.size()')
-
-        auc = roc_auc_score(self.true_labels, self.pred_probs)
+        auc = self.auc.eval()
         print("====" * 20 + " auc_metric  end")
         print("====" * 20 + " auc: {}".format(auc))
         return auc
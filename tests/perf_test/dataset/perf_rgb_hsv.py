@@ -0,0 +1,58 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""test performance of the numpy RGB/HSV conversion of py_transforms against the per pixel colorsys conversion"""
+import colorsys
+import time
+
+import numpy as np
+
+import mindspore.dataset.transforms.vision.py_transforms_util as util
+
+batch_size = 32
+height = 224
+width = 224
+repeat = 3
+
+
+def colorsys_rgb_to_hsvs(np_rgb_imgs):
+    to_hsv = np.vectorize(colorsys.rgb_to_hsv)
+    return np.array([np.stack(to_hsv(img[..., 0], img[..., 1], img[..., 2]), axis=2) for img in np_rgb_imgs])
+
+
+def colorsys_hsv_to_rgbs(np_hsv_imgs):
+    to_rgb = np.vectorize(colorsys.hsv_to_rgb)
+    return np.array([np.stack(to_rgb(img[..., 0], img[..., 1], img[..., 2]), axis=2) for img in np_hsv_imgs])
+
+
+def run(name, func, imgs):
+    start = time.time()
+    for _ in range(repeat):
+        out = func(imgs)
+    cost = (time.time() - start) / repeat
+    print("{} - images: {}, cost time: {:.4f}s, {:.1f} images/s".format(name, len(imgs), cost, len(imgs) / cost))
+    return out
+
+
+if __name__ == '__main__':
+    rgb_imgs = np.random.rand(batch_size, height, width, 3).astype(np.float32)
+    hsv_numpy = run("rgb_to_hsvs numpy", lambda imgs: util.rgb_to_hsvs(imgs, True), rgb_imgs)
+    hsv_colorsys = run("rgb_to_hsvs colorsys", colorsys_rgb_to_hsvs, rgb_imgs)
+    np.testing.assert_allclose(hsv_numpy, hsv_colorsys, rtol=1e-5, atol=1e-6)
+
+    rgb_numpy = run("hsv_to_rgbs numpy", lambda imgs: util.hsv_to_rgbs(imgs, True), hsv_numpy)
+    rgb_colorsys = run("hsv_to_rgbs colorsys", colorsys_hsv_to_rgbs, hsv_numpy)
+    np.testing.assert_allclose(rgb_numpy, rgb_colorsys, rtol=1e-5, atol=1e-6)
+
+    run("adjust_hue_saturation numpy", lambda imgs: util.adjust_hue_saturation(imgs, 0.1, 1.2, True), rgb_imgs)
@@ -0,0 +1,46 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""test the time of importing mindspore, and of registering the op info which is deferred to the first lookup"""
+import subprocess
+import sys
+
+repeat = 5
+
+IMPORT_SCRIPT = """
+import time
+start = time.time()
+import mindspore
+imported = time.time()
+from mindspore.ops._op_impl import load_all_op_info
+load_all_op_info()
+print(imported - start, time.time() - imported)
+"""
+
+
+def run():
+    import_times = []
+    register_times = []
+    for _ in range(repeat):
+        # a new interpreter each time, the modules are cached once imported
+        out = subprocess.check_output([sys.executable, "-c", IMPORT_SCRIPT])
+        import_time, register_time = map(float, out.decode().split()[-2:])
+        import_times.append(import_time)
+        register_times.append(register_time)
+    print("import mindspore - best of {}: {:.3f}s".format(repeat, min(import_times)))
+    print("register all op info - best of {}: {:.3f}s".format(repeat, min(register_times)))
+
+
+if __name__ == '__main__':
+    run()
@@ -203,6 +203,36 @@ def test_numpy_slices_sequential_sampler():
         assert np.equal(data[0], np_data[i % 8]).all()
 
 
+def test_numpy_slices_numpy_array():
+    logger.info("Test slicing numpy arrays without copying them.")
+
+    np_data = {"a": np.arange(20).reshape(10, 2), "b": np.arange(10, dtype=np.float32)}
+    ds = de.NumpySlicesDataset(np_data, shuffle=False)
+    assert ds.source.data[0] is np_data["a"]
+    assert ds.source.data[1] is np_data["b"]
+
+    for i, data in enumerate(ds.create_dict_iterator()):
+        assert np.equal(data["a"], np_data["a"][i]).all()
+        assert data["b"] == np_data["b"][i]
+
+
+def test_numpy_slices_batch_size():
+    logger.info("Test slicing batches of rows at once.")
+
+    np_data = np.arange(20).reshape(10, 2)
+    ds = de.NumpySlicesDataset(np_data, column_names=["col1"], shuffle=False, batch_size=4)
+    assert ds.get_dataset_size() == 3
+    res = [data[0] for data in ds]
+    assert [item.shape for item in res] == [(4, 2), (4, 2), (2, 2)]
+    assert np.equal(np.concatenate(res), np_data).all()
+
+    ds = de.NumpySlicesDataset(np_data, column_names=["col1"], sampler=[7, 2, 5, 0, 9], batch_size=2,
+                               drop_remainder=True)
+    res = [data[0] for data in ds]
+    assert len(res) == 2
+    assert np.equal(np.concatenate(res), np_data[[7, 2, 5, 0]]).all()
+
+
 def test_numpy_slices_invalid_column_names_type():
     logger.info("Test incorrect column_names input")
     np_data = [1, 2, 3]
@@ -238,6 +268,24 @@ def test_numpy_slices_invalid_empty_data_column():
         de.NumpySlicesDataset(np_data, shuffle=False)
     assert "Argument data cannot be empty" in str(err.value)
 
+    with pytest.raises(ValueError) as err:
+        de.NumpySlicesDataset(np.zeros((0, 3)), shuffle=False)
+    assert "Argument data cannot be empty" in str(err.value)
+
+    with pytest.raises(TypeError) as err:
+        de.NumpySlicesDataset(3, shuffle=False)
+    assert "Argument data with value 3 is not of type" in str(err.value)
+
+
+def test_numpy_slices_output_shapes():
+    logger.info("Test the output shapes and types are inferred without running the pipeline")
+    np_data = (np.ones((10, 3), np.float32), np.arange(10, dtype=np.int32))
+    ds = de.NumpySlicesDataset(np_data, column_names=["a", "b"], shuffle=False)
+    ds = ds.batch(4, drop_remainder=True).repeat(2).project(["b", "a"])
+
+    assert ds.output_shapes() == [[4], [4, 3]]
+    assert ds.output_types() == [np.int32, np.float32]
+
 
 if __name__ == "__main__":
     test_numpy_slices_list_1()
@@ -255,7 +303,10 @@ if __name__ == "__main__":
     test_numpy_slices_distributed_shard_limit()
     test_numpy_slices_distributed_zero_shard()
     test_numpy_slices_sequential_sampler()
+    test_numpy_slices_numpy_array()
+    test_numpy_slices_batch_size()
     test_numpy_slices_invalid_column_names_type()
     test_numpy_slices_invalid_column_names_string()
     test_numpy_slices_invalid_empty_column_names()
     test_numpy_slices_invalid_empty_data_column()
+    test_numpy_slices_output_shapes()
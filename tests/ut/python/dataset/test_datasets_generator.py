@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import time
+
 import numpy as np
 import pytest
 
@@ -615,6 +617,116 @@ def test_generator_schema():
         type_tester_with_type_check_2c_schema(np_types[i], [de_types[i], de_types[i]])
 
 
+def test_generator_mp_slow_and_large_rows():
+    """
+    Test Generator MP keeps the sampler order when rows complete out of order, and passes rows larger
+    than max_rowsize through the fallback queue
+    """
+    logger.info("Test Generator MP with slow and large rows")
+
+    class MyDS():
+        def __getitem__(self, item):
+            if item % 8 == 0:
+                time.sleep(0.01)
+            if item % 10 == 0:
+                return (np.full([512, 1024], item, np.int32),)
+            return (np.full([2, 3], item, np.int32),)
+
+        def __len__(self):
+            return 64
+
+    sampler = [x for x in reversed(range(64))]
+    ds1 = ds.GeneratorDataset(MyDS(), ["data"], sampler=sampler, num_parallel_workers=4, max_rowsize=1)
+    i = 63
+    for data in ds1.create_dict_iterator():  # each data is a dictionary
+        assert data["data"].flat[0] == i
+        assert data["data"].shape == ((512, 1024) if i % 10 == 0 else (2, 3))
+        i = i - 1
+    assert i == -1
+
+
+def test_generator_mp_error():
+    """
+    Test Generator MP raises the exception from the worker process
+    """
+    logger.info("Test Generator MP error")
+
+    class MyDS():
+        def __getitem__(self, item):
+            if item == 3:
+                raise ValueError("invalid item")
+            return (np.array([item]),)
+
+        def __len__(self):
+            return 16
+
+    with pytest.raises(RuntimeError) as info:
+        ds1 = ds.GeneratorDataset(MyDS(), ["data"], sampler=ds.SequentialSampler(), num_parallel_workers=2)
+        for _ in ds1.create_dict_iterator():  # each data is a dictionary
+            pass
+    assert "invalid item" in str(info.value)
+
+
+def test_generator_batch_size():
+    """
+    Test Generator fetching whole batches with __getitems__, and by stacking rows without it
+    """
+    logger.info("Test Generator batch_size")
+
+    class MyDS():
+        def __init__(self):
+            self.data = np.arange(21 * 2, dtype=np.int32).reshape(21, 2)
+
+        def __getitem__(self, item):
+            return (self.data[item], np.array(item))
+
+        def __len__(self):
+            return 21
+
+    class MyBatchDS(MyDS):
+        def __getitems__(self, indices):
+            # negated, so the batches read by __getitems__ in the workers can be told from the stacked rows
+            return (-self.data[indices], indices)
+
+    for source, sign in [(MyDS(), 1), (MyBatchDS(), -1)]:
+        for num_parallel_workers in [1, 2]:
+            ds1 = ds.GeneratorDataset(source, ["data", "index"], sampler=ds.SequentialSampler(),
+                                      num_parallel_workers=num_parallel_workers, batch_size=4)
+            assert ds1.get_dataset_size() == 6
+            indices = []
+            for data in ds1.create_dict_iterator():  # each data is a dictionary
+                assert data["data"].shape == (len(data["index"]), 2)
+                np.testing.assert_array_equal(data["data"], sign * source.data[data["index"]])
+                indices.extend(data["index"].tolist())
+            assert indices == list(range(21))
+
+    ds1 = ds.GeneratorDataset(MyBatchDS(), ["data", "index"], shuffle=False, batch_size=4, drop_remainder=True)
+    assert ds1.get_dataset_size() == 5
+    assert [data["index"].shape for data in ds1.create_dict_iterator()] == [(4,)] * 5
+
+
+def test_generator_mp_large_batch():
+    """
+    Test Generator passing batches larger than max_rowsize from the worker processes
+    """
+    logger.info("Test Generator MP large batches")
+
+    class MyDS():
+        def __getitem__(self, item):
+            # 1MB per row, the batches of 8 rows do not fit in max_rowsize
+            return (np.full((256, 1024), item, np.float32),)
+
+        def __len__(self):
+            return 20
+
+    ds1 = ds.GeneratorDataset(MyDS(), ["data"], sampler=ds.SequentialSampler(), num_parallel_workers=2,
+                              max_rowsize=1, batch_size=8)
+    batches = [data["data"] for data in ds1.create_dict_iterator()]
+    assert [batch.shape[0] for batch in batches] == [8, 8, 4]
+    for i, batch in enumerate(batches):
+        np.testing.assert_array_equal(batch[:, 0, 0], np.arange(i * 8, i * 8 + len(batch)))
+
+
 def manual_test_generator_keyboard_interrupt():
     """
     Test keyboard_interrupt
@@ -663,3 +775,7 @@ if __name__ == "__main__":
     test_generator_num_samples()
     test_generator_num_samples_underflow()
     test_generator_schema()
+    test_generator_mp_slow_and_large_rows()
+    test_generator_mp_error()
+    test_generator_batch_size()
+    test_generator_mp_large_batch()
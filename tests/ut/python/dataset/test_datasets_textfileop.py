@@ -12,8 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import os
+import shutil
+
 import mindspore.dataset as ds
 from mindspore import log as logger
+from mindspore.dataset.engine import row_index
 from util import config_get_set_num_parallel_workers
 
 
@@ -89,6 +93,24 @@ def test_textline_dataset_get_datasetsize():
     size = data.get_dataset_size()
     assert size == 3
 
+def test_textline_dataset_row_index():
+    index_dir = "./textfile_row_index"
+    ds.config.set_index_dir(index_dir)
+    try:
+        data = ds.TextFileDataset(DATA_ALL_FILE)
+        assert data.get_dataset_size() == 5
+        assert len(os.listdir(index_dir)) == 2
+
+        index = row_index.RowIndex(sorted(data.dataset_files), row_index.TEXT)
+        assert index.read(0) == b"This is a text file."
+        assert index.read(4) == b"End of file."
+        assert index.shard(2, 1) == (2, 5)
+        # the rows are counted from the stored indexes
+        assert ds.TextFileDataset(DATA_ALL_FILE, num_shards=2, shard_id=0).get_dataset_size() == 3
+    finally:
+        ds.config.set_index_dir(None)
+        shutil.rmtree(index_dir, ignore_errors=True)
+
 def test_textline_dataset_to_device():
     data = ds.TextFileDataset(DATA_FILE, shuffle=False)
     data = data.to_device()
@@ -102,3 +124,4 @@ if __name__ == "__main__":
     test_textline_dataset_distribution()
     test_textline_dataset_repeat()
     test_textline_dataset_get_datasetsize()
+    test_textline_dataset_row_index()
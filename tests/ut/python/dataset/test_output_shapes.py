@@ -0,0 +1,111 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""
+Test the output shapes and types inferred from the metadata of the dataset tree
+"""
+from unittest import mock
+
+import numpy as np
+
+import mindspore.common.dtype as mstype
+import mindspore.dataset as ds
+import mindspore.dataset.transforms.c_transforms as c_transforms
+import mindspore.dataset.transforms.vision.c_transforms as c_vision
+from mindspore import log as logger
+from mindspore.dataset.engine.datasets import Dataset
+
+FILES = ["../data/dataset/testTFTestAllTypes/test.data"]
+SCHEMA_FILE = "../data/dataset/testTFTestAllTypes/datasetSchema.json"
+
+
+def no_pipeline():
+    """Fails the test if the pipeline is launched to get the shapes and types."""
+    return mock.patch.object(Dataset, "_get_pipeline_info", side_effect=AssertionError("the pipeline is launched"))
+
+
+def test_output_shapes_schema_file():
+    logger.info("Test the output shapes and types of a TFRecordDataset come from its schema file")
+    data = ds.TFRecordDataset(FILES, SCHEMA_FILE, columns_list=["col_2d", "col_float", "col_binary"], shuffle=False)
+    data = data.shuffle(4).repeat(2)
+
+    with no_pipeline():
+        assert data.output_shapes() == [[2, 2], [1], [1]]
+        assert data.output_types() == [np.int64, np.float32, np.uint8]
+
+    # the shuffle op is still built and run
+    assert sum(1 for _ in data.create_dict_iterator()) == 24
+
+
+def test_output_shapes_schema_object():
+    logger.info("Test the output shapes and types of a RandomDataset come from its schema object")
+    schema = ds.Schema()
+    schema.add_column("image", de_type=mstype.uint8, shape=[8, 6, 3])
+    schema.add_column("label", de_type=mstype.int32, shape=[1])
+    data = ds.RandomDataset(schema=schema, total_rows=4)
+
+    with no_pipeline():
+        assert data.output_shapes() == [[8, 6, 3], [1]]
+        assert data.output_types() == [np.uint8, np.int32]
+
+
+def test_output_shapes_map_rules():
+    logger.info("Test the output shapes and types of the c transforms of a map")
+    schema = ds.Schema()
+    schema.add_column("image", de_type=mstype.uint8, shape=[8, 6, 3])
+    schema.add_column("label", de_type=mstype.int32, shape=[1])
+    data = ds.RandomDataset(schema=schema, total_rows=4)
+    data = data.map(input_columns="image", operations=[c_vision.Resize((4, 5)), c_vision.Rescale(1.0 / 255, 0),
+                                                       c_vision.HWC2CHW()])
+    data = data.map(input_columns="label", operations=[c_transforms.OneHot(10), c_transforms.TypeCast(mstype.float32)])
+    data = data.batch(2, drop_remainder=True)
+
+    with no_pipeline():
+        assert data.output_shapes() == [[2, 3, 4, 5], [2, 1, 10]]
+        assert data.output_types() == [np.float32, np.float32]
+
+
+def test_output_shapes_rename_project_zip():
+    logger.info("Test the columns of rename, project and zip")
+    data1 = ds.NumpySlicesDataset((np.ones((6, 3), np.float32), np.arange(6, dtype=np.int32)),
+                                  column_names=["a", "b"], shuffle=False)
+    data2 = ds.TFRecordDataset(FILES, SCHEMA_FILE, columns_list=["col_1d"], shuffle=False)
+    data = ds.zip((data1.rename(["a"], ["c"]), data2)).project(["col_1d", "c"])
+
+    with no_pipeline():
+        assert data.output_shapes() == [[2], [3]]
+        assert data.output_types() == [np.int64, np.float32]
+
+
+def test_output_shapes_probe():
+    logger.info("Test the pipeline is launched when the shapes are not known from the metadata")
+    data = ds.TFRecordDataset(FILES, SCHEMA_FILE, columns_list=["col_2d"], shuffle=False)
+    mapped = data.map(input_columns="col_2d", operations=(lambda x: x.reshape(4)))
+    assert mapped.output_shapes() == [[4]]
+    assert mapped.output_types() == [np.int64]
+
+    # the size of the first batch is only known by counting the rows
+    batched = data.batch(2)
+    with mock.patch.object(Dataset, "_get_pipeline_info", autospec=True,
+                           side_effect=Dataset._get_pipeline_info) as get_pipeline_info:
+        assert batched.output_shapes() == [[2, 2, 2]]
+        get_pipeline_info.assert_called_once()
+
+
+if __name__ == "__main__":
+    test_output_shapes_schema_file()
+    test_output_shapes_schema_object()
+    test_output_shapes_map_rules()
+    test_output_shapes_rename_project_zip()
+    test_output_shapes_probe()
@@ -12,10 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ==============================================================================
+import copy
+import threading
+import time
+
 import numpy as np
 import pytest
 
 import mindspore.dataset as ds
+from mindspore.dataset.engine.datasets import _PyFuncChunkDispatcher
 from mindspore import log as logger
 
 DATA_DIR = ["../data/dataset/testPyfuncMap/data.data"]
@@ -250,6 +255,72 @@ def test_case_9():
         i = i + 4
 
 
+def test_case_10():
+    """
+    Test PyFunc
+    """
+    logger.info("Test multiple 1-1 PyFunc Multiprocess with chunk_size: lambda x : x + x")
+
+    # apply dataset operations
+    data1 = ds.TFRecordDataset(DATA_DIR, SCHEMA_DIR, shuffle=False)
+
+    data1 = data1.map(input_columns="col0", output_columns="out", operations=[(lambda x: x + x), (lambda x: x + 1),
+                                                                              (lambda x: x + 2)],
+                      num_parallel_workers=2, python_multiprocessing=True, chunk_size=4)
+
+    i = 0
+    for item in data1.create_dict_iterator():  # each data is a dictionary
+        # In this test, the dataset is 2x2 sequential tensors
+        golden = np.array([[i * 2 + 3, (i + 1) * 2 + 3], [(i + 2) * 2 + 3, (i + 3) * 2 + 3]])
+        np.testing.assert_array_equal(item["out"], golden)
+        i = i + 4
+
+    # the map runs chunk_size threads per process, without changing its num_parallel_workers
+    map_op = copy.deepcopy(data1)
+    map_op.iterator_bootstrap()
+    assert map_op.num_parallel_workers == 2
+    assert map_op.get_args()["num_parallel_workers"] == 8
+    del map_op
+
+
+def test_chunk_dispatcher_close():
+    """
+    Test the rows waiting for the process pool fail when the dispatcher is closed
+    """
+    logger.info("Test PyFunc chunk dispatcher close")
+
+    class StalledPool:
+        def apply_async(self, *args, **kwargs):
+            pass
+
+    dispatcher = _PyFuncChunkDispatcher(StalledPool(), 1, 2)
+    errors = []
+
+    def execute():
+        try:
+            dispatcher.execute(0, (np.array(1),))
+        except RuntimeError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=execute) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    dispatcher.close()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert not any(thread.is_alive() for thread in threads)
+    assert len(errors) == 3
+
+
+def test_chunk_size_error():
+    logger.info("Test PyFunc Multiprocess with invalid chunk_size")
+
+    data1 = ds.TFRecordDataset(DATA_DIR, SCHEMA_DIR, shuffle=False)
+    with pytest.raises(ValueError):
+        data1.map(input_columns="col0", operations=(lambda x: x + x), python_multiprocessing=True, chunk_size=0)
+
+
 def test_pyfunc_execption():
     logger.info("Test PyFunc Execption Throw: lambda x : raise Execption()")
 
@@ -293,5 +364,8 @@ if __name__ == "__main__":
     test_case_7()
     test_case_8()
     test_case_9()
+    test_case_10()
+    test_chunk_dispatcher_close()
+    test_chunk_size_error()
     test_pyfunc_execption()
     skip_test_pyfunc_execption_multiprocess()
@@ -130,6 +130,24 @@ def test_rgb_hsv_batch_chw():
     assert_allclose(rgb_base.flatten(), rgb_de.flatten(), rtol=1e-5, atol=0)
 
 
+def test_adjust_hue_saturation_batch():
+    rgb_flat = generate_numpy_random_rgb((64, 3)).astype(np.float32)
+    rgb_imgs = rgb_flat.reshape((4, 2, 8, 3))
+    adjusted_base = []
+    for r, g, b in rgb_flat.astype(np.float64):
+        h, s, v = colorsys.rgb_to_hsv(r, g, b)
+        adjusted_base.append(colorsys.hsv_to_rgb((h + 0.25) % 1.0, min(s * 0.5, 1.0), v))
+    adjusted_base = np.array(adjusted_base).reshape((4, 2, 8, 3))
+    adjusted_de = util.adjust_hue_saturation(rgb_imgs, 0.25, 0.5, True)
+    assert adjusted_de.shape == adjusted_base.shape
+    assert adjusted_de.dtype == np.float32
+    assert_allclose(adjusted_base.flatten(), adjusted_de.flatten(), rtol=1e-5, atol=1e-6)
+
+    # no adjustment gives the original images
+    adjusted_de = util.adjust_hue_saturation(np.transpose(rgb_imgs, (0, 3, 1, 2)), 0, 1, False)
+    assert_allclose(np.transpose(rgb_imgs, (0, 3, 1, 2)).flatten(), adjusted_de.flatten(), rtol=1e-5, atol=1e-6)
+
+
 def test_rgb_hsv_pipeline():
     # First dataset
     transforms1 = [
@@ -167,4 +185,5 @@ if __name__ == "__main__":
     test_rgb_hsv_batch_hwc()
     test_rgb_hsv_chw()
     test_rgb_hsv_batch_chw()
+    test_adjust_hue_saturation_batch()
     test_rgb_hsv_pipeline()
@@ -0,0 +1,88 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""test auc"""
+import numpy as np
+import pytest
+
+from mindspore import Tensor
+from mindspore.nn.metrics import AUC, get_metric_fn
+
+
+def _pairwise_auc(y_pred, y):
+    """probability that a positive sample is ranked above a negative one, ties count half"""
+    positives = y_pred[y == 1][:, None]
+    negatives = y_pred[y == 0][None, :]
+    return ((positives > negatives).sum() + 0.5 * (positives == negatives).sum()) / positives.size / negatives.size
+
+
+def test_auc():
+    x = Tensor(np.array([0.1, 0.4, 0.35, 0.8]))
+    y = Tensor(np.array([0, 0, 1, 1]))
+    metric = AUC()
+    metric.clear()
+    metric.update(x, y)
+    assert metric.eval() == 0.75
+
+
+def test_auc_exact():
+    y_pred = np.round(np.random.rand(1000), 2)
+    y = np.random.randint(0, 2, 1000)
+    metric = AUC(exact=True)
+    for i in range(0, 1000, 128):
+        metric.update(y_pred[i:i + 128], y[i:i + 128])
+    assert np.isclose(metric.eval(), _pairwise_auc(y_pred, y))
+
+    metric = AUC()
+    metric.update(y_pred, y)
+    assert np.isclose(metric.eval(), _pairwise_auc(y_pred, y))
+
+
+def test_auc_merge():
+    y_pred = np.random.rand(1000)
+    y = np.random.randint(0, 2, 1000)
+    metric = AUC()
+    metric.update(y_pred, y)
+    metric1 = AUC()
+    metric1.update(y_pred[:400], y[:400])
+    metric2 = AUC()
+    metric2.update(y_pred[400:], y[400:])
+    metric1.merge(metric2)
+    assert metric1.eval() == metric.eval()
+
+    with pytest.raises(TypeError):
+        metric1.merge(AUC(num_bins=100))
+
+
+def test_auc_pr():
+    metric = get_metric_fn('auc', curve='PR', exact=True)
+    metric.update(np.array([0.1, 0.4, 0.35, 0.8]), np.array([0, 0, 1, 1]))
+    # recall 0.5 with precision 1 at 0.8, recall 1 with precision 2 / 3 at 0.35
+    assert np.isclose(metric.eval(), 0.5 + 0.5 * 2 / 3)
+    precision, recall, _ = metric.curve()
+    assert np.allclose(precision, [1, 0.5, 2 / 3, 0.5])
+    assert np.allclose(recall, [0.5, 0.5, 1, 1])
+
+
+def test_auc_error():
+    metric = AUC()
+    with pytest.raises(RuntimeError):
+        metric.eval()
+    with pytest.raises(ValueError):
+        metric.update(np.array([0.1, 0.2]), np.array([0, 2]))
+    with pytest.raises(ValueError):
+        metric.update(np.array([0.1, 1.2]), np.array([0, 1]))
+    metric.update(np.array([0.1, 0.2]), np.array([1, 1]))
+    with pytest.raises(RuntimeError):
+        metric.eval()
@@ -114,3 +114,24 @@ def test_imagenet_to_mindrecord_illegal_filename(fixture_file):
                                             IMAGENET_IMAGE_DIR, filename,
                                             PARTITION_NUMBER)
         imagenet_transformer.transform()
+
+def test_imagenet_to_mindrecord_num_parallel_workers(fixture_file):
+    """
+    test transform imagenet dataset to mindrecord
+    with one or more threads reading the images.
+    """
+    for num_parallel_workers in [1, 3]:
+        imagenet_transformer = ImageNetToMR(IMAGENET_MAP_FILE, IMAGENET_IMAGE_DIR, MINDRECORD_FILE,
+                                            num_parallel_workers=num_parallel_workers)
+        imagenet_transformer.transform()
+        read(MINDRECORD_FILE)
+        os.remove(MINDRECORD_FILE)
+        os.remove(MINDRECORD_FILE + ".db")
+
+def test_imagenet_to_mindrecord_num_parallel_workers_0(fixture_file):
+    """
+    test transform imagenet dataset to mindrecord
+    when num_parallel_workers is 0.
+    """
+    with pytest.raises(ValueError, match="num_parallel_workers must be int and greater than 0"):
+        ImageNetToMR(IMAGENET_MAP_FILE, IMAGENET_IMAGE_DIR, MINDRECORD_FILE, num_parallel_workers=0)
@@ -964,3 +964,36 @@ def test_write_read_process_with_multi_bytes_and_array():
 
     os.remove("{}".format(mindrecord_file_name))
     os.remove("{}.db".format(mindrecord_file_name))
+
+
+def test_write_read_process_drop_wrong_shape():
+    mindrecord_file_name = "test.mindrecord"
+    data = [{"id": 0, "mask": np.arange(6, dtype=np.int64), "label": np.array([0, 1], dtype=np.float32)},
+            {"id": 1, "mask": np.arange(5, dtype=np.int64), "label": np.array([1, 2], dtype=np.float32)},
+            {"id": 2, "mask": np.arange(12, dtype=np.int64), "label": np.array([2, 3], dtype=np.float32)},
+            {"id": 3, "mask": np.arange(6, dtype=np.int64), "label": np.array([3], dtype=np.float32)},
+            {"id": 4, "mask": np.arange(6, dtype=np.int64)}]
+    expected = {item["id"]: item for item in data}
+    writer = FileWriter(mindrecord_file_name)
+    schema = {"id": {"type": "int64"},
+              "mask": {"type": "int64", "shape": [-1, 3]},
+              "label": {"type": "float32", "shape": [2]}}
+    writer.add_schema(schema, "data is so cool")
+    writer.write_raw_data(data)
+    writer.commit()
+    stats = writer.statistics
+    assert stats["rows"] == 2
+    # every blob of a row is preceded by its 8 bytes length
+    assert stats["blob_bytes"] == (8 + 6 * 8 + 8 + 2 * 4) + (8 + 12 * 8 + 8 + 2 * 4)
+
+    reader = FileReader(mindrecord_file_name)
+    ids = []
+    for x in reader.get_next():
+        ids.append(x["id"])
+        assert (x["mask"] == expected[x["id"]]["mask"]).all()
+        assert (x["label"] == expected[x["id"]]["label"]).all()
+    assert sorted(ids) == [0, 2]
+    reader.close()
+
+    os.remove("{}".format(mindrecord_file_name))
+    os.remove("{}.db".format(mindrecord_file_name))
@@ -295,3 +295,30 @@ def test_cell_names():
     mn = ModelName(ta)
     with pytest.raises(ValueError):
         _executor.compile(mn)
+
+
+class ReluNet(nn.Cell):
+    def __init__(self):
+        super(ReluNet, self).__init__()
+        self.relu = nn.ReLU()
+
+    def construct(self, x):
+        return self.relu(x)
+
+
+def test_dispatch_cache():
+    net = ReluNet()
+    net._dispatch_compile((Tensor(np.ones([2, 3], np.float32)),))
+    net._dispatch_compile((Tensor(np.zeros([2, 3], np.float32)),))
+    assert net.dispatch_cache_info == {"hits": 1, "misses": 1, "size": 1}
+
+    net._dispatch_compile((Tensor(np.ones([4, 3], np.float32)),))
+    net._dispatch_compile((Tensor(np.ones([2, 3], np.float16)),))
+    assert net.dispatch_cache_info == {"hits": 1, "misses": 3, "size": 3}
+
+    net.set_train(False)
+    net._dispatch_compile((Tensor(np.ones([2, 3], np.float32)),))
+    assert net.dispatch_cache_info == {"hits": 1, "misses": 4, "size": 4}
+
+    net.relu2 = nn.ReLU()
+    assert net.dispatch_cache_info["size"] == 0
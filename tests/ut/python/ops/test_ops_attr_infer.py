@@ -338,3 +338,26 @@ def test_partial_as_arg():
     t3 = Tensor(np.ones([1, 16, 1, 1234]).astype(np.float32))
     net = OpsNet(PartialArgNet())
     net(t1, t2, t3)
+
+
+def test_infer_cache_shared_by_instances():
+    from mindspore.common import dtype as mstype
+    from mindspore.ops.primitive import _infer_cache
+
+    x = {'shape': [2, 3], 'dtype': mstype.tensor_type(mstype.float32), 'value': None}
+    y = {'shape': [4], 'dtype': mstype.tensor_type(mstype.float32), 'value': None}
+    _infer_cache.clear()
+    op1 = FakeOp()
+    op2 = FakeOp()
+    out1 = op1.__infer__(x, y)
+    out2 = op2.__infer__(x, y)
+    assert out1 == out2
+    assert _infer_cache.info()["hits"] == 1
+    # the attributes set by the infer functions are set on a hit as well
+    assert op2.second_shape == [4]
+    assert op2.attrs["second_shape"] == [4]
+
+    op3 = FakeOp()
+    op3.__infer__(x, {'shape': [5], 'dtype': mstype.tensor_type(mstype.float32), 'value': None})
+    assert op3.second_shape == [5]
+    assert _infer_cache.info()["misses"] == 2
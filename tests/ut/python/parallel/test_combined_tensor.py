@@ -13,7 +13,7 @@
 # limitations under the License.
 
 from mindspore import Tensor
-from mindspore.parallel._tensor import _reshape_param_data
+from mindspore.parallel._tensor import _reshape_param_data, _reshape_param_data_with_weight
 
 
 def test_reshape_param_data():
@@ -50,5 +50,17 @@ def test_reshape_param_data():
         raise AssertionError
 
 
+def test_reshape_param_data_with_weight():
+    expected_tensor = Tensor([[1, 11], [2, 12], [5, 15], [6, 16], [3, 13], [4, 14], [7, 17], [8, 18]])
+    dev_mat = [2]
+    field_size = [2]
+    # the rows of each slice are the fields, the slices of a field are put side by side
+    input_tensor = Tensor([[1, 11], [2, 12], [3, 13], [4, 14], [5, 15], [6, 16], [7, 17], [8, 18]])
+    tensor = _reshape_param_data_with_weight(input_tensor, dev_mat, field_size)
+    if expected_tensor.__str__() != tensor.__str__():
+        raise AssertionError
+
+
 if __name__ == '__main__':
     test_reshape_param_data()
+    test_reshape_param_data_with_weight()
@@ -0,0 +1,104 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test the hwts log parser."""
+import os
+import shutil
+import struct
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from mindspore.profiler.parser.hwts_log_parser import HWTSLogParser, get_hwts_columnar_file
+from mindspore.profiler.parser.optime_parser import OPComputeTimeParser
+
+
+def pack_record(log_type, cnt, core_id, blk_id, task_id, syscnt, stream_id, warn=False):
+    """Pack a 64 bytes hwts log record."""
+    head = (cnt << 4) | (int(warn) << 3) | log_type
+    record = struct.pack('<BBHHH', head, core_id, 0, blk_id, task_id)
+    if log_type == 4:
+        record += struct.pack('<QII', 0, stream_id, 0) + struct.pack('<Q', syscnt)
+    else:
+        record += struct.pack('<QII', syscnt, stream_id, 0) + struct.pack('<Q', 0)
+    return record + bytes(32)
+
+
+class TestHWTSLogParser(TestCase):
+    """Test the class of HWTSLogParser."""
+
+    def setUp(self) -> None:
+        """Initialization before test case execution."""
+        self.profiling_dir = tempfile.mkdtemp(prefix='hwts_log_')
+        self.output_file = os.path.join(self.profiling_dir, 'output_format_data_hwts_0.txt')
+        records = [
+            pack_record(0, 1, 2, 0, 3, 1000, 5),
+            b' ' * 64,
+            pack_record(1, 2, 2, 0, 3, 1500, 5),
+            pack_record(4, 3, 1, 7, 30000, 1600, 6),
+            pack_record(4, 3, 1, 7, 30000, 1600, 6, warn=True),
+            pack_record(6, 0, 0, 0, 0, 0, 0),
+        ]
+        source_file = os.path.join(self.profiling_dir, 'hwts.log.data.45.dev.profiler_default_tag.0.slice_0')
+        with open(source_file, 'wb') as f:
+            f.write(b''.join(records))
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.profiling_dir)
+
+    def test_hwts_log_parser(self):
+        """Test the text and columnar output of the parser."""
+        assert HWTSLogParser(self.profiling_dir, self.output_file).execute()
+        with open(self.output_file, 'r') as f:
+            lines = f.read().splitlines()
+        assert lines[2:6] == [
+            "Start of task  1    2        0         5_3      1000            5",
+            "End of task    2    2        0         5_3      1500            5",
+            "Block PMU      3    1        7         30000    1600            6",
+            "Block PMU      3    1        7         30000    None            6",
+        ]
+
+        with np.load(get_hwts_columnar_file(self.output_file)) as columns:
+            assert columns['log_type'].tolist() == [0, 1, 4, 4]
+            assert columns['task_id'].tolist() == [3, 3, 30000, 30000]
+            assert columns['syscnt'].tolist()[:3] == [1000, 1500, 1600]
+            assert columns['syscnt_valid'].tolist() == [True, True, True, False]
+
+    def test_op_compute_time_parser_columnar_input(self):
+        """Test OPComputeTimeParser reads the same tasks from the columnar output as from the text output."""
+        assert HWTSLogParser(self.profiling_dir, self.output_file).execute()
+        op_task_info = {'5_3': 'Default/Conv2D-op1'}
+        parser = OPComputeTimeParser(self.output_file, os.path.join(self.profiling_dir, 'op_time.txt'),
+                                     op_task_info, self.profiling_dir, 0)
+        columnar_tasks = [(hwts.status, hwts.task_id, hwts.cycle_counter, hwts.stream_id, hwts.op_name)
+                          for hwts in parser._get_op_task_id_map()]
+        os.remove(get_hwts_columnar_file(self.output_file))
+        text_tasks = [(hwts.status, hwts.task_id, hwts.cycle_counter, hwts.stream_id, hwts.op_name)
+                      for hwts in parser._get_op_task_id_map()]
+        assert columnar_tasks == text_tasks
+        assert columnar_tasks == [('Start', '5_3', 1000.0, '5', 'Default/Conv2D-op1'),
+                                  ('End', '5_3', 1500.0, '5', 'Default/Conv2D-op1')]
+
+    def test_op_compute_time_parser_stale_columnar_input(self):
+        """Test OPComputeTimeParser reads the text output when it was written again after the columnar output."""
+        assert HWTSLogParser(self.profiling_dir, self.output_file).execute()
+        with open(self.output_file, 'a') as f:
+            f.write("Start of task  1    2        0         5_3      2000            5\n")
+        op_task_info = {'5_3': 'Default/Conv2D-op1'}
+        parser = OPComputeTimeParser(self.output_file, os.path.join(self.profiling_dir, 'op_time.txt'),
+                                     op_task_info, self.profiling_dir, 0)
+        assert parser._read_hwts_columns() is None
+        tasks = [(hwts.status, hwts.cycle_counter) for hwts in parser._get_op_task_id_map()]
+        assert tasks == [('Start', 1000.0), ('End', 1500.0), ('Start', 2000.0)]
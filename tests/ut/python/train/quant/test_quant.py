@@ -17,9 +17,12 @@ import numpy as np
 import pytest
 
 import mindspore.context as context
+import mindspore.dataset as ds
 from mindspore import Tensor
 from mindspore import nn
 from mindspore.train.quant import quant as qat
+from mindspore.train import serialization
+from mindspore.train.quant.calibration import HistogramObserver
 from model_zoo.official.cv.mobilenetv2_quant.src.mobilenetV2 import mobilenetV2
 
 context.set_context(mode=context.GRAPH_MODE, device_target="GPU")
@@ -90,3 +93,32 @@ def test_qat_mobile_per_channel_ff():
     # should load the checkpoint. mock here
     network.init_parameters_data()
     qat.export(network, img, file_name="quant.pb")
+
+
+@pytest.mark.skip(reason="no `te.lang.cce` in ut env")
+def test_ptq_lenet():
+    img = Tensor(np.ones((32, 1, 32, 32)).astype(np.float32))
+    net = LeNet5()
+    # should load the checkpoint. mock here
+    net.init_parameters_data()
+    calibration_data = ds.NumpySlicesDataset(np.random.rand(64, 1, 32, 32).astype(np.float32), shuffle=False)
+    calibration_data = calibration_data.batch(32)
+    deploy_net = qat.post_training_quant(net, calibration_data, img, method="kl", per_channel=[True, False],
+                                         symmetric=[True, False])
+    serialization.export(deploy_net, img, file_name="quant.pb")
+
+
+def test_histogram_observer():
+    observer = HistogramObserver(num_bins=1024)
+    data = [np.random.normal(0, scale, 10000).astype(np.float32) for scale in (0.1, 1, 4)]
+    for x in data:
+        observer.update(x)
+    abs_data = np.abs(np.concatenate(data))
+    assert observer.hist.sum() == abs_data.size
+    assert observer.bound >= abs_data.max()
+    assert observer.range("minmax") == (np.concatenate(data).min(), np.concatenate(data).max())
+
+    _, max_value = observer.range("percentile", percentile=99.0)
+    assert abs(max_value - np.percentile(abs_data, 99.0)) <= 2 * observer.bound / observer.num_bins
+    _, max_value = observer.range("kl")
+    assert 0 < max_value <= abs_data.max()
@@ -20,7 +20,7 @@ import tempfile
 import numpy as np
 
 from mindspore.common.tensor import Tensor
-from mindspore.train.summary._summary_adapter import _calc_histogram_bins
+from mindspore.train.summary._summary_adapter import _calc_histogram_bins, _sample_reservoir
 from mindspore.train.summary.summary_record import SummaryRecord, _cache_summary_tensor_data
 from tests.summary_utils import SummaryReader
 
@@ -178,3 +178,42 @@ def test_histogram_summary_all_nan_inf():
             assert histogram.nan_count == 3
             assert histogram.pos_inf_count == 1
             assert histogram.neg_inf_count == 1
+
+
+def test_histogram_summary_sample():
+    """Test histogram summary, buckets are counted on a sample of the tensor."""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with SummaryRecord(tmp_dir, file_suffix="_MS_HISTOGRAM", histogram_max_sample=1000) as test_writer:
+            rng = np.random.RandomState(0)
+            tensor_data = rng.normal(size=[100, 1000]).astype(np.float32)
+            test_data = _wrap_test_data(Tensor(tensor_data))
+            _cache_summary_tensor_data(test_data)
+            test_writer.record(step=1)
+
+        file_name = os.path.join(tmp_dir, test_writer.event_file_name)
+        with SummaryReader(file_name) as reader:
+            event = reader.read_event()
+            LOG.debug(event)
+
+            histogram = event.summary.value[0].histogram
+            assert histogram.count == tensor_data.size
+            assert np.isclose(histogram.min, tensor_data.min())
+            assert np.isclose(histogram.max, tensor_data.max())
+            bucket_count = sum(bucket.count for bucket in histogram.buckets)
+            assert abs(bucket_count - tensor_data.size) <= len(histogram.buckets)
+
+
+def test_sample_reservoir():
+    """Test the reservoir keeps a sample without replacement of all the values seen."""
+    values = np.arange(10000)
+    reservoir = None
+    for start in range(0, values.size, 1000):
+        reservoir = _sample_reservoir(reservoir, values[start:start + 1000], 3000)
+    sample = reservoir[0]
+    assert sample.size == 3000
+    assert np.unique(sample).size == sample.size
+    # every chunk is represented, not only the first ones
+    assert np.unique(sample // 1000).size == 10
+
+    reservoir = _sample_reservoir(None, values[:100], 3000)
+    assert sorted(reservoir[0].tolist()) == values[:100].tolist()
@@ -21,12 +21,15 @@
 import logging
 import os
 import random
+from unittest import mock
+
 import numpy as np
 import pytest
 
 import mindspore.nn as nn
 from mindspore.common.tensor import Tensor
 from mindspore.ops import operations as P
+from mindspore.train.summary._summary_writer import SummaryWriter
 from mindspore.train.summary.summary_record import SummaryRecord, _cache_summary_tensor_data
 
 CUR_DIR = os.getcwd()
@@ -203,3 +206,35 @@ def test_validate():
             sr.record("str")
         with pytest.raises(ValueError):
             sr.record(sr)
+
+
+def test_writer_metrics():
+    """ test_writer_metrics """
+    steps = 20
+    with SummaryRecord(SUMMARY_DIR, file_suffix="_MS_METRICS") as test_writer:
+        for i in range(1, steps + 1):
+            _cache_summary_tensor_data(get_test_data(i))
+            test_writer.record(i)
+        test_writer.flush()
+
+    metrics = test_writer.writer_metrics
+    assert metrics['packed_num'] == steps
+    assert metrics['pending_num'] == 0
+    assert metrics['bytes_written'] > 0
+    assert metrics['avg_pack_latency'] >= 0
+
+
+def test_writer_error():
+    """ test_writer_error """
+    # more records than the queues of the writer hold, the records must not block once the writer fails
+    steps = os.cpu_count() * 8
+    with mock.patch.object(SummaryWriter, 'write', side_effect=OSError("No space left on device")):
+        with SummaryRecord(SUMMARY_DIR, file_suffix="_MS_ERROR") as test_writer:
+            for i in range(1, steps + 1):
+                _cache_summary_tensor_data(get_test_data(i))
+                test_writer.record(i)
+            test_writer.flush()
+
+    metrics = test_writer.writer_metrics
+    assert metrics['packed_num'] == steps
+    assert metrics['pending_num'] == 0
@@ -150,6 +150,19 @@ def test_loss_monitor_normal_mode():
     loss_cb.end(run_context)
 
 
+def test_loss_monitor_invalid_float32_loss():
+    """Test loss monitor terminates the training at the step of a float32 NAN loss."""
+    cb_params = _InternalCallbackParam()
+    run_context = RunContext(cb_params)
+    loss_cb = LossMonitor(2)
+    cb_params.cur_epoch_num = 1
+    cb_params.batch_num = 4
+    cb_params.cur_step_num = 1
+    cb_params.net_outputs = Tensor(np.array(np.nan, np.float32))
+    with pytest.raises(ValueError, match="step: 1"):
+        loss_cb.step_end(run_context)
+
+
 def test_check_file_name_not_str():
     """Test check file name not str."""
     ret = _check_file_name_prefix(1)
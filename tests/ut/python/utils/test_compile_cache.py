@@ -0,0 +1,148 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test the persistent compile cache of the executor."""
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase, mock
+
+import numpy as np
+
+import mindspore.nn as nn
+from mindspore import Tensor
+from mindspore.common.api import _Executor
+from mindspore.common._compile_cache import CompileCache, COMPILE_CACHE_PATH_ENV, GRAPH_FILE
+from mindspore.ops import operations as P
+
+
+class Net(nn.Cell):
+    """A network with a sub cell, a primitive and a plain attribute."""
+
+    def __init__(self, scale=2.0):
+        super(Net, self).__init__()
+        self.dense = nn.Dense(3, 4)
+        self.mul = P.Mul()
+        self.scale = scale
+
+    def construct(self, x):
+        return self.mul(self.dense(x), self.scale)
+
+
+class _FakeExecutor:
+    """Records the compile cache file of each compile, writes the IR like the symbol_resolve stage."""
+
+    def __init__(self, fail_load=False):
+        self.fail_load = fail_load
+        self.cache_file, self.load = "", False
+        self.compiles = []
+
+    def set_compile_cache_file(self, file, load):
+        self.cache_file, self.load = file, load
+        return True
+
+    def compile(self, obj, args, phase, use_vm):
+        self.compiles.append((self.cache_file, self.load))
+        if self.load and self.fail_load:
+            raise RuntimeError("read ir file failed")
+        if self.cache_file and not self.load:
+            with open(self.cache_file, "w") as f:
+                f.write("graph")
+        return True
+
+
+class TestCompileCache(TestCase):
+    """Test the class of CompileCache."""
+
+    def setUp(self) -> None:
+        """Initialization before test case execution."""
+        self.cache_dir = tempfile.mkdtemp(prefix='compile_cache_')
+        self.inputs = (Tensor(np.ones([2, 3], np.float32)),)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.cache_dir)
+
+    def _store(self, cache, key, content="graph"):
+        tmp_dir = cache.create_entry()
+        with open(os.path.join(tmp_dir, GRAPH_FILE), "w") as f:
+            f.write(content)
+        cache.store(key, tmp_dir)
+
+    def test_key(self):
+        """Test the key depends on the network, the inputs and the phase, not on the instance."""
+        key = CompileCache.key(Net(), self.inputs, 'train', True)
+        assert key == CompileCache.key(Net(), (Tensor(np.zeros([2, 3], np.float32)),), 'train', True)
+        assert key != CompileCache.key(Net(scale=3.0), self.inputs, 'train', True)
+        assert key != CompileCache.key(Net(), (Tensor(np.ones([4, 3], np.float32)),), 'train', True)
+        assert key != CompileCache.key(Net(), self.inputs, 'eval', True)
+
+        net = Net()
+        net.unknown = object()
+        assert CompileCache.key(net, self.inputs, 'train', True) is None
+
+    def test_store_load(self):
+        """Test a stored graph is loaded, and a broken entry is removed."""
+        cache = CompileCache(self.cache_dir)
+        assert cache.load('key') is None
+        self._store(cache, 'key')
+        graph_file = cache.load('key')
+        with open(graph_file, "r") as f:
+            assert f.read() == "graph"
+
+        with open(graph_file, "w") as f:
+            f.write("broken")
+        assert cache.load('key') is None
+        assert not os.path.exists(os.path.join(self.cache_dir, 'key'))
+
+    def test_evict(self):
+        """Test the least recently used entries are evicted."""
+        cache = CompileCache(self.cache_dir)
+        for key in ('a', 'b', 'c'):
+            self._store(cache, key, "x" * 100)
+        now = time.time()
+        for age, key in ((30, 'a'), (20, 'b'), (10, 'c')):
+            os.utime(os.path.join(self.cache_dir, key), (now - age, now - age))
+        # a load makes a the most recently used
+        assert cache.load('a') is not None
+        entry_size = sum(entry.stat().st_size for entry in os.scandir(os.path.join(self.cache_dir, 'c')))
+        cache.max_size = entry_size * 2
+        cache.evict()
+        assert sorted(os.listdir(self.cache_dir)) == ['a', 'c']
+
+    def test_executor_compile(self):
+        """Test the executor stores the resolved graph on a miss and loads it on the next compile."""
+        executor = _Executor()
+        executor._executor = _FakeExecutor()
+        with mock.patch.dict(os.environ, {COMPILE_CACHE_PATH_ENV: self.cache_dir}):
+            assert executor._compile(Net(), self.inputs, 'train.1', 'train', True)
+            assert executor._compile(Net(), self.inputs, 'train.2', 'train', True)
+        (stored_file, stored), (loaded_file, loaded) = executor._executor.compiles
+        assert not stored and loaded
+        assert os.path.basename(stored_file) == GRAPH_FILE
+        assert loaded_file == CompileCache(self.cache_dir).load(CompileCache.key(Net(), self.inputs, 'train', True))
+        assert not [name for name in os.listdir(self.cache_dir) if name.startswith(".")]
+
+    def test_executor_compile_load_failure(self):
+        """Test the executor compiles the graph again when the cached graph fails to load."""
+        executor = _Executor()
+        executor._executor = _FakeExecutor(fail_load=True)
+        key = CompileCache.key(Net(), self.inputs, 'train', True)
+        self._store(CompileCache(self.cache_dir), key, "unreadable graph")
+        with mock.patch.dict(os.environ, {COMPILE_CACHE_PATH_ENV: self.cache_dir}):
+            assert executor._compile(Net(), self.inputs, 'train.1', 'train', True)
+        assert [load for _, load in executor._executor.compiles] == [True, False]
+        # the graph compiled again is stored instead of the broken one
+        with open(CompileCache(self.cache_dir).load(key), "r") as f:
+            assert f.read() == "graph"
@@ -0,0 +1,255 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test the weights cache of hub against a local mirror."""
+import hashlib
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import threading
+import time
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from unittest import TestCase, mock
+
+import pytest
+
+from mindspore.hub import _WeightsCache, _get_weights_file
+
+
+def make_archive(path, name, content):
+    """Write a tar.gz archive holding the directory `name` with a checkpoint file."""
+    with tarfile.open(path, "w:gz") as tar:
+        info = tarfile.TarInfo(name + "/" + name + ".ckpt")
+        info.size = len(content)
+        tar.addfile(info, io.BytesIO(content))
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class _MirrorHandler(BaseHTTPRequestHandler):
+    """Serves the files of the mirror, with ranges unless the server mode says otherwise."""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.path, self.headers.get("Range"), self.headers.get("If-Range")))
+        data = server.files[self.path.lstrip("/")]
+        etag = '"{}"'.format(hashlib.md5(data).hexdigest())
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and server.mode != "no_range" and (if_range is None or if_range == etag):
+            start = int(range_header[len("bytes="):].rstrip("-"))
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Range", "bytes */{}".format(len(data)))
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", "bytes {}-{}/{}".format(start, len(data) - 1, len(data)))
+            data = data[start:]
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestWeightsCache(TestCase):
+    """Test the class of _WeightsCache."""
+
+    def setUp(self) -> None:
+        """Initialization before test case execution."""
+        self.work_dir = tempfile.mkdtemp(prefix='hub_cache_')
+        self.mirror_dir = os.path.join(self.work_dir, 'mirror')
+        self.cache_dir = os.path.join(self.work_dir, 'cache')
+        os.makedirs(self.mirror_dir)
+        self.server = HTTPServer(('127.0.0.1', 0), _MirrorHandler)
+        self.server.files = {}
+        self.server.requests = []
+        self.server.mode = "range"
+        self.server_thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.server_thread.start()
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.work_dir)
+
+    def _file_url(self, name, content):
+        path = os.path.join(self.mirror_dir, name + ".tar.gz")
+        data = make_archive(path, name, content)
+        return Path(path).as_uri(), data
+
+    def _http_url(self, name, content):
+        data = make_archive(os.path.join(self.mirror_dir, name + ".tar.gz"), name, content)
+        self.server.files[name + ".tar.gz"] = data
+        return "http://127.0.0.1:{}/{}.tar.gz".format(self.server.server_port, name), data
+
+    def _part_file(self, url):
+        return os.path.join(self.cache_dir, "downloads", hashlib.sha256(url.encode("utf-8")).hexdigest() + ".part")
+
+    def _blob(self, cache, url):
+        with open(os.path.join(cache.cache_dir, "blobs", cache.lookup(url)), "rb") as f:
+            return f.read()
+
+    def test_cache_hit(self):
+        """Test a cached archive is not downloaded again."""
+        url, _ = self._file_url("lenet", b"weights")
+        cache = _WeightsCache(self.cache_dir)
+        unpacked_path = cache.fetch(url)
+        with open(os.path.join(unpacked_path, "lenet", "lenet.ckpt"), "rb") as f:
+            assert f.read() == b"weights"
+
+        with mock.patch.object(_WeightsCache, "download") as download:
+            assert _WeightsCache(self.cache_dir).fetch(url) == unpacked_path
+            download.assert_not_called()
+        with mock.patch.object(_WeightsCache, "download", wraps=cache.download) as download:
+            assert cache.fetch(url, force_reload=True) == unpacked_path
+            download.assert_called_once()
+
+    def test_resume(self):
+        """Test a partial download is resumed by a range request when the file is unchanged."""
+        url, data = self._http_url("lenet", os.urandom(4096))
+        cache = _WeightsCache(self.cache_dir)
+        with open(self._part_file(url), "wb") as f:
+            f.write(data[:100])
+        with open(self._part_file(url) + ".validator", "w") as f:
+            f.write('"{}"'.format(hashlib.md5(data).hexdigest()))
+
+        cache.fetch(url)
+        assert self.server.requests[-1][1] == "bytes=100-"
+        assert self._blob(cache, url) == data
+        assert not os.listdir(os.path.join(self.cache_dir, "downloads"))
+
+    def test_resume_changed_file(self):
+        """Test a partial download of a file which has changed since is started again."""
+        url, old_data = self._http_url("lenet", os.urandom(4096))
+        cache = _WeightsCache(self.cache_dir)
+        with open(self._part_file(url), "wb") as f:
+            f.write(old_data[:100])
+        with open(self._part_file(url) + ".validator", "w") as f:
+            f.write('"{}"'.format(hashlib.md5(old_data).hexdigest()))
+        url, data = self._http_url("lenet", os.urandom(4096))
+
+        cache.fetch(url)
+        assert self.server.requests[-1][2] is not None
+        assert self._blob(cache, url) == data
+
+    def test_resume_without_range(self):
+        """Test the download starts again when the server answers a range request with the whole file."""
+        self.server.mode = "no_range"
+        url, data = self._http_url("lenet", os.urandom(4096))
+        cache = _WeightsCache(self.cache_dir)
+        with open(self._part_file(url), "wb") as f:
+            f.write(data[:100])
+        with open(self._part_file(url) + ".validator", "w") as f:
+            f.write('"{}"'.format(hashlib.md5(data).hexdigest()))
+
+        cache.fetch(url)
+        assert self.server.requests[-1][1] == "bytes=100-"
+        assert self._blob(cache, url) == data
+
+    def test_resume_out_of_range(self):
+        """Test the download starts again when the partial file is longer than the file."""
+        url, data = self._http_url("lenet", os.urandom(4096))
+        cache = _WeightsCache(self.cache_dir)
+        with open(self._part_file(url), "wb") as f:
+            f.write(data + b"trailing")
+        with open(self._part_file(url) + ".validator", "w") as f:
+            f.write('"{}"'.format(hashlib.md5(data).hexdigest()))
+
+        cache.fetch(url)
+        assert [request[1] for request in self.server.requests] == ["bytes={}-".format(len(data) + 8), None]
+        assert self._blob(cache, url) == data
+
+    def test_partial_without_validator(self):
+        """Test a partial download without validator nor md5 is discarded."""
+        url, data = self._http_url("lenet", os.urandom(4096))
+        cache = _WeightsCache(self.cache_dir)
+        with open(self._part_file(url), "wb") as f:
+            f.write(b"x" * 100)
+
+        cache.fetch(url)
+        assert self.server.requests[-1][1] is None
+        assert self._blob(cache, url) == data
+
+    def test_md5(self):
+        """Test an archive whose md5 does not match is rejected."""
+        url, data = self._file_url("lenet", b"weights")
+        cache = _WeightsCache(self.cache_dir)
+        with pytest.raises(ValueError):
+            cache.fetch(url, hash_md5="0" * 32)
+        assert cache.lookup(url) is None
+        assert not os.listdir(os.path.join(self.cache_dir, "downloads"))
+
+        cache.fetch(url, hash_md5=hashlib.md5(data).hexdigest())
+        assert cache.lookup(url, hashlib.md5(data).hexdigest()) is not None
+        assert cache.lookup(url, "0" * 32) is None
+
+    def test_evict(self):
+        """Test the least recently used archives are evicted, except the kept ones."""
+        urls = [self._file_url(name, os.urandom(1000))[0] for name in ("lenet", "alexnet", "vgg")]
+        cache = _WeightsCache(self.cache_dir, max_size=1 << 20)
+        for url in urls:
+            cache.fetch(url)
+            time.sleep(0.01)
+        cache.fetch(urls[0])
+
+        cache.max_size = 1
+        cache.evict(keep=(cache.lookup(urls[2]),))
+        assert [cache.lookup(url) is not None for url in urls] == [False, False, True]
+
+        # the archive just fetched is kept
+        cache.fetch(urls[0])
+        assert [cache.lookup(url) is not None for url in urls] == [True, False, False]
+
+    def test_concurrent_fetch(self):
+        """Test an url fetched by several threads at once is downloaded once."""
+        url, _ = self._http_url("lenet", os.urandom(4096))
+        paths = []
+        threads = [threading.Thread(target=lambda: paths.append(_WeightsCache(self.cache_dir).fetch(url)))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(paths) == 4 and len(set(paths)) == 1
+        assert len(self.server.requests) == 1
+
+    def test_get_weights_file(self):
+        """Test the weights file of an url is taken from the cache by default."""
+        url, _ = self._http_url("lenet", os.urandom(4096))
+        path = _get_weights_file(url, savepath=self.cache_dir)
+        assert path == os.path.join(_WeightsCache(self.cache_dir).fetch(url), "lenet")
+        assert _get_weights_file(url, savepath=self.cache_dir) == path
+        assert len(self.server.requests) == 1
+
+    def test_unsafe_member(self):
+        """Test an archive with a member outside of the target directory is not unpacked."""
+        path = os.path.join(self.mirror_dir, "evil.tar.gz")
+        with tarfile.open(path, "w:gz") as tar:
+            info = tarfile.TarInfo("../../evil.ckpt")
+            info.size = 4
+            tar.addfile(info, io.BytesIO(b"evil"))
+        cache = _WeightsCache(self.cache_dir)
+        with pytest.raises(OSError):
+            cache.fetch(Path(path).as_uri())
+        assert not os.path.exists(os.path.join(self.cache_dir, "evil.ckpt"))
+        assert not os.path.exists(os.path.join(self.work_dir, "evil.ckpt"))
@@ -0,0 +1,149 @@
+# Copyright 2020 Huawei Technologies Co., Ltd
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ============================================================================
+"""Test the kernel compile cache."""
+import os
+import shutil
+import tempfile
+import time
+from contextlib import ExitStack
+from unittest import TestCase, mock
+
+from mindspore._extends.parallel_compile.kernel_cache import KernelCache, cached_compile, KERNEL_CACHE_PATH_ENV
+from mindspore._extends.parallel_compile.akg_compiler.akg_process import get_akg_version
+
+
+class TestKernelCache(TestCase):
+    """Test the class of KernelCache."""
+
+    def setUp(self) -> None:
+        """Initialization before test case execution."""
+        self.work_dir = tempfile.mkdtemp(prefix='kernel_cache_')
+        self.cache_dir = os.path.join(self.work_dir, 'cache')
+        self.kernel_meta_dir = os.path.join(self.work_dir, 'kernel_meta')
+        os.makedirs(self.kernel_meta_dir)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.work_dir)
+
+    def _compile(self, kernel_name, content=b'kernel'):
+        """Write the files of a kernel like a compiler."""
+        for suffix in ('.json', '.o'):
+            with open(os.path.join(self.kernel_meta_dir, kernel_name + suffix), 'wb') as f:
+                f.write(content + suffix.encode())
+
+    def test_key(self):
+        """Test the key depends on the kernel json and the tag."""
+        key = KernelCache.key('{"op": "add"}', 'v1')
+        assert key == KernelCache.key('{"op": "add"}', 'v1')
+        assert len(key) == 64
+        assert key != KernelCache.key('{"op": "add"}', 'v2')
+        assert key != KernelCache.key('{"op": "sub"}', 'v1')
+
+    def test_store_load(self):
+        """Test the files of a stored kernel are restored by load."""
+        cache = KernelCache(self.cache_dir, self.kernel_meta_dir)
+        key = cache.key('{"op": "add"}')
+        assert cache.load(key, 'add') == (False, None)
+
+        self._compile('add')
+        self._compile('add_other')
+        cache.store(key, 'add', ['Success', 'out'])
+        shutil.rmtree(self.kernel_meta_dir)
+
+        assert cache.load(key, 'add') == (True, ['Success', 'out'])
+        assert sorted(os.listdir(self.kernel_meta_dir)) == ['add.json', 'add.o']
+        with open(os.path.join(self.kernel_meta_dir, 'add.o'), 'rb') as f:
+            assert f.read() == b'kernel.o'
+        assert cache.load(key, 'sub') == (False, None)
+
+    def test_corrupted_entry(self):
+        """Test a corrupted entry is removed instead of loaded."""
+        cache = KernelCache(self.cache_dir, self.kernel_meta_dir)
+        key = cache.key('{"op": "add"}')
+        self._compile('add')
+        cache.store(key, 'add', True)
+        with open(os.path.join(self.cache_dir, key, 'add.o'), 'wb') as f:
+            f.write(b'broken')
+
+        assert cache.load(key, 'add') == (False, None)
+        assert not os.path.exists(os.path.join(self.cache_dir, key))
+
+    def test_evict(self):
+        """Test the least recently used entries are evicted."""
+        cache = KernelCache(self.cache_dir, self.kernel_meta_dir, max_size=0)
+        self._compile('add', b'x' * 100)
+        cache.store('add_key', 'add', True)
+        # nothing fits in an empty cache
+        assert not os.listdir(self.cache_dir)
+
+        cache.max_size = 1 << 20
+        for name in ('add', 'sub', 'mul'):
+            self._compile(name, b'x' * 100)
+            cache.store(name + '_key', name, True)
+        now = time.time()
+        os.utime(os.path.join(self.cache_dir, 'add_key'), (now - 30, now - 30))
+        os.utime(os.path.join(self.cache_dir, 'sub_key'), (now - 20, now - 20))
+        os.utime(os.path.join(self.cache_dir, 'mul_key'), (now - 10, now - 10))
+        # a load makes add the most recently used
+        assert cache.load('add_key', 'add')[0]
+        entry_size = sum(entry.stat().st_size for entry in os.scandir(os.path.join(self.cache_dir, 'mul_key')))
+        cache.max_size = entry_size * 2
+        cache.evict()
+        assert sorted(os.listdir(self.cache_dir)) == ['add_key', 'mul_key']
+
+    def test_cached_compile(self):
+        """Test a kernel is compiled once and then loaded from the cache with the same tag."""
+        compiled = []
+
+        def compile_func(json_str):
+            compiled.append(json_str)
+            self._compile('add')
+            return True
+
+        cur_dir = os.getcwd()
+        # the compilers write kernels into ./kernel_meta
+        os.chdir(self.work_dir)
+        try:
+            with mock.patch.dict(os.environ, {KERNEL_CACHE_PATH_ENV: self.cache_dir}):
+                assert cached_compile(compile_func, '{"op": "add"}', 'add', tag='v1')[::2] == (True, False)
+                assert cached_compile(compile_func, '{"op": "add"}', 'add', tag='v1')[::2] == (True, True)
+                assert cached_compile(compile_func, '{"op": "add"}', 'add', tag='v2')[::2] == (True, False)
+        finally:
+            os.chdir(cur_dir)
+        assert len(compiled) == 2
+
+    def test_akg_version(self):
+        """Test the akg tag changes when akg is upgraded."""
+        try:
+            from importlib import metadata
+        except ImportError:
+            metadata = None
+        if metadata is not None:
+            with mock.patch.object(metadata, 'version', return_value='1.0'):
+                assert get_akg_version() == 'akg-1.0'
+
+        # without distribution metadata, the tag is taken from the installed package
+        akg_init = os.path.join(self.work_dir, '__init__.py')
+        with open(akg_init, 'w'):
+            pass
+        os.utime(akg_init, (1000, 1000))
+        with ExitStack() as stack:
+            stack.enter_context(mock.patch('importlib.util.find_spec', return_value=mock.Mock(origin=akg_init)))
+            if metadata is not None:
+                stack.enter_context(mock.patch.object(metadata, 'version',
+                                                      side_effect=metadata.PackageNotFoundError('akg')))
+            version = get_akg_version()
+            os.utime(akg_init, (2000, 2000))
+            assert get_akg_version() != version
@@ -14,6 +14,7 @@
 # ============================================================================
 """ut for model serialize(save/load)"""
 import os
+import json
 import stat
 import time
 
@@ -31,7 +32,9 @@ from mindspore.nn.optim.momentum import Momentum
 from mindspore.ops import operations as P
 from mindspore.train.callback import _CheckpointManager
 from mindspore.train.serialization import save_checkpoint, load_checkpoint, load_param_into_net, \
-    _exec_save_checkpoint, export, _save_graph
+    _exec_save_checkpoint, export, _save_graph, _wait_async_save, merge_sliced_checkpoints, iter_print, parse_print
+from mindspore.train.print_pb2 import Print
+from mindspore.train.checkpoint_pb2 import Checkpoint
 from ..ut_filter import non_graph_engine
 
 context.set_context(mode=context.GRAPH_MODE, print_file_path="print/print.pb")
@@ -115,6 +118,22 @@ def test_save_checkpoint():
     save_checkpoint(parameter_list, ckpt_file_name)
 
 
+def test_save_checkpoint_async():
+    """ test_save_checkpoint_async """
+    ckpt_file_name = os.path.join(_cur_dir, './async_parameters.ckpt')
+    data = np.random.randint(0, 255, [12, 1024]).astype(np.float32)
+    for _ in range(4):
+        parameter_list = [{'name': "param", 'data': Tensor(data)},
+                          {'name': "scalar", 'data': Tensor(np.array(1.5).astype(np.float32))}]
+        save_checkpoint(parameter_list, ckpt_file_name, async_save=True)
+    _wait_async_save()
+
+    assert not os.path.exists(ckpt_file_name + ".tmp")
+    par_dict = load_checkpoint(ckpt_file_name)
+    assert (par_dict['param'].data.asnumpy() == data).all()
+    assert par_dict['scalar'].data.shape == ()
+
+
 def test_load_checkpoint_error_filename():
     ckpt_file_name = 1
     with pytest.raises(ValueError):
@@ -132,6 +151,58 @@ def test_load_checkpoint():
     assert isinstance(par_dict, dict)
 
 
+def test_load_checkpoint_mmap():
+    ckpt_file_name = os.path.join(_cur_dir, './parameters.ckpt')
+    par_dict = load_checkpoint(ckpt_file_name)
+    mmap_par_dict = load_checkpoint(ckpt_file_name, mmap_load=True)
+
+    assert len(mmap_par_dict) == 3
+    for name, param in par_dict.items():
+        assert mmap_par_dict[name].name == name
+        assert mmap_par_dict[name].data.dtype == param.data.dtype
+        assert mmap_par_dict[name].data.shape == param.data.shape
+        assert (mmap_par_dict[name].data.asnumpy() == param.data.asnumpy()).all()
+
+
+def test_load_checkpoint_filter_prefix():
+    ckpt_file_name = os.path.join(_cur_dir, './parameters.ckpt')
+    par_dict = load_checkpoint(ckpt_file_name, filter_prefix="param")
+    assert sorted(par_dict.keys()) == ['param', 'param_test']
+
+    par_dict = load_checkpoint(ckpt_file_name, filter_prefix=["new", "param_"], mmap_load=True)
+    assert sorted(par_dict.keys()) == ['new_param', 'param_test']
+    assert par_dict['new_param'].data.shape == (12, 1024, 1)
+
+    with pytest.raises(TypeError):
+        load_checkpoint(ckpt_file_name, filter_prefix=1)
+
+
+def test_merge_sliced_checkpoints():
+    """ test_merge_sliced_checkpoints """
+    weight = np.arange(32).reshape(4, 8).astype(np.float32)
+    bias = np.arange(4).astype(np.float32)
+    # dev_mat [2, 2], the weight is split by 2 along each dim, the bias is not split
+    layouts = {"weight": [[2, 2], [1, 0], [2, 4], [0]], "bias": [[2, 2], [-1], [4], [0]]}
+    ckpt_file_names = []
+    for rank in [3, 1, 0, 2]:
+        row, col = rank // 2, rank % 2
+        ckpt_file_name = os.path.join(_cur_dir, './sliced_{}.ckpt'.format(rank))
+        save_checkpoint([{'name': "weight", 'data': Tensor(weight[row * 2:row * 2 + 2, col * 4:col * 4 + 4])},
+                         {'name': "bias", 'data': Tensor(bias)}], ckpt_file_name)
+        with open(ckpt_file_name + ".layout", "w") as f:
+            json.dump({"rank": rank, "layouts": layouts}, f)
+        ckpt_file_names.append(ckpt_file_name)
+
+    merged_file_name = os.path.join(_cur_dir, './merged.ckpt')
+    merge_sliced_checkpoints(ckpt_file_names, merged_file_name)
+    par_dict = load_checkpoint(merged_file_name)
+    assert (par_dict['weight'].data.asnumpy() == weight).all()
+    assert (par_dict['bias'].data.asnumpy() == bias).all()
+
+    with pytest.raises(ValueError):
+        merge_sliced_checkpoints(ckpt_file_names[:3], merged_file_name)
+
+
 def test_checkpoint_manager():
     """ test_checkpoint_manager """
     ckp_mgr = _CheckpointManager()
@@ -294,6 +365,18 @@ def test_load_checkpoint_empty_file():
         load_checkpoint("empty.ckpt")
 
 
+def test_load_checkpoint_mmap_no_tag():
+    checkpoint_list = Checkpoint()
+    value = checkpoint_list.value.add()
+    value.tensor.dims.append(1)
+    value.tensor.tensor_type = "Float32"
+    value.tensor.tensor_content = np.ones(1, np.float32).tobytes()
+    with open("no_tag.ckpt", "wb") as f:
+        f.write(checkpoint_list.SerializeToString())
+    with pytest.raises(ValueError):
+        load_checkpoint("no_tag.ckpt", filter_prefix="param", mmap_load=True)
+
+
 class MYNET(nn.Cell):
     """ NET definition """
 
@@ -373,8 +456,43 @@ def test_print():
               scale2)
 
 
+def test_iter_print():
+    """Test the values of a print file are iterated and filtered by description and step."""
+    with open("./iter_print.pb", "wb") as f:
+        for step in range(3):
+            for desc, tensor in (("loss:", np.array(step, np.float32)), ("w:", np.ones((2, 3), np.int32) * step)):
+                # the Print op writes a message per value
+                print_list = Print()
+                print_list.value.add().desc = desc
+                f.write(print_list.SerializeToString())
+                print_list = Print()
+                value = print_list.value.add()
+                value.tensor.dims.extend(tensor.shape)
+                value.tensor.tensor_type = "Float32" if tensor.dtype == np.float32 else "Int32"
+                value.tensor.tensor_content = tensor.tobytes()
+                f.write(print_list.SerializeToString())
+
+    values = list(iter_print("./iter_print.pb", desc="loss:"))
+    assert [(desc, step) for desc, step, _ in values] == [("loss:", step) for step in range(3) for _ in range(2)]
+    assert [float(value) for _, _, value in values[1::2]] == [0.0, 1.0, 2.0]
+
+    values = [value for _, _, value in iter_print("./iter_print.pb", desc="w:", steps=[2])]
+    assert values[0] == "w:"
+    assert values[1].shape == (2, 3) and (values[1] == 2).all()
+    assert not values[1].flags.writeable
+
+    tensor_list = parse_print("./iter_print.pb")
+    assert len(tensor_list) == 12
+    assert tensor_list[0] == "loss:"
+    assert tensor_list[1].asnumpy() == 0.0
+    assert (tensor_list[11].asnumpy() == np.ones((2, 3), np.int32) * 2).all()
+
+
 def teardown_module():
-    files = ['parameters.ckpt', 'new_ckpt.ckpt', 'empty.ckpt']
+    files = ['parameters.ckpt', 'async_parameters.ckpt', 'new_ckpt.ckpt', 'empty.ckpt', 'merged.ckpt', 'iter_print.pb',
+             'no_tag.ckpt']
+    for rank in range(4):
+        files += ['sliced_{}.ckpt'.format(rank), 'sliced_{}.ckpt.layout'.format(rank)]
     for item in files:
         file_name = './' + item
         if not os.path.exists(file_name):